@@ -128,6 +128,19 @@ app_license = "mit"
 # 	"Event": "frappe.desk.doctype.event.event.has_permission",
 # }
 
+permission_query_conditions = {
+	"Customer": "planner.planner.permissions.get_customer_conditions",
+	"Customer Payment": "planner.planner.permissions.get_customer_payment_conditions",
+	"Staff Cash Submission": "planner.planner.permissions.get_staff_cash_submission_conditions",
+	"Collection Rollup": "planner.planner.permissions.get_collection_rollup_conditions",
+}
+
+has_permission = {
+	"Customer": "planner.planner.permissions.has_customer_permission",
+	"Customer Payment": "planner.planner.permissions.has_customer_payment_permission",
+	"Staff Cash Submission": "planner.planner.permissions.has_staff_cash_submission_permission",
+}
+
 # Document Events
 # ---------------
 # Hook on document methods and events
@@ -140,6 +153,90 @@ app_license = "mit"
 # 	}
 # }
 
+doc_events = {
+	"Customer Payment": {
+		"validate": "planner.planner.month_close.validate_period_open",
+		"after_insert": "planner.planner.notifications.queue_payment_receipt",
+		"on_update": [
+			"planner.planner.ledger.on_update",
+			"planner.planner.customer_lifecycle.reactivate_on_payment",
+			"planner.planner.realtime.on_update",
+			"planner.planner.collector_float.on_update",
+			"planner.planner.collection_rollup.on_update",
+		],
+		"on_trash": [
+			"planner.planner.month_close.validate_period_open",
+			"planner.planner.ledger.on_cancel",
+			"planner.planner.realtime.on_trash",
+			"planner.planner.collector_float.on_trash",
+			"planner.planner.collection_rollup.on_trash",
+		],
+	},
+	"Staff Cash Submission": {
+		"on_update": [
+			"planner.planner.realtime.on_update",
+			"planner.planner.collector_float.on_update",
+		],
+		"on_trash": [
+			"planner.planner.realtime.on_trash",
+			"planner.planner.collector_float.on_trash",
+		],
+	},
+	"Expense": {
+		"validate": "planner.planner.month_close.validate_period_open",
+		"on_update": [
+			"planner.planner.ledger.on_update",
+			"planner.planner.expense_accounts.on_update",
+		],
+		"on_trash": [
+			"planner.planner.month_close.validate_period_open",
+			"planner.planner.ledger.on_cancel",
+			"planner.planner.expense_accounts.on_trash",
+		],
+	},
+	"ISP Payment": {
+		"validate": "planner.planner.month_close.validate_period_open",
+		"on_update": "planner.planner.ledger.on_update",
+		"on_trash": [
+			"planner.planner.month_close.validate_period_open",
+			"planner.planner.ledger.on_cancel",
+		],
+	},
+	"Bank Transaction": {
+		"validate": "planner.planner.month_close.validate_period_open",
+		"on_update": "planner.planner.ledger.on_update",
+		"on_trash": [
+			"planner.planner.month_close.validate_period_open",
+			"planner.planner.ledger.on_cancel",
+		],
+	},
+	"User Permission": {
+		"on_update": "planner.planner.permissions.clear_department_cache",
+		"on_trash": "planner.planner.permissions.clear_department_cache",
+	},
+	"Customer Department": {
+		"on_update": [
+			"planner.planner.permissions.clear_department_cache",
+			"planner.planner.master_data.invalidate",
+		],
+		"on_trash": [
+			"planner.planner.permissions.clear_department_cache",
+			"planner.planner.master_data.invalidate",
+		],
+		"after_rename": "planner.planner.master_data.invalidate",
+	},
+	"Lak Package": {
+		"on_update": "planner.planner.master_data.invalidate",
+		"on_trash": "planner.planner.master_data.invalidate",
+		"after_rename": "planner.planner.master_data.invalidate",
+	},
+}
+
+# Called once per chunk of a bulk action (planner.planner.bulk_actions)
+planner_bulk_update = [
+	"planner.planner.customer_lifecycle.on_bulk_update",
+]
+
 # Scheduled Tasks
 # ---------------
 
@@ -161,6 +258,24 @@ app_license = "mit"
 # 	],
 # }
 
+scheduler_events = {
+	"all": [
+		"planner.planner.notifications.flush_outbox",
+		"planner.planner.realtime.flush_stale_feed",
+	],
+	"daily": [
+		"planner.planner.customer_lifecycle.update_customer_statuses",
+		"planner.planner.collector_float.check_floats",
+	],
+	"weekly": [
+		"planner.planner.duplicates.scan_duplicates",
+		"planner.planner.customer_dedup.find_duplicate_customers",
+	],
+	"monthly": [
+		"planner.planner.notifications.queue_arrears_reminders",
+	],
+}
+
 # Testing
 # -------
 
@@ -189,6 +304,9 @@ app_license = "mit"
 
 # ignore_links_on_delete = ["Communication", "ToDo"]
 
+# Ledger entries are reversed and outbox rows kept when their source document is deleted
+ignore_links_on_delete = ["Company Ledger", "Notification Outbox", "Customer Status Log"]
+
 # Request Events
 # ----------------
 # before_request = ["planner.utils.before_request"]
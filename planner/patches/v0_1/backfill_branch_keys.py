@@ -0,0 +1,27 @@
+import frappe
+
+from planner.planner.branches import CUSTOMER_BRANCH_FIELDS
+
+
+def execute():
+	"""
+	Fill in the new `customer_department` branch key from the linked Customer, and
+	for Staff Cash Submissions from the staff member's only Customer Department
+	User Permission. Staff with several departments are left without a branch.
+	"""
+	for doctype, link_field in CUSTOMER_BRANCH_FIELDS.items():
+		frappe.db.sql(
+			f"""update `tab{doctype}` set customer_department = (
+				select c.customer_department from `tabCustomer` c where c.name = `tab{doctype}`.`{link_field}`
+			)
+			where ifnull(`{link_field}`, '') != ''"""
+		)
+
+	frappe.db.sql(
+		"""update `tabStaff Cash Submission` set customer_department = (
+			select max(up.for_value) from `tabUser Permission` up
+			where up.user = `tabStaff Cash Submission`.staff_user and up.allow = 'Customer Department'
+			having count(*) = 1
+		)
+		where ifnull(customer_department, '') = ''"""
+	)
@@ -0,0 +1,21 @@
+import frappe
+
+from planner.planner.collection_rollup import backfill
+
+
+def execute():
+	"""
+	Fill in the new `package` of Customer Payments with the package the customer
+	was subscribed to on the payment date, or else their current package, and
+	build the collections rollup from the payments.
+	"""
+	frappe.db.sql(
+		"""update `tabCustomer Payment` p set package = coalesce(
+			(select max(s.package) from `tabCustomer Subscription Period` s
+			where s.customer = p.customer and s.from_date <= p.payment_date
+				and (s.to_date is null or s.to_date >= p.payment_date)),
+			(select c.package_assigned from `tabCustomer` c where c.name = p.customer)
+		)
+		where ifnull(p.customer, '') != ''"""
+	)
+	backfill(enqueue=False)
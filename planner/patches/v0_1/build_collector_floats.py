@@ -0,0 +1,6 @@
+from planner.planner.collector_float import check_floats
+
+
+def execute():
+	"""Fill Collector Float and Collector Float Day from the existing payments and submissions."""
+	check_floats()
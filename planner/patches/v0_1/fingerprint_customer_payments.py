@@ -0,0 +1,6 @@
+from planner.planner.duplicates import update_fingerprints
+
+
+def execute():
+	"""Fingerprint existing payments so new ones are checked against them."""
+	update_fingerprints()
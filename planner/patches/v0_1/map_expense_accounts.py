@@ -0,0 +1,47 @@
+from collections import defaultdict
+
+import frappe
+
+from planner.planner.doctype.expense_account.expense_account import get_root_account
+from planner.planner.expense_accounts import rebuild_totals
+
+
+def normalize(account: str) -> str:
+	return " ".join(account.split()).casefold()
+
+
+def execute():
+	"""
+	Expense.account used to be free text. Create an Expense Account under the root
+	for every distinct spelling (ignoring case and extra whitespace), point the
+	expenses at it and build the monthly totals.
+	"""
+	root = get_root_account()
+
+	variants = defaultdict(list)
+	for account, count in frappe.db.sql(
+		"""select account, count(*) from `tabExpense`
+		where ifnull(account, '') != ''
+		group by account"""
+	):
+		variants[normalize(account)].append((count, account))
+
+	for spellings in variants.values():
+		# The most used spelling becomes the account name.
+		canonical = " ".join(max(spellings)[1].split())
+		if not frappe.db.exists("Expense Account", canonical):
+			frappe.get_doc(
+				{
+					"doctype": "Expense Account",
+					"account_name": canonical,
+					"parent_expense_account": root,
+				}
+			).insert(ignore_permissions=True)
+
+		others = [account for _count, account in spellings if account != canonical]
+		if others:
+			frappe.db.sql(
+				"update `tabExpense` set account = %s where account in %s", (canonical, tuple(others))
+			)
+
+	rebuild_totals()
@@ -0,0 +1,27 @@
+import frappe
+from frappe.utils import nowdate
+
+from planner.planner.master_data import get_packages
+from planner.planner.subscriptions import open_periods
+
+
+def execute():
+	"""Open a subscription period for every customer with a package, from their register date."""
+	for package in get_packages():
+		starts = frappe.db.sql(
+			"""select c.name, ifnull(c.register_date, date(c.creation))
+			from `tabCustomer` c
+			where c.package_assigned = %s and not exists (
+				select 1 from `tabCustomer Subscription Period` s
+				where s.customer = c.name and s.to_date is null
+			)""",
+			package.name,
+		)
+		if starts:
+			open_periods(
+				[(customer, from_date or nowdate()) for customer, from_date in starts],
+				package.name,
+				package.monthly_fee,
+				"New",
+				None,
+			)
@@ -0,0 +1,172 @@
+# Copyright (c) 2026, Kebazz Technologies and contributors
+# For license information, please see license.txt
+
+"""
+Branch partitioning of planner data on Customer Department.
+
+Customer Payment, Voucher and Staff Cash Submission carry the branch
+(`customer_department`) themselves, so branch-scoped queries and permission
+checks don't have to join through Customer. Their indexes lead with it. When a
+customer moves to another branch, their payments and vouchers move with them.
+
+`get_branch_report` computes each branch's figures in its own thread and adds
+them up for the consolidated view. A branch can live on a site of its own (see
+`planner.scripts.move_branch`). It is then listed under `planner_branch_sites`
+in site_config.json, e.g. {"Regional Office - Kandy": "kandy.example.com"}, and
+its figures are read from that site, so the consolidated report still covers
+every branch.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import frappe
+from frappe import _
+from frappe.utils import cint, flt
+
+from planner.planner.collection_rollup import get_customer_cells, move_customer
+from planner.planner.master_data import get_departments
+from planner.planner.permissions import get_allowed_departments, get_restricted_roles
+from planner.planner.replica import prefer_replica, replica_connection
+
+DEFAULT_WORKERS = 4
+
+# Doctypes whose branch is fetched from the customer they belong to.
+CUSTOMER_BRANCH_FIELDS = {
+	"Customer Payment": "customer",
+	"Voucher": "assigned_to_customer",
+}
+
+
+def get_branch_sites() -> dict[str, str]:
+	"""Branches kept on another site, mapped to that site."""
+	return frappe.conf.planner_branch_sites or {}
+
+
+def propagate_customer_branch(customer: str, branch: str | None):
+	"""Moves a customer's payments and vouchers to their new branch, one update per doctype."""
+	cells = get_customer_cells(customer)
+	for doctype, link_field in CUSTOMER_BRANCH_FIELDS.items():
+		frappe.db.set_value(
+			doctype,
+			{link_field: customer},
+			"customer_department",
+			branch,
+			update_modified=False,
+		)
+	move_customer(cells, branch)
+
+
+def get_staff_branch(user: str | None) -> str | None:
+	"""The branch of a staff member, if their User Permissions tie them to exactly one."""
+	if not user:
+		return None
+	branches = frappe.get_all(
+		"User Permission",
+		filters={"user": user, "allow": "Customer Department"},
+		pluck="for_value",
+		limit=2,
+	)
+	return branches[0] if len(branches) == 1 else None
+
+
+@frappe.whitelist()
+def get_branch_report(from_date: str, to_date: str) -> dict:
+	"""
+	Customers, collections, vouchers and cash submissions per branch for the date
+	range, with consolidated totals. Department managers only see their branches.
+	"""
+	frappe.has_permission("Customer Payment", "report", throw=True)
+
+	branches = {d.name for d in get_departments()} | set(get_branch_sites())
+	if get_restricted_roles(frappe.session.user):
+		branches &= set(get_allowed_departments(frappe.session.user))
+
+	site_of = get_branch_sites()
+	sites_path = frappe.local.sites_path
+	workers = cint(frappe.conf.planner_branch_report_workers) or DEFAULT_WORKERS
+	with ThreadPoolExecutor(max_workers=workers) as executor:
+		futures = {
+			branch: executor.submit(
+				run_on_site,
+				site_of.get(branch, frappe.local.site),
+				sites_path,
+				get_branch_figures,
+				branch,
+				from_date,
+				to_date,
+			)
+			for branch in sorted(branches)
+		}
+		rows = [{"branch": branch, **future.result()} for branch, future in futures.items()]
+
+	totals = {key: sum(flt(row[key]) for row in rows) for key in rows[0] if key != "branch"} if rows else {}
+	return {"branches": rows, "total": totals}
+
+
+def run_on_site(site: str, sites_path: str, fn, *args):
+	"""Runs `fn` with its own connection to `site`, on the replica when one is healthy."""
+	frappe.init(site=site, sites_path=sites_path)
+	try:
+		frappe.connect()
+		with prefer_replica(), replica_connection():
+			return fn(*args)
+	finally:
+		frappe.destroy()
+
+
+def get_branch_figures(branch: str, from_date: str, to_date: str) -> dict:
+	"""One branch's figures. Every query filters on the leading column of a branch index."""
+	customers = frappe.db.sql(
+		"""select
+			sum(case when status = 'Active' then 1 else 0 end),
+			sum(case when status = 'Inactive' then 1 else 0 end),
+			sum(case when balance_total > 0 then balance_total else 0 end)
+		from `tabCustomer`
+		where customer_department = %s""",
+		branch,
+	)[0]
+	collections = dict(
+		frappe.db.sql(
+			"""select payment_type, sum(amount)
+			from `tabCustomer Payment`
+			where customer_department = %s and payment_date between %s and %s
+			group by payment_type""",
+			(branch, from_date, to_date),
+		)
+	)
+	vouchers = dict(
+		frappe.db.sql(
+			"""select status, count(*)
+			from `tabVoucher`
+			where customer_department = %s
+			group by status""",
+			branch,
+		)
+	)
+	submitted = frappe.db.sql(
+		"""select sum(amount_cash), sum(amount_bank)
+		from `tabStaff Cash Submission`
+		where customer_department = %s and submit_date between %s and %s and status = 'Approved'""",
+		(branch, from_date, to_date),
+	)[0]
+
+	return {
+		"active_customers": cint(customers[0]),
+		"inactive_customers": cint(customers[1]),
+		"arrears": flt(customers[2]),
+		"cash_collected": flt(collections.get("Cash")),
+		"bank_collected": flt(collections.get("Bank")),
+		"vouchers_available": cint(vouchers.get("Available")),
+		"vouchers_assigned": cint(vouchers.get("Assigned")),
+		"cash_submitted": flt(submitted[0]),
+		"bank_submitted": flt(submitted[1]),
+	}
+
+
+def validate_branch_site(branch: str):
+	if branch in get_branch_sites():
+		frappe.throw(
+			_("Branch {0} has moved to site {1}; record its transactions there.").format(
+				branch, get_branch_sites()[branch]
+			)
+		)
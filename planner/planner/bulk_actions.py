@@ -0,0 +1,207 @@
+# Copyright (c) 2026, Kebazz Technologies and contributors
+# For license information, please see license.txt
+
+"""
+Status changes for many Vouchers or Customers at once.
+
+Desk bulk edit saves every document separately. `apply_bulk_action` instead
+works through the selection in chunks of `CHUNK_SIZE`. Per chunk it reads the
+rows with one `frappe.get_list` query, which applies the user's permissions,
+and changes those in one of the action's source statuses with one UPDATE.
+Other rows are counted as skipped. Controllers, Version records
+and doc_events are not run for these updates.
+
+Instead, each chunk calls the `planner_bulk_update` hooks once with every
+changed row and its previous values:
+
+	planner_bulk_update = ["myapp.handlers.on_planner_bulk_update"]
+
+	def on_planner_bulk_update(doctype, action, rows, values): ...
+
+A selection is either a list of names or list filters. Selections above
+`SYNC_LIMIT` run as a background job that publishes its progress.
+"""
+
+from typing import NamedTuple
+
+import frappe
+from frappe import _
+from frappe.utils import cint
+
+from planner.planner.export import normalize_filters
+
+CHUNK_SIZE = 2000
+SYNC_LIMIT = 500
+EVENT = "planner_bulk_action"
+
+
+class BulkAction(NamedTuple):
+	label: str
+	# Only rows in one of these statuses are changed.
+	from_statuses: tuple[str, ...]
+	values: dict
+	# Extra fields passed to the hooks along with name and status.
+	fields: tuple[str, ...] = ()
+
+
+ACTIONS = {
+	"Voucher": {
+		"expire": BulkAction("Expire", ("Available", "Assigned"), {"status": "Expired"}),
+		"make_available": BulkAction(
+			"Make Available", ("Expired",), {"status": "Available"}, ("assigned_to_customer",)
+		),
+	},
+	"Customer": {
+		"deactivate": BulkAction(
+			"Mark Inactive",
+			("Active",),
+			{"status": "Inactive", "suspended_for_arrears": 0},
+			("balance_total", "device1", "device2"),
+		),
+		"activate": BulkAction(
+			"Mark Active",
+			("Inactive",),
+			{"status": "Active", "suspended_for_arrears": 0},
+			("balance_total", "device1", "device2"),
+		),
+	},
+}
+
+
+def get_action(doctype: str, action: str) -> BulkAction:
+	if action not in ACTIONS.get(doctype, {}):
+		frappe.throw(_("{0} is not a bulk action of {1}").format(action, doctype))
+	return ACTIONS[doctype][action]
+
+
+@frappe.whitelist(methods=["POST"])
+def start_bulk_action(
+	doctype: str, action: str, names: str | list[str] | None = None, filters: str | dict | list | None = None
+) -> dict:
+	"""
+	Applies `action` to the named documents, or to those matching `filters`.
+	Small selections are applied right away and their summary returned; larger
+	ones are queued and report through `planner_bulk_action` realtime events.
+	"""
+	get_action(doctype, action)
+	frappe.has_permission(doctype, "write", throw=True)
+	names = frappe.parse_json(names) if isinstance(names, str) else names
+	filters = normalize_filters(frappe.parse_json(filters) or []) if filters else []
+	if names is None and not filters:
+		frappe.throw(_("Select the documents or give filters"))
+
+	count = len(names) if names is not None else count_selection(doctype, filters)
+	if count <= SYNC_LIMIT:
+		return apply_bulk_action(doctype, action, names, filters)
+
+	job_id = frappe.generate_hash(length=10)
+	frappe.enqueue(
+		apply_bulk_action,
+		queue="long",
+		timeout=4 * 60 * 60,
+		job_id=f"planner_bulk_action::{job_id}",
+		doctype=doctype,
+		action=action,
+		names=names,
+		filters=filters,
+		job=job_id,
+	)
+	return {"queued": True, "job": job_id, "total": count}
+
+
+def count_selection(doctype: str, filters: list) -> int:
+	return cint(frappe.get_list(doctype, filters=filters, fields=["count(name) as count"])[0].count)
+
+
+def iter_chunks(doctype: str, names: list[str] | None, filters: list, fields: list[str]):
+	"""Yields the permitted rows of the selection in name order, a chunk at a time."""
+	if names is not None:
+		names = sorted(set(names))
+		for start in range(0, len(names), CHUNK_SIZE):
+			chunk = names[start : start + CHUNK_SIZE]
+			yield (
+				chunk,
+				frappe.get_list(
+					doctype,
+					filters=[*filters, ["name", "in", chunk]],
+					fields=fields,
+					order_by="name asc",
+					limit_page_length=0,
+				),
+			)
+		return
+
+	last = None
+	while True:
+		keyset = [["name", ">", last]] if last else []
+		rows = frappe.get_list(
+			doctype,
+			filters=filters + keyset,
+			fields=fields,
+			order_by="name asc",
+			limit_page_length=CHUNK_SIZE,
+		)
+		if not rows:
+			return
+		yield [row.name for row in rows], rows
+		last = rows[-1].name
+
+
+def apply_bulk_action(
+	doctype: str,
+	action: str,
+	names: list[str] | None = None,
+	filters: list | None = None,
+	job: str | None = None,
+) -> dict:
+	"""Applies the action chunk by chunk, committing after each; also runs as the background job."""
+	spec = get_action(doctype, action)
+	filters = filters or []
+	fields = list(dict.fromkeys(["name", "status", *spec.fields]))
+	total = len(names) if names is not None else count_selection(doctype, filters)
+	summary = {"doctype": doctype, "action": action, "total": total, "changed": 0, "skipped": 0}
+	user = frappe.session.user
+
+	for selected, rows in iter_chunks(doctype, names, filters, fields):
+		eligible = [row for row in rows if row.status in spec.from_statuses]
+		changed = update_rows(doctype, eligible, spec.values)
+		if changed:
+			frappe.clear_document_cache(doctype)
+			for method in frappe.get_hooks("planner_bulk_update"):
+				frappe.get_attr(method)(doctype, action, changed, spec.values)
+		frappe.db.commit()
+
+		summary["changed"] += len(changed)
+		summary["skipped"] += len(selected) - len(changed)
+		if job:
+			done = summary["changed"] + summary["skipped"]
+			frappe.publish_progress(
+				done * 100 / (total or done),
+				title=_("{0}: {1}").format(_(doctype), _(spec.label)),
+				description=_("{0} of {1} documents").format(done, total),
+			)
+			frappe.publish_realtime(EVENT, {"job": job, "status": "running", **summary}, user=user)
+
+	if job:
+		frappe.publish_realtime(EVENT, {"job": job, "status": "completed", **summary}, user=user)
+	return summary
+
+
+def update_rows(doctype: str, rows: list, values: dict) -> list:
+	"""Sets `values` on those of `rows` still in the status they were read in; returns those rows."""
+	if not rows:
+		return []
+
+	# Locked and re-read, so a row changed since the permission query keeps its new status.
+	current = dict(
+		frappe.db.sql(
+			f"select name, status from `tab{doctype}` where name in %s for update",
+			(tuple(row.name for row in rows),),
+		)
+	)
+	rows = [row for row in rows if current.get(row.name) == row.status]
+	if rows:
+		frappe.db.set_value(
+			doctype, {"name": ("in", [row.name for row in rows])}, values, update_modified=True
+		)
+	return rows
@@ -0,0 +1,239 @@
+# Copyright (c) 2026, Kebazz Technologies and contributors
+# For license information, please see license.txt
+
+"""
+Daily collections rollup for charts and trend reports.
+
+Collection Rollup holds one row per day, collector, department, package and
+payment type, with the amount and number of payments. Customer Payment
+doc_events keep it current: a save subtracts the payment's previous cell and
+adds its new one with a single upsert. Charts query this table, which has a
+few rows per collector and day, instead of the payments themselves.
+
+Rows are named by a hash of their cell, so the database can compute the same
+names when `backfill` rebuilds history. Each month is rebuilt by its own
+background job with one INSERT ... SELECT, so months run in parallel.
+
+`get_collections` answers any group-by and filter combination over the rollup
+with one aggregate query, at day, month or year granularity.
+"""
+
+import hashlib
+from collections import defaultdict
+
+import frappe
+from frappe import _
+from frappe.utils import add_months, flt, get_first_day, get_last_day, getdate, nowdate
+
+from planner.planner.permissions import get_collection_rollup_conditions
+from planner.planner.replica import read_from_replica
+from planner.planner.utils import upsert_increments
+
+DIMENSIONS = ("collector", "customer_department", "package", "payment_type")
+GRANULARITIES = {
+	"day": "`date`",
+	"month": "date_format(`date`, '%%Y-%%m')",
+	"year": "year(`date`)",
+}
+
+
+def get_cell_name(day, collector, department, package, payment_type) -> str:
+	key = "|".join((str(getdate(day)), collector or "", department or "", package or "", payment_type or ""))
+	return hashlib.sha1(key.encode()).hexdigest()[:20]
+
+
+def get_cell(doc) -> tuple | None:
+	if not doc or not doc.payment_date:
+		return None
+	return (
+		str(getdate(doc.payment_date)),
+		doc.collected_by or None,
+		doc.customer_department or None,
+		doc.package or None,
+		doc.payment_type or None,
+	)
+
+
+def on_update(doc, method=None):
+	"""doc_events handler for Customer Payment: moves the payment between cells if needed."""
+	before = doc.get_doc_before_save()
+	deltas = defaultdict(lambda: [0.0, 0])
+	if cell := get_cell(before):
+		deltas[cell][0] -= flt(before.amount)
+		deltas[cell][1] -= 1
+	if cell := get_cell(doc):
+		deltas[cell][0] += flt(doc.amount)
+		deltas[cell][1] += 1
+	update_rollup(deltas)
+
+
+def on_trash(doc, method=None):
+	if cell := get_cell(doc):
+		update_rollup({cell: (-flt(doc.amount), -1)})
+
+
+def update_rollup(deltas: dict):
+	"""Adds cell -> (amount, payments) deltas in a single upsert."""
+	upsert_increments(
+		"Collection Rollup",
+		[
+			{
+				"name": get_cell_name(*cell),
+				"date": cell[0],
+				"collector": cell[1],
+				"customer_department": cell[2],
+				"package": cell[3],
+				"payment_type": cell[4],
+				"amount": flt(amount, 2),
+				"payments": payments,
+			}
+			for cell, (amount, payments) in deltas.items()
+			if flt(amount, 2) or payments
+		],
+		["amount", "payments"],
+	)
+
+
+def get_customer_cells(customer: str) -> dict:
+	"""The cells holding a customer's payments, with their amounts and counts."""
+	return {
+		(str(row.date), row.collector, row.department, row.package, row.payment_type): (
+			flt(row.amount),
+			row.payments,
+		)
+		for row in frappe.db.sql(
+			"""select payment_date as date, collected_by as collector, customer_department as department,
+				package, payment_type, sum(amount) as amount, count(*) as payments
+			from `tabCustomer Payment`
+			where customer = %s and payment_date is not null
+			group by payment_date, collected_by, customer_department, package, payment_type""",
+			customer,
+			as_dict=True,
+		)
+	}
+
+
+def move_customer(cells: dict, branch: str | None):
+	"""Moves the given cells of a customer (see `get_customer_cells`) to another branch."""
+	deltas = defaultdict(lambda: [0.0, 0])
+	for (day, collector, department, package, payment_type), (amount, payments) in cells.items():
+		if department == branch:
+			continue
+		deltas[(day, collector, department, package, payment_type)][0] -= amount
+		deltas[(day, collector, department, package, payment_type)][1] -= payments
+		deltas[(day, collector, branch, package, payment_type)][0] += amount
+		deltas[(day, collector, branch, package, payment_type)][1] += payments
+	update_rollup(deltas)
+
+
+def backfill(from_date: str | None = None, to_date: str | None = None, enqueue: bool = True):
+	"""
+	Rebuilds the rollup for every month between the dates (default: all payments),
+	one background job per month.
+
+	bench --site [site] execute planner.planner.collection_rollup.backfill
+	bench --site [site] execute planner.planner.collection_rollup.backfill --kwargs "{'from_date': '2026-01-01'}"
+	"""
+	if not from_date or not to_date:
+		first, last = frappe.db.sql("select min(payment_date), max(payment_date) from `tabCustomer Payment`")[
+			0
+		]
+		if not first:
+			return
+		from_date, to_date = from_date or first, to_date or last
+
+	month = get_first_day(from_date)
+	while month <= getdate(to_date):
+		if enqueue:
+			frappe.enqueue(
+				rebuild_month,
+				queue="long",
+				job_id=f"planner_rebuild_collection_rollup::{month:%Y-%m}",
+				deduplicate=True,
+				month=str(month),
+			)
+		else:
+			rebuild_month(str(month))
+		month = add_months(month, 1)
+
+
+def rebuild_month(month: str):
+	"""Background job: recomputes the rollup rows of one month from its payments."""
+	from_date, to_date = get_first_day(month), get_last_day(month)
+	frappe.db.delete("Collection Rollup", {"date": ("between", (from_date, to_date))})
+	frappe.db.sql(
+		"""insert into `tabCollection Rollup`
+			(name, date, collector, customer_department, package, payment_type, amount, payments,
+			creation, modified, owner, modified_by, docstatus)
+		select left(sha1(concat_ws('|', payment_date, ifnull(collected_by, ''), ifnull(customer_department, ''),
+				ifnull(package, ''), ifnull(payment_type, ''))), 20),
+			payment_date, collected_by, customer_department, package, payment_type, sum(amount), count(*),
+			now(), now(), 'Administrator', 'Administrator', 0
+		from `tabCustomer Payment`
+		where payment_date between %s and %s
+		group by payment_date, collected_by, customer_department, package, payment_type""",
+		(from_date, to_date),
+	)
+	frappe.db.commit()
+
+
+@frappe.whitelist()
+@read_from_replica
+def get_collections(
+	group_by: list[str] | str | None = None,
+	filters: dict | str | None = None,
+	from_date: str | None = None,
+	to_date: str | None = None,
+	granularity: str | None = "day",
+) -> list[dict]:
+	"""
+	Collected amount and number of payments per period, broken down by any of
+	`DIMENSIONS`. `filters` maps dimensions to a value or a list of values.
+	Pass no granularity for totals over the whole range. Cells whose payments were all
+	edited away or deleted are left in the rollup at zero and are not returned.
+	"""
+	frappe.has_permission("Collection Rollup", "read", throw=True)
+	group_by = frappe.parse_json(group_by) if isinstance(group_by, str) else group_by or []
+	filters = frappe.parse_json(filters) if isinstance(filters, str) else filters or {}
+	for dimension in [*group_by, *filters]:
+		if dimension not in DIMENSIONS:
+			frappe.throw(_("Cannot group or filter collections by {0}").format(dimension))
+	if granularity and granularity not in GRANULARITIES:
+		frappe.throw(_("Granularity must be one of {0}").format(", ".join(GRANULARITIES)))
+
+	to_date = getdate(to_date or nowdate())
+	from_date = getdate(from_date or add_months(to_date, -12))
+	conditions, values = (
+		["`date` between %(from_date)s and %(to_date)s"],
+		{
+			"from_date": from_date,
+			"to_date": to_date,
+		},
+	)
+	for dimension, value in filters.items():
+		value = tuple(value) if isinstance(value, list | tuple) else (value,)
+		conditions.append(f"`{dimension}` in %({dimension})s" if value else "1=0")
+		values[dimension] = value
+	if condition := get_collection_rollup_conditions():
+		conditions.append(condition)
+
+	columns = [f"`{d}`" for d in group_by]
+	if granularity:
+		columns.insert(0, f"{GRANULARITIES[granularity]} as period")
+	keys = ["period", *columns[1:]] if granularity else columns
+
+	return frappe.db.sql(
+		"""select {columns}sum(amount) as amount, sum(payments) as payments
+		from `tabCollection Rollup`
+		where {conditions}
+		{group_by}
+		having sum(payments) <> 0
+		{order_by}""".format(
+			columns="".join(f"{c}, " for c in columns),
+			conditions=" and ".join(conditions),
+			group_by=f"group by {', '.join(keys)}" if keys else "",
+			order_by=f"order by {', '.join(keys)}" if keys else "",
+		),
+		values,
+		as_dict=True,
+	)
@@ -0,0 +1,280 @@
+# Copyright (c) 2026, Kebazz Technologies and contributors
+# For license information, please see license.txt
+
+"""
+Cash held by each collector (their float), kept up to date as documents change.
+
+A collector's float is the cash from their Customer Payments that are not yet
+`company_received`, less the cash of their approved Staff Cash Submissions.
+doc_events on both doctypes turn every save into deltas, which are added with
+one upsert per table:
+
+- Collector Float holds the running totals per collector.
+- Collector Float Day holds the same totals per collector and document date,
+  so the float can be charted over time.
+
+A save that takes a float above its limit notifies the collector and the
+System Managers. The limit is the Collector Float's `float_limit`, or else
+`planner_collector_float_limit` in site_config.json; without either there are
+no alerts. `check_floats` recomputes everything from the source tables every
+night and adds back any difference.
+"""
+
+from collections import defaultdict
+
+import frappe
+from frappe import _
+from frappe.desk.doctype.notification_log.notification_log import enqueue_create_notification
+from frappe.utils import cint, flt, fmt_money, getdate, now_datetime
+from frappe.utils.user import get_users_with_role
+
+from planner.planner.utils import upsert_increments
+
+PRECISION = 2
+
+# Per collector and date: cash collected and cash submitted.
+SOURCE_QUERY = """
+	select collector, day, sum(collected) as collected, sum(submitted) as submitted from (
+		select collected_by as collector, payment_date as day, amount as collected, 0 as submitted
+		from `tabCustomer Payment`
+		where ifnull(collected_by, '') != '' and ifnull(payment_type, '') != 'Bank'
+			and ifnull(company_received, 0) = 0
+		union all
+		select staff_user, submit_date, 0, amount_cash
+		from `tabStaff Cash Submission`
+		where ifnull(staff_user, '') != '' and status = 'Approved'
+	) t
+	group by collector, day"""
+
+
+def get_contribution(doc) -> dict[tuple[str, str | None], tuple[float, float]]:
+	"""(collector, date) -> (collected, submitted) that `doc` adds to the floats."""
+	if not doc:
+		return {}
+	if doc.doctype == "Customer Payment":
+		if doc.collected_by and doc.payment_type != "Bank" and not cint(doc.company_received):
+			return {(doc.collected_by, get_day(doc.payment_date)): (flt(doc.amount), 0.0)}
+	elif doc.staff_user and doc.status == "Approved":
+		return {(doc.staff_user, get_day(doc.submit_date)): (0.0, flt(doc.amount_cash))}
+	return {}
+
+
+def get_day(date) -> str | None:
+	return str(getdate(date)) if date else None
+
+
+def on_update(doc, method=None):
+	"""doc_events handler for Customer Payment and Staff Cash Submission."""
+	deltas = defaultdict(lambda: [0.0, 0.0])
+	for key, (collected, submitted) in get_contribution(doc.get_doc_before_save()).items():
+		deltas[key][0] -= collected
+		deltas[key][1] -= submitted
+	for key, (collected, submitted) in get_contribution(doc).items():
+		deltas[key][0] += collected
+		deltas[key][1] += submitted
+	update_floats(deltas)
+
+
+def on_trash(doc, method=None):
+	update_floats(
+		{key: (-collected, -submitted) for key, (collected, submitted) in get_contribution(doc).items()}
+	)
+
+
+def update_floats(deltas: dict):
+	"""Adds (collector, date) -> (collected, submitted) deltas to both tables, one upsert each."""
+	totals = defaultdict(lambda: [0.0, 0.0])
+	days = []
+	for (collector, day), (collected, submitted) in deltas.items():
+		collected, submitted = flt(collected, PRECISION), flt(submitted, PRECISION)
+		if not collected and not submitted:
+			continue
+		totals[collector][0] += collected
+		totals[collector][1] += submitted
+		if day:
+			days.append(
+				{
+					"name": f"{day}:{collector}",
+					"collector": collector,
+					"date": day,
+					"cash_collected": collected,
+					"cash_submitted": submitted,
+				}
+			)
+
+	if not totals:
+		return
+
+	upsert_increments(
+		"Collector Float",
+		[
+			{
+				"name": collector,
+				"collector": collector,
+				"cash_collected": collected,
+				"cash_submitted": submitted,
+				"cash_in_hand": collected - submitted,
+			}
+			for collector, (collected, submitted) in totals.items()
+		],
+		["cash_collected", "cash_submitted", "cash_in_hand"],
+	)
+	upsert_increments("Collector Float Day", days, ["cash_collected", "cash_submitted"])
+
+	if increased := {
+		c: collected - submitted for c, (collected, submitted) in totals.items() if collected > submitted
+	}:
+		check_limits(increased)
+
+
+def get_default_limit() -> float:
+	return flt(frappe.conf.planner_collector_float_limit)
+
+
+def check_limits(increases: dict[str, float]):
+	"""Alerts for the collectors whose float just went above their limit."""
+	default_limit = get_default_limit()
+	floats = frappe.db.sql(
+		"select name, cash_in_hand, float_limit from `tabCollector Float` where name in %s",
+		(tuple(increases),),
+		as_dict=True,
+	)
+	for row in floats:
+		limit = flt(row.float_limit) or default_limit
+		# Only crossing the limit alerts, not every further payment above it.
+		if limit and flt(row.cash_in_hand) > limit >= flt(row.cash_in_hand) - increases[row.name]:
+			frappe.db.set_value(
+				"Collector Float", row.name, "alerted_on", now_datetime(), update_modified=False
+			)
+			frappe.db.after_commit.add(
+				lambda row=row, limit=limit: send_limit_alert(row.name, row.cash_in_hand, limit)
+			)
+
+
+def send_limit_alert(collector: str, cash_in_hand: float, limit: float):
+	recipients = {collector, *get_users_with_role("System Manager")}
+	enqueue_create_notification(
+		list(recipients),
+		{
+			"type": "Alert",
+			"document_type": "Collector Float",
+			"document_name": collector,
+			"subject": _("{0} is holding {1} in cash, above the limit of {2}").format(
+				frappe.bold(collector), fmt_money(cash_in_hand), fmt_money(limit)
+			),
+		},
+	)
+
+
+def check_floats() -> int:
+	"""
+	Daily scheduler job: recomputes every float from the source tables and adds
+	back any difference to the stored totals. Returns the number of rows fixed.
+
+	bench --site [site] execute planner.planner.collector_float.check_floats
+	"""
+	expected_days = defaultdict(lambda: [0.0, 0.0])
+	expected_totals = defaultdict(lambda: [0.0, 0.0])
+	for row in frappe.db.sql(SOURCE_QUERY, as_dict=True):
+		expected_totals[row.collector][0] += flt(row.collected)
+		expected_totals[row.collector][1] += flt(row.submitted)
+		if row.day:
+			expected_days[(row.collector, get_day(row.day))][0] += flt(row.collected)
+			expected_days[(row.collector, get_day(row.day))][1] += flt(row.submitted)
+
+	stored_totals = {
+		row.name: (flt(row.cash_collected), flt(row.cash_submitted), flt(row.cash_in_hand))
+		for row in frappe.get_all(
+			"Collector Float", fields=["name", "cash_collected", "cash_submitted", "cash_in_hand"]
+		)
+	}
+	stored_days = {
+		(row.collector, str(row.date)): (flt(row.cash_collected), flt(row.cash_submitted))
+		for row in frappe.get_all(
+			"Collector Float Day", fields=["collector", "date", "cash_collected", "cash_submitted"]
+		)
+	}
+
+	total_rows = []
+	for collector in set(expected_totals) | set(stored_totals):
+		collected, submitted = expected_totals.get(collector, (0.0, 0.0))
+		stored = stored_totals.get(collector, (0.0, 0.0, 0.0))
+		diff = (
+			flt(collected - stored[0], PRECISION),
+			flt(submitted - stored[1], PRECISION),
+			flt(collected - submitted - stored[2], PRECISION),
+		)
+		if any(diff):
+			total_rows.append(
+				{
+					"name": collector,
+					"collector": collector,
+					"cash_collected": diff[0],
+					"cash_submitted": diff[1],
+					"cash_in_hand": diff[2],
+				}
+			)
+
+	day_rows = []
+	for collector, day in set(expected_days) | set(stored_days):
+		collected, submitted = expected_days.get((collector, day), (0.0, 0.0))
+		stored = stored_days.get((collector, day), (0.0, 0.0))
+		diff = (flt(collected - stored[0], PRECISION), flt(submitted - stored[1], PRECISION))
+		if any(diff):
+			day_rows.append(
+				{
+					"name": f"{day}:{collector}",
+					"collector": collector,
+					"date": day,
+					"cash_collected": diff[0],
+					"cash_submitted": diff[1],
+				}
+			)
+
+	upsert_increments("Collector Float", total_rows, ["cash_collected", "cash_submitted", "cash_in_hand"])
+	upsert_increments("Collector Float Day", day_rows, ["cash_collected", "cash_submitted"])
+	frappe.db.commit()
+
+	if total_rows or day_rows:
+		frappe.log_error(
+			"Collector floats out of sync",
+			"Corrected collectors: {}\nCorrected days: {}".format(
+				", ".join(sorted(r["name"] for r in total_rows)), len(day_rows)
+			),
+		)
+	return len(total_rows) + len(day_rows)
+
+
+@frappe.whitelist()
+def get_float_history(collector: str | None = None, from_date: str | None = None, to_date: str | None = None):
+	"""A collector's float at the end of each day with activity between the dates."""
+	collector = collector or frappe.session.user
+	if collector != frappe.session.user:
+		frappe.has_permission("Collector Float", "read", throw=True)
+
+	opening = 0.0
+	if from_date:
+		opening = flt(
+			frappe.db.sql(
+				"""select sum(cash_collected - cash_submitted) from `tabCollector Float Day`
+				where collector = %s and date < %s""",
+				(collector, from_date),
+			)[0][0]
+		)
+
+	filters = {"collector": collector}
+	if from_date and to_date:
+		filters["date"] = ("between", (from_date, to_date))
+	elif from_date or to_date:
+		filters["date"] = (">=", from_date) if from_date else ("<=", to_date)
+
+	history, cash_in_hand = [], opening
+	for row in frappe.get_all(
+		"Collector Float Day",
+		filters=filters,
+		fields=["date", "cash_collected", "cash_submitted"],
+		order_by="date",
+	):
+		cash_in_hand += flt(row.cash_collected) - flt(row.cash_submitted)
+		history.append({**row, "cash_in_hand": flt(cash_in_hand, PRECISION)})
+	return {"collector": collector, "opening": flt(opening, PRECISION), "history": history}
@@ -0,0 +1,272 @@
+# Copyright (c) 2026, Kebazz Technologies and contributors
+# For license information, please see license.txt
+
+"""
+Finding and merging customers registered twice.
+
+Comparing every customer with every other one doesn't scale. Instead each
+customer gets blocking keys:
+
+- their phone number, reduced to its last 9 digits,
+- a phonetic key of their name (Soundex of each word, sorted), and
+- each device ID.
+
+Only customers sharing a key are scored against each other, so the work grows
+with the size of the blocks rather than with the square of the customer count.
+A block larger than `MAX_BLOCK_SIZE` is too common a key to be useful and is
+skipped. Pairs scoring at least `planner_customer_match_threshold` (default
+0.6) are stored as Customer Duplicate Candidates for review.
+
+`merge_customers` folds one customer into another. Every link to the duplicate
+is repointed with one UPDATE per linking field, and the balances are added up.
+"""
+
+import re
+from collections import defaultdict
+from difflib import SequenceMatcher
+from itertools import combinations
+
+import frappe
+from frappe import _
+from frappe.model.rename_doc import get_link_fields
+from frappe.utils import flt, getdate, now_datetime
+
+from planner.planner.branches import propagate_customer_branch
+from planner.planner.duplicates import get_fingerprint
+from planner.planner.subscriptions import close_periods
+
+MAX_BLOCK_SIZE = 50
+DEFAULT_THRESHOLD = 0.6
+PHONE_DIGITS = 9
+
+SOUNDEX_CODES = {
+	letter: str(code)
+	for code, letters in enumerate(("aeiouyhw", "bfpv", "cgjkqsxz", "dt", "l", "mn", "r"))
+	for letter in letters
+}
+
+CANDIDATE_FIELDS = (
+	"name",
+	"owner",
+	"creation",
+	"modified",
+	"modified_by",
+	"docstatus",
+	"customer_a",
+	"customer_b",
+	"score",
+	"match_reasons",
+	"status",
+)
+
+
+def normalize_name(name: str) -> str:
+	return " ".join(sorted(re.sub(r"[^\w\s]", " ", (name or "").casefold()).split()))
+
+
+def normalize_phone(phone: str | None) -> str | None:
+	digits = re.sub(r"\D", "", phone or "")
+	return digits[-PHONE_DIGITS:] if len(digits) >= PHONE_DIGITS else None
+
+
+def normalize_device(device: str | None) -> str | None:
+	return re.sub(r"[^0-9A-Z]", "", (device or "").upper()) or None
+
+
+def soundex(word: str) -> str:
+	letters = [c for c in word.casefold() if c.isalpha()]
+	if not letters:
+		return ""
+	codes, previous = [], SOUNDEX_CODES.get(letters[0])
+	for letter in letters[1:]:
+		code = SOUNDEX_CODES.get(letter)
+		if code and code != "0" and code != previous:
+			codes.append(code)
+		if letter not in "hw":
+			previous = code
+	return (letters[0].upper() + "".join(codes) + "000")[:4]
+
+
+def phonetic_key(name: str) -> str | None:
+	codes = sorted(filter(None, (soundex(word) for word in normalize_name(name).split() if len(word) > 1)))
+	return " ".join(codes) or None
+
+
+def get_blocking_keys(customer) -> set[str]:
+	keys = set()
+	if phone := normalize_phone(customer.phone_number):
+		keys.add(f"phone:{phone}")
+	if name_key := phonetic_key(customer.customer_name or customer.name):
+		keys.add(f"name:{name_key}")
+	for device in (customer.device1, customer.device2):
+		if device := normalize_device(device):
+			keys.add(f"device:{device}")
+	return keys
+
+
+def score_pair(a, b) -> tuple[float, list[str]]:
+	reasons = []
+	name_similarity = SequenceMatcher(
+		None, normalize_name(a.customer_name or a.name), normalize_name(b.customer_name or b.name)
+	).ratio()
+	score = 0.5 * name_similarity
+	if name_similarity >= 0.8:
+		reasons.append(_("similar name"))
+
+	phone = normalize_phone(a.phone_number)
+	if phone and phone == normalize_phone(b.phone_number):
+		score += 0.3
+		reasons.append(_("same phone"))
+
+	devices = {normalize_device(a.device1), normalize_device(a.device2)} - {None}
+	if devices & {normalize_device(b.device1), normalize_device(b.device2)}:
+		score += 0.3
+		reasons.append(_("same device"))
+
+	return min(score, 1.0), reasons
+
+
+def find_duplicate_customers() -> int:
+	"""
+	Weekly scheduler job: stores new candidate pairs and returns how many were found.
+
+	bench --site [site] execute planner.planner.customer_dedup.find_duplicate_customers
+	"""
+	threshold = flt(frappe.conf.planner_customer_match_threshold) or DEFAULT_THRESHOLD
+	customers = frappe.get_all(
+		"Customer", fields=["name", "customer_name", "phone_number", "device1", "device2"]
+	)
+
+	blocks = defaultdict(list)
+	for i, customer in enumerate(customers):
+		for key in get_blocking_keys(customer):
+			blocks[key].append(i)
+
+	pairs = set()
+	for members in blocks.values():
+		if 1 < len(members) <= MAX_BLOCK_SIZE:
+			pairs.update(combinations(members, 2))
+
+	known = {
+		tuple(sorted(pair))
+		for pair in frappe.get_all(
+			"Customer Duplicate Candidate", fields=["customer_a", "customer_b"], as_list=True
+		)
+	}
+	now = now_datetime()
+	rows = []
+	for i, j in pairs:
+		a, b = sorted((customers[i], customers[j]), key=lambda c: c.name)
+		if (a.name, b.name) in known:
+			continue
+		score, reasons = score_pair(a, b)
+		if score >= threshold:
+			rows.append(
+				(
+					frappe.generate_hash(length=10),
+					"Administrator",
+					now,
+					now,
+					"Administrator",
+					0,
+					a.name,
+					b.name,
+					flt(score * 100, 1),
+					", ".join(reasons),
+					"Open",
+				)
+			)
+
+	frappe.db.bulk_insert("Customer Duplicate Candidate", CANDIDATE_FIELDS, rows, chunk_size=5000)
+	return len(rows)
+
+
+@frappe.whitelist(methods=["POST"])
+def merge_customers(source: str, target: str):
+	"""Merges customer `source` into `target` and deletes `source`."""
+	frappe.only_for("System Manager")
+	if source == target:
+		frappe.throw(_("Cannot merge a customer into itself"))
+
+	customers = {
+		c.name: c
+		for c in frappe.db.sql(
+			"""select name, status, balance_total, phone_number, device1, device2, customer_department
+			from `tabCustomer` where name in %s for update""",
+			((source, target),),
+			as_dict=True,
+		)
+	}
+	for name in (source, target):
+		if name not in customers:
+			frappe.throw(_("Customer {0} not found").format(name))
+	src, dst = customers[source], customers[target]
+
+	# The duplicate's payments take the target's fingerprint before they move.
+	payments = frappe.get_all(
+		"Customer Payment",
+		filters={"customer": source},
+		fields=["name", "amount", "payment_type", "voucher"],
+	)
+	if payments:
+		frappe.db.bulk_update(
+			"Customer Payment",
+			{
+				p.name: {
+					"duplicate_fingerprint": get_fingerprint(target, p.amount, p.payment_type, p.voucher)
+				}
+				for p in payments
+			},
+			update_modified=False,
+		)
+
+	# The target's subscription continues; the duplicate's ends today.
+	open_periods = frappe.get_all(
+		"Customer Subscription Period",
+		filters={"customer": source, "to_date": ("is", "not set")},
+		fields=["name", "from_date"],
+	)
+	if open_periods:
+		close_periods(open_periods, getdate())
+
+	repoint_links(source, target)
+	propagate_customer_branch(target, dst.customer_department)
+
+	updates = {
+		"balance_total": flt(src.balance_total) + flt(dst.balance_total),
+		"status": "Active" if "Active" in (src.status, dst.status) else dst.status,
+	}
+	for field in ("phone_number", "device1", "device2"):
+		if not dst.get(field) and src.get(field):
+			updates[field] = src.get(field)
+	frappe.db.set_value("Customer", target, updates, update_modified=True)
+	frappe.db.set_value("Customer", source, "balance_total", 0, update_modified=False)
+
+	# Pairs that now point at the target twice are this merge.
+	frappe.db.set_value(
+		"Customer Duplicate Candidate",
+		{"customer_a": target, "customer_b": target},
+		"status",
+		"Merged",
+	)
+	frappe.delete_doc("Customer", source, ignore_permissions=True)
+	return target
+
+
+def repoint_links(source: str, target: str):
+	"""Points every link to customer `source` at `target`, one UPDATE per linking field."""
+	for link in get_link_fields("Customer"):
+		if link.issingle:
+			continue
+		frappe.db.set_value(
+			link.parent, {link.fieldname: source}, link.fieldname, target, update_modified=False
+		)
+
+	# Cash submission items reference documents through a Dynamic Link.
+	frappe.db.set_value(
+		"Staff Cash Submission Item",
+		{"reference_doctype": "Customer", "reference_name": source},
+		"reference_name",
+		target,
+		update_modified=False,
+	)
@@ -0,0 +1,178 @@
+# Copyright (c) 2026, Kebazz Technologies and contributors
+# For license information, please see license.txt
+
+"""
+Automatic suspension and reactivation of customers based on their arrears.
+
+A customer owing more than `planner_suspend_after_months` (site_config.json,
+default 2) months of their Lak Package's monthly fee is set Inactive by the
+daily job. They are set Active again as soon as a Customer Payment brings their
+balance to zero or below; the daily job sweeps up any that were settled some
+other way. Only customers suspended here are reactivated automatically.
+
+Every status change is recorded in Customer Status Log together with the
+customer's devices, for the network side to disable or enable them.
+"""
+
+import json
+
+import frappe
+from frappe.utils import cint, now_datetime
+
+DEFAULT_SUSPEND_AFTER_MONTHS = 2
+CHUNK_SIZE = 500
+
+ACTIVE = "Active"
+INACTIVE = "Inactive"
+
+LOG_FIELDS = (
+	"name",
+	"owner",
+	"creation",
+	"modified",
+	"modified_by",
+	"docstatus",
+	"customer",
+	"old_status",
+	"new_status",
+	"reason",
+	"balance_total",
+	"device1",
+	"device2",
+	"processed",
+)
+
+# Re-checked per chunk under a row lock, so a payment landing between the
+# candidate query and the update isn't overridden.
+SUSPEND_CONDITION = """status = 'Active'
+	and balance_total > %(months)s * (
+		select p.monthly_fee from `tabLak Package` p where p.name = `tabCustomer`.package_assigned
+	)"""
+REACTIVATE_CONDITION = "status = 'Inactive' and suspended_for_arrears = 1 and balance_total <= 0"
+
+
+def get_suspend_after_months() -> int:
+	return cint(frappe.conf.planner_suspend_after_months) or DEFAULT_SUSPEND_AFTER_MONTHS
+
+
+def update_customer_statuses():
+	"""
+	Daily scheduler job: suspends customers in arrears and reactivates settled ones.
+
+	bench --site [site] execute planner.planner.customer_lifecycle.update_customer_statuses
+	"""
+	months = get_suspend_after_months()
+	suspend = frappe.db.sql_list(
+		"""select c.name
+		from `tabCustomer` c
+		join `tabLak Package` p on p.name = c.package_assigned
+		where c.status = 'Active' and p.monthly_fee > 0 and c.balance_total > %s * p.monthly_fee""",
+		months,
+	)
+	reactivate = frappe.db.sql_list(f"select name from `tabCustomer` where {REACTIVATE_CONDITION}")
+
+	for start in range(0, len(suspend), CHUNK_SIZE):
+		set_status(suspend[start : start + CHUNK_SIZE], INACTIVE, "Arrears", {"months": months})
+		frappe.db.commit()
+
+	for start in range(0, len(reactivate), CHUNK_SIZE):
+		set_status(reactivate[start : start + CHUNK_SIZE], ACTIVE, "Payment")
+		frappe.db.commit()
+
+
+def reactivate_on_payment(doc, method=None):
+	"""doc_events handler: reactivates the customer once the payment has cleared their arrears."""
+	if doc.customer:
+		set_status([doc.customer], ACTIVE, "Payment")
+
+
+def set_status(names: list[str], status: str, reason: str, values: dict | None = None) -> list[str]:
+	"""
+	Moves those of `names` that still qualify to `status` and logs each change.
+	Returns the customers that were changed.
+	"""
+	if not names:
+		return []
+
+	condition = SUSPEND_CONDITION if status == INACTIVE else REACTIVATE_CONDITION
+	rows = frappe.db.sql(
+		f"""select name, status, balance_total, device1, device2
+		from `tabCustomer`
+		where name in %(names)s and {condition}
+		for update""",
+		{"names": tuple(names), **(values or {})},
+		as_dict=True,
+	)
+	if not rows:
+		return []
+
+	changed = [row.name for row in rows]
+	frappe.db.set_value(
+		"Customer",
+		{"name": ("in", changed)},
+		{"status": status, "suspended_for_arrears": int(status == INACTIVE)},
+		update_modified=True,
+	)
+	log_status_changes(rows, status, reason)
+	return changed
+
+
+def on_bulk_update(doctype: str, action: str, rows: list, values: dict):
+	"""planner_bulk_update hook: logs status changes made through bulk actions."""
+	if doctype == "Customer" and "status" in values:
+		log_status_changes(rows, values["status"], "Manual")
+
+
+def log_status_changes(rows, new_status: str, reason: str):
+	now = now_datetime()
+	user = frappe.session.user
+	frappe.db.bulk_insert(
+		"Customer Status Log",
+		LOG_FIELDS,
+		[
+			(
+				frappe.generate_hash(length=10),
+				user,
+				now,
+				now,
+				user,
+				0,
+				row.name,
+				row.status,
+				new_status,
+				reason,
+				row.balance_total,
+				row.device1,
+				row.device2,
+				0,
+			)
+			for row in rows
+		],
+	)
+
+
+@frappe.whitelist()
+def get_pending_status_changes(limit: int = 500) -> list[dict]:
+	"""Unprocessed status changes, oldest first, for the network side to act on."""
+	frappe.has_permission("Customer Status Log", "write", throw=True)
+	return frappe.get_all(
+		"Customer Status Log",
+		filters={"processed": 0},
+		fields=["name", "customer", "old_status", "new_status", "device1", "device2", "creation"],
+		order_by="creation asc",
+		limit=cint(limit),
+	)
+
+
+@frappe.whitelist(methods=["POST"])
+def mark_status_changes_processed(names: str | list[str]):
+	"""Acknowledges status changes once the devices have been enabled or disabled."""
+	frappe.has_permission("Customer Status Log", "write", throw=True)
+	if isinstance(names, str):
+		names = json.loads(names)
+	if names:
+		frappe.db.set_value(
+			"Customer Status Log",
+			{"name": ("in", names), "processed": 0},
+			{"processed": 1, "processed_on": now_datetime()},
+		)
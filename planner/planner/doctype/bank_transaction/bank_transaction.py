@@ -1,9 +1,14 @@
 # Copyright (c) 2025, YOUR COMPANY / NAME and contributors
 # For license information, please see license.txt
 
-# import frappe
+import frappe
 from frappe.model.document import Document
 
 
 class BankTransaction(Document):
 	pass
+
+
+def on_doctype_update():
+	# Keyset pagination of exports (planner.planner.export).
+	frappe.db.add_index("Bank Transaction", ["date", "name"])
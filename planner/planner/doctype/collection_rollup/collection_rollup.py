@@ -0,0 +1,17 @@
+# Copyright (c) 2026, Kebazz Technologies and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+
+
+class CollectionRollup(Document):
+	pass
+
+
+def on_doctype_update():
+	# Trend queries filter on a date range, often within one collector or branch
+	# (planner.planner.collection_rollup.get_collections).
+	frappe.db.add_index("Collection Rollup", ["date"])
+	frappe.db.add_index("Collection Rollup", ["collector", "date"])
+	frappe.db.add_index("Collection Rollup", ["customer_department", "date"])
@@ -0,0 +1,64 @@
+# Copyright (c) 2026, Kebazz Technologies and Contributors
+# See license.txt
+
+import frappe
+
+from planner.planner.collection_rollup import get_collections, rebuild_month
+from planner.tests.factories import CustomerFactory, PaymentFactory
+from planner.tests.utils import PlannerTestCase
+
+
+class TestCollectionRollup(PlannerTestCase):
+	def setUp(self):
+		super().setUp()
+		self.day = "2020-02-10"
+		self.customer = CustomerFactory.create(package_assigned=self.fixtures.packages[0]).name
+
+	def get_rollup(self):
+		return get_collections(
+			group_by=["payment_type"], from_date=self.day, to_date=self.day, granularity=None
+		)
+
+	def test_rollup_follows_payments(self):
+		payment = PaymentFactory.create(customer=self.customer, payment_date=self.day, amount=1000)
+		PaymentFactory.create(customer=self.customer, payment_date=self.day, amount=500, payment_type="Bank")
+		self.assertEqual(
+			[(r.payment_type, r.amount, r.payments) for r in self.get_rollup()],
+			[("Bank", 500, 1), ("Cash", 1000, 1)],
+		)
+
+		payment.payment_type = "Bank"
+		payment.save()
+		self.assertEqual(
+			[(r.payment_type, r.amount, r.payments) for r in self.get_rollup()], [("Bank", 1500, 2)]
+		)
+
+		payment.delete()
+		self.assertEqual(
+			[(r.payment_type, r.amount, r.payments) for r in self.get_rollup()], [("Bank", 500, 1)]
+		)
+
+	def test_rebuild_matches_incremental(self):
+		for amount in (1000, 1200, 1500):
+			PaymentFactory.create(customer=self.customer, payment_date=self.day, amount=amount)
+		incremental = frappe.get_all(
+			"Collection Rollup",
+			filters={"date": self.day},
+			fields=["name", "amount", "payments"],
+			order_by="name",
+		)
+
+		rebuild_month(self.day)
+		rebuilt = frappe.get_all(
+			"Collection Rollup",
+			filters={"date": self.day},
+			fields=["name", "amount", "payments"],
+			order_by="name",
+		)
+		self.assertEqual(incremental, rebuilt)
+
+	def test_monthly_totals(self):
+		PaymentFactory.create(customer=self.customer, payment_date=self.day, amount=1000)
+		PaymentFactory.create(customer=self.customer, payment_date="2020-02-20", amount=1000)
+		rows = get_collections(from_date="2020-02-01", to_date="2020-02-29", granularity="month")
+		self.assertEqual([(r.period, r.amount, r.payments) for r in rows], [("2020-02", 2000, 2)])
@@ -0,0 +1,46 @@
+# Copyright (c) 2026, Kebazz Technologies and Contributors
+# See license.txt
+
+import frappe
+
+from planner.planner.collector_float import check_floats
+from planner.tests.factories import CustomerFactory, PaymentFactory, StaffCashSubmissionFactory
+from planner.tests.utils import PlannerTestCase
+
+
+class TestCollectorFloat(PlannerTestCase):
+	def setUp(self):
+		super().setUp()
+		self.collector = "test@example.com"
+		self.customer = CustomerFactory.create().name
+
+	def get_float(self):
+		return frappe.db.get_value("Collector Float", self.collector, "cash_in_hand") or 0
+
+	def test_float_follows_payments_and_submissions(self):
+		payment = PaymentFactory.create(customer=self.customer, collected_by=self.collector, amount=2000)
+		PaymentFactory.create(
+			customer=self.customer, collected_by=self.collector, amount=700, payment_type="Bank"
+		)
+		self.assertEqual(self.get_float(), 2000)
+
+		submission = StaffCashSubmissionFactory.create(staff_user=self.collector, amount_cash=1500)
+		self.assertEqual(self.get_float(), 2000)
+		submission.status = "Approved"
+		submission.save()
+		self.assertEqual(self.get_float(), 500)
+
+		payment.company_received = 1
+		payment.save()
+		self.assertEqual(self.get_float(), -1500)
+
+		submission.delete()
+		self.assertEqual(self.get_float(), 0)
+
+	def test_check_floats_repairs_drift(self):
+		PaymentFactory.create(customer=self.customer, collected_by=self.collector, amount=2000)
+		frappe.db.set_value("Collector Float", self.collector, "cash_in_hand", 10)
+
+		self.assertTrue(check_floats())
+		self.assertEqual(self.get_float(), 2000)
+		self.assertFalse(check_floats())
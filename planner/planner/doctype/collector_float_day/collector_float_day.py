@@ -0,0 +1,14 @@
+# Copyright (c) 2026, Kebazz Technologies and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+
+
+class CollectorFloatDay(Document):
+	pass
+
+
+def on_doctype_update():
+	# Float history of one collector (planner.planner.collector_float.get_float_history).
+	frappe.db.add_index("Collector Float Day", ["collector", "date"])
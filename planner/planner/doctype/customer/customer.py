@@ -1,9 +1,39 @@
 # Copyright (c) 2025, YOUR COMPANY / NAME and contributors
 # For license information, please see license.txt
 
-# import frappe
+import frappe
 from frappe.model.document import Document
+from frappe.utils import nowdate
+
+from planner.planner.branches import propagate_customer_branch, validate_branch_site
+from planner.planner.customer_lifecycle import log_status_changes
+from planner.planner.subscriptions import change_package, start_subscription
 
 
 class Customer(Document):
-	pass
+	def validate(self):
+		if self.customer_department:
+			validate_branch_site(self.customer_department)
+		if self.status == "Active":
+			self.suspended_for_arrears = 0
+
+	def after_insert(self):
+		if self.package_assigned:
+			start_subscription(self.name, self.package_assigned, self.register_date or nowdate())
+
+	def on_update(self):
+		# Status changes made by hand reach the network side the same way as automatic ones.
+		before = self.get_doc_before_save()
+		if before and before.status != self.status:
+			before.name = self.name
+			log_status_changes([before], self.status, "Manual")
+		if before and before.customer_department != self.customer_department:
+			propagate_customer_branch(self.name, self.customer_department)
+		if before and self.package_assigned and before.package_assigned != self.package_assigned:
+			# Editing the package on the form is a package change from today.
+			change_package(self.name, self.package_assigned)
+
+
+def on_doctype_update():
+	frappe.db.add_index("Customer", ["customer_department", "modified"])
+	frappe.db.add_index("Customer", ["customer_department", "status"])
@@ -1,9 +1,56 @@
 # Copyright (c) 2025, YOUR COMPANY / NAME and Contributors
 # See license.txt
 
-# import frappe
-from frappe.tests import IntegrationTestCase
+import frappe
 
+from planner.planner.customer_lifecycle import update_customer_statuses
+from planner.tests.factories import CustomerFactory, PaymentFactory
+from planner.tests.utils import PlannerTestCase
 
-class TestCustomer(IntegrationTestCase):
-	pass
+
+class TestCustomer(PlannerTestCase):
+	def setUp(self):
+		super().setUp()
+		# 1500 a month
+		self.package = self.fixtures.packages[0]
+
+	def test_suspended_in_arrears_and_reactivated(self):
+		customer = CustomerFactory.create(package_assigned=self.package, balance_total=4500).name
+
+		update_customer_statuses()
+		self.assertEqual(frappe.db.get_value("Customer", customer, "status"), "Inactive")
+		self.assertTrue(frappe.db.get_value("Customer", customer, "suspended_for_arrears"))
+
+		PaymentFactory.create(customer=customer, amount=4500)
+		self.assertEqual(frappe.db.get_value("Customer", customer, "status"), "Active")
+		self.assertCountEqual(
+			frappe.get_all("Customer Status Log", filters={"customer": customer}, pluck="reason"),
+			["Arrears", "Payment"],
+		)
+
+	def test_not_suspended_within_limit(self):
+		customer = CustomerFactory.create(package_assigned=self.package, balance_total=3000).name
+		update_customer_statuses()
+		self.assertEqual(frappe.db.get_value("Customer", customer, "status"), "Active")
+
+	def test_manual_status_change_is_logged(self):
+		customer = CustomerFactory.create()
+		customer.status = "Inactive"
+		customer.save()
+		self.assertEqual(
+			frappe.db.get_value(
+				"Customer Status Log", {"customer": customer.name}, ["old_status", "new_status", "reason"]
+			),
+			("Active", "Inactive", "Manual"),
+		)
+
+	def test_subscription_opened_on_insert(self):
+		customer = CustomerFactory.create(package_assigned=self.package).name
+		self.assertEqual(
+			frappe.db.get_value(
+				"Customer Subscription Period",
+				{"customer": customer, "to_date": ("is", "not set")},
+				"package",
+			),
+			self.package,
+		)
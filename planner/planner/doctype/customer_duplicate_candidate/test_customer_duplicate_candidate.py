@@ -0,0 +1,63 @@
+# Copyright (c) 2026, Kebazz Technologies and Contributors
+# See license.txt
+
+import frappe
+
+from planner.planner.customer_dedup import find_duplicate_customers, merge_customers, phonetic_key
+from planner.tests.factories import RUN_ID, CustomerFactory, PaymentFactory
+from planner.tests.utils import PlannerTestCase
+
+
+class TestCustomerDuplicateCandidate(PlannerTestCase):
+	def setUp(self):
+		super().setUp()
+		self.first = CustomerFactory.create(
+			customer_name=f"Kamal Perera {RUN_ID}", phone_number="+94 71 987 6543", device1="AA:BB:CC:01"
+		).name
+		self.second = CustomerFactory.create(
+			customer_name=f"Kamal Pereira {RUN_ID}", phone_number="0719876543"
+		).name
+		self.other = CustomerFactory.create(
+			customer_name=f"Nimal Silva {RUN_ID}", phone_number="0725550101"
+		).name
+
+	def get_candidates(self):
+		names = (self.first, self.second, self.other)
+		return frappe.get_all(
+			"Customer Duplicate Candidate",
+			filters={"customer_a": ("in", names), "customer_b": ("in", names)},
+			fields=["customer_a", "customer_b", "status"],
+		)
+
+	def test_phonetic_key_ignores_spelling_and_order(self):
+		self.assertEqual(phonetic_key("Kamal Perera"), phonetic_key("perera, KAMAL"))
+		self.assertEqual(phonetic_key("Kamal Perera"), phonetic_key("Kamal Pereira"))
+
+	def test_finds_pair_sharing_a_phone_once(self):
+		find_duplicate_customers()
+		self.assertEqual(
+			[(c.customer_a, c.customer_b, c.status) for c in self.get_candidates()],
+			[(*sorted((self.first, self.second)), "Open")],
+		)
+
+		# Known pairs are not stored again.
+		find_duplicate_customers()
+		self.assertEqual(len(self.get_candidates()), 1)
+
+	def test_merge_moves_links_and_balance(self):
+		PaymentFactory.create(customer=self.first, amount=1500)
+		find_duplicate_customers()
+		balance = self.get_balance(self.first) + self.get_balance(self.second)
+
+		merge_customers(self.first, self.second)
+
+		self.assertFalse(frappe.db.exists("Customer", self.first))
+		self.assertEqual(frappe.db.count("Customer Payment", {"customer": self.first}), 0)
+		self.assertEqual(frappe.db.count("Customer Payment", {"customer": self.second}), 1)
+		self.assertEqual(self.get_balance(self.second), balance)
+		# Empty fields of the target are filled from the duplicate.
+		self.assertEqual(frappe.db.get_value("Customer", self.second, "device1"), "AA:BB:CC:01")
+		self.assertEqual([c.status for c in self.get_candidates()], ["Merged"])
+
+	def test_cannot_merge_into_itself(self):
+		self.assertRaises(frappe.ValidationError, merge_customers, self.first, self.first)
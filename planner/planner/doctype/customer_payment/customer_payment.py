@@ -3,30 +3,54 @@
 
 import frappe
 from frappe.model.document import Document
+from frappe.utils import flt, now_datetime
+
+from planner.planner.branches import validate_branch_site
+from planner.planner.duplicates import check_duplicate
+from planner.planner.permissions import validate_approval_fields
 
 
 class CustomerPayment(Document):
-	def on_submit(self):
-		"""
-		This method is a 'hook' that is automatically called by Frappe
-		when a Customer Payment document is submitted.
-		"""
-		# Check if a customer is linked to this payment
+	def validate(self):
+		validate_approval_fields(self, ("company_received",))
+		if self.customer_department:
+			validate_branch_site(self.customer_department)
+		check_duplicate(self)
+
+	def on_update(self):
+		# Runs on insert too (with no previous version), so edits and new payments
+		# share one path: give back the old amount, then take the current one.
+		before = self.get_doc_before_save()
+		if before and (before.customer, flt(before.amount)) == (self.customer, flt(self.amount)):
+			return
+		if before and before.customer:
+			update_customer_balance(before.customer, flt(before.amount))
+		if self.customer:
+			update_customer_balance(self.customer, -flt(self.amount))
+
+	def on_trash(self):
 		if self.customer:
-			try:
-				# Get the full customer document from the database
-				customer = frappe.get_doc("Customer", self.customer)
-				
-				# Subtract the payment amount from the customer's balance
-				customer.balance_total -= self.amount
-				
-				# Save the updated customer document
-				# ignore_permissions=True is important for server-side scripts
-				customer.save(ignore_permissions=True)
-				
-				# Add a success message for the user in the UI
-				frappe.msgprint(f"Customer {self.customer}'s balance updated successfully.")
-
-			except Exception as e:
-				# If something goes wrong, show an error message
-				frappe.throw(f"An error occurred while updating the customer balance: {e}")
\ No newline at end of file
+			update_customer_balance(self.customer, flt(self.amount))
+
+
+def update_customer_balance(customer: str, delta: float):
+	"""Adds `delta` to the customer's balance in place, so concurrent payments can't overwrite each other."""
+	if not delta:
+		return
+	frappe.db.sql(
+		"""update `tabCustomer` set balance_total = ifnull(balance_total, 0) + %s, modified = %s
+		where name = %s""",
+		(delta, now_datetime(), customer),
+	)
+
+
+def on_doctype_update():
+	# List views of collectors filter on `collected_by` and sort by `modified`.
+	frappe.db.add_index("Customer Payment", ["collected_by", "modified"])
+	# Keyset pagination of exports (planner.planner.export).
+	frappe.db.add_index("Customer Payment", ["payment_date", "name"])
+	# Branch-scoped reports and permission checks.
+	frappe.db.add_index("Customer Payment", ["customer_department", "payment_date"])
+	frappe.db.add_index("Customer Payment", ["customer_department", "modified"])
+	# Duplicate detection (planner.planner.duplicates).
+	frappe.db.add_index("Customer Payment", ["duplicate_fingerprint", "payment_date"])
@@ -1,9 +1,50 @@
 # Copyright (c) 2025, YOUR COMPANY / NAME and Contributors
 # See license.txt
 
-# import frappe
-from frappe.tests import IntegrationTestCase
+import frappe
 
+from planner.tests.factories import CustomerFactory, PaymentFactory
+from planner.tests.utils import PlannerTestCase
 
-class TestCustomerpayment(IntegrationTestCase):
-	pass
+
+class TestCustomerpayment(PlannerTestCase):
+	def setUp(self):
+		super().setUp()
+		self.customer = CustomerFactory.create(balance_total=3000).name
+
+	def test_balance_follows_payment(self):
+		payment = PaymentFactory.create(customer=self.customer, amount=1000)
+		self.assertEqual(self.get_balance(self.customer), 2000)
+
+		payment.amount = 1500
+		payment.save()
+		self.assertEqual(self.get_balance(self.customer), 1500)
+
+		payment.delete()
+		self.assertEqual(self.get_balance(self.customer), 3000)
+
+	def test_moving_payment_to_another_customer(self):
+		other = CustomerFactory.create(balance_total=500).name
+		payment = PaymentFactory.create(customer=self.customer, amount=1000)
+
+		payment.customer = other
+		payment.save()
+		self.assertEqual(self.get_balance(self.customer), 3000)
+		self.assertEqual(self.get_balance(other), -500)
+
+	def test_duplicate_is_flagged(self):
+		first = PaymentFactory.create(customer=self.customer, amount=1000)
+		second = PaymentFactory.create(customer=self.customer, amount=1000)
+		self.assertEqual(second.possible_duplicate_of, first.name)
+
+		different = PaymentFactory.create(customer=self.customer, amount=1200)
+		self.assertFalse(different.possible_duplicate_of)
+
+	def test_branch_is_fetched_from_customer(self):
+		branch = self.fixtures.branches[0]
+		customer = CustomerFactory.create(customer_department=branch).name
+		payment = PaymentFactory.create(customer=customer)
+		self.assertEqual(payment.customer_department, branch)
+
+	def test_fixture_payments_are_shared(self):
+		self.assertTrue(frappe.db.exists("Customer Payment", {"customer": self.fixtures.customers[0]}))
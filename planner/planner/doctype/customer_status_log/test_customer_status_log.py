@@ -0,0 +1,9 @@
+# Copyright (c) 2026, Kebazz Technologies and Contributors
+# See license.txt
+
+# import frappe
+from frappe.tests import IntegrationTestCase
+
+
+class TestCustomerStatusLog(IntegrationTestCase):
+	pass
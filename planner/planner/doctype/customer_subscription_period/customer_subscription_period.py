@@ -0,0 +1,15 @@
+# Copyright (c) 2026, Kebazz Technologies and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+
+
+class CustomerSubscriptionPeriod(Document):
+	pass
+
+
+def on_doctype_update():
+	# Open periods (to_date is null) are looked up per customer and per package.
+	frappe.db.add_index("Customer Subscription Period", ["customer", "to_date"])
+	frappe.db.add_index("Customer Subscription Period", ["package", "to_date"])
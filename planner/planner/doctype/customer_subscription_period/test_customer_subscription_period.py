@@ -0,0 +1,52 @@
+# Copyright (c) 2026, Kebazz Technologies and Contributors
+# See license.txt
+
+import frappe
+
+from planner.patches.v0_1 import open_subscription_periods
+from planner.planner.subscriptions import change_package
+from planner.tests.factories import CustomerFactory
+from planner.tests.utils import PlannerTestCase
+
+
+class TestCustomerSubscriptionPeriod(PlannerTestCase):
+	def setUp(self):
+		super().setUp()
+		self.basic, self.premium = self.fixtures.packages[:2]
+
+	def get_periods(self, customer):
+		return [
+			(p.package, p.monthly_fee, str(p.from_date), p.to_date and str(p.to_date))
+			for p in frappe.get_all(
+				"Customer Subscription Period",
+				filters={"customer": customer},
+				fields=["package", "monthly_fee", "from_date", "to_date"],
+				order_by="from_date",
+			)
+		]
+
+	def test_new_customer_opens_a_period(self):
+		customer = CustomerFactory.create(package_assigned=self.basic, register_date="2020-01-01").name
+		self.assertEqual(self.get_periods(customer), [(self.basic, 1500, "2020-01-01", None)])
+
+	def test_package_change_closes_the_period(self):
+		customer = CustomerFactory.create(package_assigned=self.basic, register_date="2020-01-01").name
+		change_package(customer, self.premium, "2020-02-10")
+
+		self.assertEqual(
+			self.get_periods(customer),
+			[(self.basic, 1500, "2020-01-01", "2020-02-09"), (self.premium, 4000, "2020-02-10", None)],
+		)
+		self.assertRaises(frappe.ValidationError, change_package, customer, self.basic, "2020-02-01")
+
+	def test_backfill_patch(self):
+		# Bulk inserted without controllers, as customers were before periods existed.
+		customers = CustomerFactory.create_batch(2, package_assigned=self.basic, register_date="2019-06-01")
+		without_package = CustomerFactory.create_batch(1)[0]
+
+		open_subscription_periods.execute()
+		open_subscription_periods.execute()
+
+		for customer in customers:
+			self.assertEqual(self.get_periods(customer), [(self.basic, 1500, "2019-06-01", None)])
+		self.assertEqual(self.get_periods(without_package), [])
@@ -0,0 +1,34 @@
+# Copyright (c) 2026, Kebazz Technologies and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.utils.nestedset import NestedSet
+
+ROOT_ACCOUNT = "All Expense Accounts"
+
+
+class ExpenseAccount(NestedSet):
+	nsm_parent_field = "parent_expense_account"
+
+	def validate(self):
+		if self.name != ROOT_ACCOUNT and not self.parent_expense_account:
+			self.parent_expense_account = get_root_account()
+
+	def on_update(self):
+		super().on_update()
+		self.validate_one_root()
+
+	def after_rename(self, old, new, merge=False):
+		# Period totals are named after their account, so rebuild them under the new name.
+		from planner.planner.expense_accounts import rebuild_totals
+
+		rebuild_totals()
+
+
+def get_root_account() -> str:
+	"""Returns the root group, creating it on first use."""
+	if not frappe.db.exists("Expense Account", ROOT_ACCOUNT):
+		frappe.get_doc({"doctype": "Expense Account", "account_name": ROOT_ACCOUNT, "is_group": 1}).insert(
+			ignore_permissions=True
+		)
+	return ROOT_ACCOUNT
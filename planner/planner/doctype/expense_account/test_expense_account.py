@@ -0,0 +1,53 @@
+# Copyright (c) 2026, Kebazz Technologies and Contributors
+# See license.txt
+
+import frappe
+
+from planner.patches.v0_1 import map_expense_accounts
+from planner.planner.doctype.expense_account.expense_account import ROOT_ACCOUNT
+from planner.tests.factories import RUN_ID, ExpenseAccountFactory, ExpenseFactory
+from planner.tests.utils import PlannerTestCase
+
+
+class TestExpenseAccount(PlannerTestCase):
+	def test_accounts_default_to_the_root(self):
+		account = ExpenseAccountFactory.create()
+		self.assertEqual(account.parent_expense_account, ROOT_ACCOUNT)
+
+	def test_patch_maps_free_text_accounts(self):
+		fuel, rent = f"Generator Fuel {RUN_ID}", f"Office Rent {RUN_ID}"
+		# Expense.account used to be free text: bulk insert past the link validation.
+		names = {
+			spelling: ExpenseFactory.create_batch(
+				count, account=spelling, expense_date="2019-05-10", amount=100
+			)
+			for spelling, count in (
+				(fuel, 2),
+				(f"Generator  Fuel {RUN_ID}", 1),
+				(f"generator   fuel\t{RUN_ID}", 1),
+				(rent, 1),
+			)
+		}
+
+		map_expense_accounts.execute()
+
+		# The most used spelling names the account.
+		for account in (fuel, rent):
+			self.assertEqual(
+				frappe.db.get_value("Expense Account", account, "parent_expense_account"), ROOT_ACCOUNT
+			)
+		self.assertEqual(
+			{
+				frappe.db.get_value("Expense", name, "account")
+				for spelling, batch in names.items()
+				if spelling != rent
+				for name in batch
+			},
+			{fuel},
+		)
+		self.assertEqual(
+			frappe.db.get_value("Expense Account Period Total", f"2019-05:{fuel}", "amount"), 400
+		)
+		self.assertEqual(
+			frappe.db.get_value("Expense Account Period Total", f"2019-05:{rent}", "amount"), 100
+		)
@@ -0,0 +1,70 @@
+# Copyright (c) 2026, Kebazz Technologies and Contributors
+# See license.txt
+
+import frappe
+from frappe.utils import flt
+
+from planner.planner.expense_accounts import get_account_total, get_tree_totals, rebuild_totals
+from planner.tests.factories import ExpenseAccountFactory, ExpenseFactory
+from planner.tests.utils import PlannerTestCase
+
+
+class TestExpenseAccountPeriodTotal(PlannerTestCase):
+	def setUp(self):
+		super().setUp()
+		self.group = ExpenseAccountFactory.create(is_group=1).name
+		self.fuel = ExpenseAccountFactory.create(parent_expense_account=self.group).name
+		self.rent = ExpenseAccountFactory.create(parent_expense_account=self.group).name
+
+	def get_totals(self):
+		return {
+			(row.expense_account, row.period): flt(row.amount)
+			for row in frappe.get_all(
+				"Expense Account Period Total",
+				filters={"expense_account": ("in", (self.fuel, self.rent))},
+				fields=["expense_account", "period", "amount"],
+			)
+			if flt(row.amount)
+		}
+
+	def test_totals_follow_expenses(self):
+		expense = ExpenseFactory.create(account=self.fuel, expense_date="2019-01-10", amount=700)
+		ExpenseFactory.create(account=self.fuel, expense_date="2019-01-20", amount=300)
+		self.assertEqual(self.get_totals(), {(self.fuel, "2019-01"): 1000})
+
+		expense.amount = 900
+		expense.save()
+		self.assertEqual(self.get_totals(), {(self.fuel, "2019-01"): 1200})
+
+		expense.account = self.rent
+		expense.expense_date = "2019-02-01"
+		expense.save()
+		self.assertEqual(self.get_totals(), {(self.fuel, "2019-01"): 300, (self.rent, "2019-02"): 900})
+
+		expense.delete()
+		self.assertEqual(self.get_totals(), {(self.fuel, "2019-01"): 300})
+
+	def test_range_over_months_and_sub_accounts(self):
+		for account, expense_date, amount in (
+			(self.fuel, "2018-12-31", 100),
+			(self.fuel, "2019-01-01", 200),
+			(self.rent, "2019-02-15", 400),
+			(self.fuel, "2019-03-31", 800),
+			(self.rent, "2019-04-01", 1600),
+		):
+			ExpenseFactory.create(account=account, expense_date=expense_date, amount=amount)
+
+		self.assertEqual(get_account_total(self.group, "2019-01", "2019-03"), 1400)
+		self.assertEqual(get_account_total(self.fuel, "2019-01", "2019-03"), 1000)
+		self.assertEqual(get_account_total(self.rent, "2018-12", "2019-04"), 2000)
+
+		tree = {row.expense_account: row.amount for row in get_tree_totals("2019-01", "2019-03")}
+		self.assertEqual((tree[self.group], tree[self.fuel], tree[self.rent]), (1400, 1000, 400))
+
+	def test_rebuild_matches_incremental(self):
+		ExpenseFactory.create(account=self.fuel, expense_date="2019-01-10", amount=700)
+		ExpenseFactory.create(account=self.rent, expense_date="2019-02-10", amount=300)
+		incremental = self.get_totals()
+
+		rebuild_totals()
+		self.assertEqual(self.get_totals(), incremental)
@@ -0,0 +1,8 @@
+// Copyright (c) 2026, Kebazz Technologies and contributors
+// For license information, please see license.txt
+
+// frappe.ui.form.on("Ledger Period Balance", {
+// 	refresh(frm) {
+
+// 	},
+// });
@@ -0,0 +1,135 @@
+# Copyright (c) 2026, Kebazz Technologies and Contributors
+# See license.txt
+
+import frappe
+from frappe.utils import flt
+
+from planner.planner import ledger
+from planner.tests.factories import (
+	BankAccountFactory,
+	BankTransactionFactory,
+	CustomerFactory,
+	ExpenseFactory,
+	PaymentFactory,
+)
+from planner.tests.utils import PlannerTestCase
+
+PERIOD = "2018-01"
+
+
+class TestLedgerPeriodBalance(PlannerTestCase):
+	def setUp(self):
+		super().setUp()
+		self.customer = CustomerFactory.create().name
+		self.opening = self.get_balances(PERIOD)
+
+	def get_entries(self, doc, is_cancelled=0):
+		return frappe.get_all(
+			"Company Ledger",
+			filters={"voucher_type": doc.doctype, "voucher_no": doc.name, "is_cancelled": is_cancelled},
+			fields=["account", "debit", "credit", "period"],
+			order_by="account",
+		)
+
+	def get_balances(self, period):
+		return {
+			row.account: (flt(row.debit), flt(row.credit))
+			for row in frappe.get_all(
+				"Ledger Period Balance", filters={"period": period}, fields=["account", "debit", "credit"]
+			)
+		}
+
+	def get_movement(self):
+		"""Debit and credit added to each account of `PERIOD` since setUp."""
+		movement = {}
+		for account, (debit, credit) in self.get_balances(PERIOD).items():
+			before = self.opening.get(account, (0.0, 0.0))
+			diff = (flt(debit - before[0], 2), flt(credit - before[1], 2))
+			if any(diff):
+				movement[account] = diff
+		return movement
+
+	def assertBalanced(self, entries):
+		self.assertEqual(sum(flt(e.debit) for e in entries), sum(flt(e.credit) for e in entries))
+
+	def test_postings_balance(self):
+		account = BankAccountFactory.create().name
+		docs = [
+			PaymentFactory.create(customer=self.customer, payment_date=f"{PERIOD}-05", amount=1500),
+			PaymentFactory.create(
+				customer=self.customer, payment_date=f"{PERIOD}-06", amount=4000, payment_type="Bank"
+			),
+			ExpenseFactory.create(expense_date=f"{PERIOD}-10", amount=700),
+			BankTransactionFactory.create(bank_account=account, date=f"{PERIOD}-12", debit=300, credit=0),
+		]
+		for doc in docs:
+			entries = self.get_entries(doc)
+			self.assertEqual(len(entries), 2)
+			self.assertBalanced(entries)
+
+		movement = self.get_movement()
+		self.assertEqual(sum(d for d, _c in movement.values()), sum(c for _d, c in movement.values()))
+		self.assertEqual(movement[ledger.SUBSCRIPTION_INCOME], (0, 5500))
+		self.assertEqual(movement[ledger.CASH], (1500, 700))
+
+	def test_unbalanced_entries_are_rejected(self):
+		self.assertRaises(
+			frappe.ValidationError,
+			ledger.make_ledger_entries,
+			"Expense",
+			"_Test Unbalanced",
+			f"{PERIOD}-01",
+			[ledger.entry(ledger.EXPENSES, debit=100), ledger.entry(ledger.CASH, credit=90)],
+		)
+
+	def test_amount_change_reposts(self):
+		payment = PaymentFactory.create(customer=self.customer, payment_date=f"{PERIOD}-05", amount=1500)
+		payment.amount = 2000
+		payment.save()
+
+		self.assertEqual(
+			[(e.account, e.debit, e.credit) for e in self.get_entries(payment)],
+			[(ledger.CASH, 2000, 0), (ledger.SUBSCRIPTION_INCOME, 0, 2000)],
+		)
+		self.assertBalanced(self.get_entries(payment, is_cancelled=1))
+		# Posted 1500, reversed 1500, posted 2000.
+		self.assertEqual(
+			self.get_movement(),
+			{ledger.CASH: (3500, 1500), ledger.SUBSCRIPTION_INCOME: (1500, 3500)},
+		)
+
+	def test_date_change_moves_period(self):
+		payment = PaymentFactory.create(customer=self.customer, payment_date=f"{PERIOD}-05", amount=1500)
+		opening_next = self.get_balances("2018-02")
+		payment.payment_date = "2018-02-01"
+		payment.save()
+
+		# The reversal stays in the original period, which nets to zero.
+		self.assertEqual(
+			{account: flt(debit - credit, 2) for account, (debit, credit) in self.get_movement().items()},
+			{ledger.CASH: 0, ledger.SUBSCRIPTION_INCOME: 0},
+		)
+		closing_next = self.get_balances("2018-02")
+		self.assertEqual(
+			flt(closing_next[ledger.CASH][0] - opening_next.get(ledger.CASH, (0.0, 0.0))[0], 2), 1500
+		)
+
+	def test_trash_and_cancel_reverse(self):
+		payment = PaymentFactory.create(customer=self.customer, payment_date=f"{PERIOD}-05", amount=1500)
+		expense = ExpenseFactory.create(expense_date=f"{PERIOD}-10", amount=700)
+
+		ledger.on_cancel(expense)
+		self.assertEqual(self.get_entries(expense), [])
+		self.assertBalanced(self.get_entries(expense, is_cancelled=1))
+
+		payment.delete()
+		self.assertEqual(self.get_entries(payment), [])
+		self.assertEqual(
+			{account: flt(debit - credit, 2) for account, (debit, credit) in self.get_movement().items()},
+			{ledger.CASH: 0, ledger.SUBSCRIPTION_INCOME: 0, ledger.EXPENSES: 0},
+		)
+
+	def test_resave_without_changes_posts_nothing(self):
+		payment = PaymentFactory.create(customer=self.customer, payment_date=f"{PERIOD}-05", amount=1500)
+		payment.save()
+		self.assertEqual(self.get_entries(payment, is_cancelled=1), [])
@@ -1,8 +1,44 @@
 // Copyright (c) 2025, YOUR COMPANY / NAME and contributors
 // For license information, please see license.txt
 
-// frappe.ui.form.on("Monthly Summary", {
-// 	refresh(frm) {
+frappe.ui.form.on("Monthly Summary", {
+	refresh(frm) {
+		if (frm.is_new()) return;
 
-// 	},
-// });
+		if (frm.doc.status === "Open") {
+			frm.add_custom_button(__("Close Month"), () => {
+				frappe.confirm(
+					__("Lock {0} and snapshot its figures?", [frm.doc.month]),
+					() =>
+						frappe
+							.call("planner.planner.month_close.close_month", { month: frm.doc.month })
+							.then(() => frm.reload_doc())
+				);
+			});
+		}
+		if (frm.doc.status === "Closed") {
+			frm.add_custom_button(__("Reopen Month"), () => {
+				frappe.confirm(
+					__("Reopen {0}? Later closed months will need to be snapshotted again.", [
+						frm.doc.month,
+					]),
+					() =>
+						frappe
+							.call("planner.planner.month_close.reopen_month", { month: frm.doc.month })
+							.then(() => frm.reload_doc())
+				);
+			});
+		}
+		if (frm.doc.carry_forward_stale) {
+			frm.dashboard.set_headline(
+				__("Carry forward is outdated: an earlier month was reopened."),
+				"orange"
+			);
+		}
+
+		frappe.realtime.off("planner_month_close");
+		frappe.realtime.on("planner_month_close", (data) => {
+			if (data.month === frm.doc.month) frm.reload_doc();
+		});
+	},
+});
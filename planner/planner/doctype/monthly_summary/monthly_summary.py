@@ -1,9 +1,28 @@
 # Copyright (c) 2025, YOUR COMPANY / NAME and contributors
 # For license information, please see license.txt
 
-# import frappe
+import frappe
+from frappe import _
 from frappe.model.document import Document
 
+from planner.planner.month_close import LOCKED_STATUSES, clear_closed_months_cache, validate_month
+
 
 class MonthlySummary(Document):
-	pass
+	def validate(self):
+		validate_month(self.month)
+		if self.flags.allow_month_close:
+			return
+		# Closing, reopening and snapshots go through planner.planner.month_close.
+		before = self.get_doc_before_save()
+		before_status = before.status if before else "Open"
+		if before_status in LOCKED_STATUSES or (self.status or "Open") != before_status:
+			frappe.throw(_("Use Close Month and Reopen Month to change a closed month"))
+
+	def on_update(self):
+		clear_closed_months_cache()
+
+	def on_trash(self):
+		if self.status in LOCKED_STATUSES:
+			frappe.throw(_("Reopen {0} before deleting it").format(self.month))
+		clear_closed_months_cache()
@@ -1,9 +1,75 @@
 # Copyright (c) 2025, YOUR COMPANY / NAME and Contributors
 # See license.txt
 
-# import frappe
-from frappe.tests import IntegrationTestCase
+import frappe
 
+from planner.planner.month_close import CLOSED_MONTHS_KEY, close_month, get_report, reopen_month
+from planner.tests.factories import CustomerFactory, ExpenseFactory, PaymentFactory
+from planner.tests.utils import PlannerTestCase
 
-class TestMonthlysummary(IntegrationTestCase):
-	pass
+
+class TestMonthlysummary(PlannerTestCase):
+	def setUp(self):
+		super().setUp()
+		self.customer = CustomerFactory.create().name
+
+	def tearDown(self):
+		super().tearDown()
+		frappe.cache.delete_value(CLOSED_MONTHS_KEY)
+
+	def test_closed_month_rejects_postings(self):
+		payment = PaymentFactory.create(customer=self.customer, payment_date="2019-03-05")
+		close_month("2019-03")
+
+		self.assertRaises(
+			frappe.ValidationError, PaymentFactory.create, customer=self.customer, payment_date="2019-03-20"
+		)
+		self.assertRaises(frappe.ValidationError, ExpenseFactory.create, expense_date="2019-03-20")
+		payment.payment_date = "2019-04-01"
+		self.assertRaises(frappe.ValidationError, payment.save)
+		self.assertRaises(frappe.ValidationError, payment.delete)
+
+		PaymentFactory.create(customer=self.customer, payment_date="2019-04-01")
+
+	def test_closed_month_rejects_postings_from_fresh_cache(self):
+		close_month("2019-08")
+		frappe.cache.delete_value(CLOSED_MONTHS_KEY)
+
+		self.assertRaises(
+			frappe.ValidationError, PaymentFactory.create, customer=self.customer, payment_date="2019-08-20"
+		)
+
+	def test_close_clears_cache_after_commit(self):
+		doc = frappe.get_doc({"doctype": "Monthly Summary", "month": "2019-09", "status": "Closed"})
+		doc.flags.allow_month_close = True
+		doc.insert(ignore_permissions=True)
+		# A concurrent request that read the months before the close committed.
+		frappe.cache.set_value(CLOSED_MONTHS_KEY, [])
+		self.run_after_commit()
+
+		self.assertRaises(
+			frappe.ValidationError, PaymentFactory.create, customer=self.customer, payment_date="2019-09-20"
+		)
+
+	def test_reopen_marks_later_months_outdated(self):
+		for month in ("2019-05", "2019-06"):
+			doc = frappe.get_doc({"doctype": "Monthly Summary", "month": month})
+			doc.insert(ignore_permissions=True)
+			doc.db_set("status", "Closed")
+
+		reopen_month("2019-05")
+		self.assertEqual(frappe.db.get_value("Monthly Summary", {"month": "2019-05"}, "status"), "Open")
+		self.assertTrue(frappe.db.get_value("Monthly Summary", {"month": "2019-06"}, "carry_forward_stale"))
+
+	def test_report_figures(self):
+		PaymentFactory.create(customer=self.customer, payment_date="2019-07-05", amount=3000)
+		PaymentFactory.create(
+			customer=self.customer, payment_date="2019-07-06", amount=1000, payment_type="Bank"
+		)
+		ExpenseFactory.create(expense_date="2019-07-10", amount=500)
+
+		summary = get_report("2019-07")["summary"]
+		self.assertEqual(summary["total_cash_collection"], 3000)
+		self.assertEqual(summary["total_bank_collection"], 1000)
+		self.assertEqual(summary["total_expense"], 500)
+		self.assertEqual(summary["net_profit"], 3500)
@@ -0,0 +1,14 @@
+# Copyright (c) 2026, Kebazz Technologies and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+
+
+class NotificationOutbox(Document):
+	pass
+
+
+def on_doctype_update():
+	# The dispatcher claims due rows with `status = 'Queued' and next_attempt_at <= now()`.
+	frappe.db.add_index("Notification Outbox", ["status", "next_attempt_at"])
@@ -0,0 +1,106 @@
+# Copyright (c) 2026, Kebazz Technologies and Contributors
+# See license.txt
+
+from unittest.mock import patch
+
+import frappe
+from frappe.utils import add_to_date, get_datetime, now_datetime
+
+from planner.planner import notifications
+from planner.planner.notifications import MAX_ATTEMPTS, MockTransport, flush_outbox
+from planner.tests.factories import CustomerFactory, PaymentFactory
+from planner.tests.utils import PlannerTestCase
+
+
+class TestNotificationOutbox(PlannerTestCase):
+	def setUp(self):
+		super().setUp()
+		MockTransport.sent.clear()
+		MockTransport.failing_numbers.clear()
+		frappe.cache.delete_keys(notifications.RATE_LIMIT_KEY)
+		for patcher in (
+			patch.object(notifications, "get_transport", MockTransport),
+			patch.dict(frappe.local.conf, {"planner_notification_rate_limit": 1000}),
+		):
+			patcher.start()
+			self.addCleanup(patcher.stop)
+
+	def queue(self, phone_number, message="Hello", customer=None):
+		return (
+			frappe.get_doc(
+				{
+					"doctype": "Notification Outbox",
+					"customer": customer,
+					"phone_number": phone_number,
+					"channel": "SMS",
+					"message_type": "Arrears Reminder",
+					"message": message,
+				}
+			)
+			.insert(ignore_permissions=True)
+			.name
+		)
+
+	def get_row(self, name):
+		return frappe.db.get_value(
+			"Notification Outbox", name, ["status", "attempts", "next_attempt_at", "last_error"], as_dict=True
+		)
+
+	def make_due(self, name):
+		frappe.db.set_value(
+			"Notification Outbox", name, "next_attempt_at", add_to_date(now_datetime(), minutes=-1)
+		)
+
+	def test_payment_receipt_is_sent(self):
+		customer = CustomerFactory.create(phone_number="0770000001").name
+		payment = PaymentFactory.create(customer=customer, amount=1500)
+		name = frappe.db.get_value(
+			"Notification Outbox", {"reference_doctype": "Customer Payment", "reference_name": payment.name}
+		)
+		self.assertEqual(self.get_row(name).status, "Queued")
+
+		flush_outbox()
+		self.assertEqual(self.get_row(name).status, "Sent")
+		self.assertEqual([m.phone_number for m in MockTransport.sent], ["0770000001"])
+
+	def test_messages_to_a_customer_are_merged(self):
+		customer = CustomerFactory.create(phone_number="0770000002").name
+		names = [self.queue("0770000002", message, customer) for message in ("First", "Second")]
+
+		flush_outbox()
+		self.assertEqual([m.body for m in MockTransport.sent], ["First\nSecond"])
+		self.assertEqual({self.get_row(name).status for name in names}, {"Sent"})
+
+	def test_failures_back_off_then_fail(self):
+		MockTransport.failing_numbers.add("0770000003")
+		name = self.queue("0770000003")
+
+		for attempt in range(1, MAX_ATTEMPTS):
+			started = now_datetime()
+			flush_outbox()
+			row = self.get_row(name)
+			self.assertEqual((row.status, row.attempts, row.last_error), ("Queued", attempt, "Mock failure"))
+			delay = (get_datetime(row.next_attempt_at) - started).total_seconds()
+			expected = notifications.BACKOFF_SECONDS * 2 ** (attempt - 1)
+			self.assertTrue(expected - 1 <= delay <= expected + 60, delay)
+
+			# Not due yet: nothing is retried.
+			flush_outbox()
+			self.assertEqual(self.get_row(name).attempts, attempt)
+			self.make_due(name)
+
+		flush_outbox()
+		row = self.get_row(name)
+		self.assertEqual((row.status, row.attempts), ("Failed", MAX_ATTEMPTS))
+		self.assertEqual(MockTransport.sent, [])
+
+	def test_rate_limit_defers_without_an_attempt(self):
+		names = [self.queue(f"077000001{i}") for i in range(3)]
+		with patch.dict(frappe.local.conf, {"planner_notification_rate_limit": 2}):
+			flush_outbox()
+
+		self.assertEqual(len(MockTransport.sent), 2)
+		deferred = [self.get_row(name) for name in names if self.get_row(name).status != "Sent"]
+		self.assertEqual(len(deferred), 1)
+		self.assertEqual((deferred[0].status, deferred[0].attempts), ("Queued", 0))
+		self.assertGreater(get_datetime(deferred[0].next_attempt_at), now_datetime())
@@ -1,9 +1,23 @@
 # Copyright (c) 2025, YOUR COMPANY / NAME and contributors
 # For license information, please see license.txt
 
-# import frappe
+import frappe
 from frappe.model.document import Document
 
+from planner.planner.branches import get_staff_branch, validate_branch_site
+from planner.planner.permissions import validate_approval_fields
+
 
 class StaffCashSubmission(Document):
-	pass
+	def validate(self):
+		validate_approval_fields(self, ("status", "approved_by"))
+		if not self.customer_department:
+			self.customer_department = get_staff_branch(self.staff_user)
+		if self.customer_department:
+			validate_branch_site(self.customer_department)
+
+
+def on_doctype_update():
+	frappe.db.add_index("Staff Cash Submission", ["staff_user", "modified"])
+	frappe.db.add_index("Staff Cash Submission", ["customer_department", "submit_date"])
+	frappe.db.add_index("Staff Cash Submission", ["customer_department", "modified"])
@@ -1,9 +1,60 @@
 # Copyright (c) 2025, YOUR COMPANY / NAME and Contributors
 # See license.txt
 
-# import frappe
-from frappe.tests import IntegrationTestCase
+import frappe
 
+from planner.planner.permissions import COLLECTOR_ROLE
+from planner.tests.factories import RUN_ID, StaffCashSubmissionFactory
+from planner.tests.utils import PlannerTestCase
 
-class TestStaffcashsubmission(IntegrationTestCase):
-	pass
+
+def make_collector(n: int) -> str:
+	if not frappe.db.exists("Role", COLLECTOR_ROLE):
+		frappe.get_doc({"doctype": "Role", "role_name": COLLECTOR_ROLE}).insert(ignore_permissions=True)
+	return (
+		frappe.get_doc(
+			{
+				"doctype": "User",
+				"email": f"collector-{RUN_ID}-{n}@example.com",
+				"first_name": "Collector",
+				"send_welcome_email": 0,
+				"roles": [{"role": COLLECTOR_ROLE}],
+			}
+		)
+		.insert(ignore_permissions=True)
+		.name
+	)
+
+
+class TestStaffcashsubmission(PlannerTestCase):
+	def setUp(self):
+		super().setUp()
+		self.collector = make_collector(1)
+		self.addCleanup(frappe.set_user, frappe.session.user)
+
+	def test_collector_sees_only_own_submissions(self):
+		own = StaffCashSubmissionFactory.create(staff_user=self.collector)
+		other = StaffCashSubmissionFactory.create(staff_user=make_collector(2))
+
+		self.assertTrue(frappe.has_permission(doc=own, ptype="read", user=self.collector))
+		self.assertFalse(frappe.has_permission(doc=other, ptype="read", user=self.collector))
+
+	def test_collector_cannot_approve(self):
+		name = StaffCashSubmissionFactory.create(staff_user=self.collector, amount_cash=1500).name
+
+		frappe.set_user(self.collector)
+		doc = frappe.get_doc("Staff Cash Submission", name)
+		doc.status = "Approved"
+		self.assertRaises(frappe.PermissionError, doc.save)
+
+		# Other fields stay editable.
+		doc.reload()
+		doc.amount_cash = 2000
+		doc.save()
+
+		frappe.set_user("Administrator")
+		doc.reload()
+		doc.status = "Approved"
+		doc.approved_by = "Administrator"
+		doc.save()
+		self.assertEqual(frappe.db.get_value("Staff Cash Submission", name, "status"), "Approved")
@@ -0,0 +1,67 @@
+# Copyright (c) 2026, Kebazz Technologies and Contributors
+# See license.txt
+
+import frappe
+from frappe.utils import nowdate
+
+from planner.planner.subscriptions import change_package, get_proration
+from planner.tests.factories import CustomerFactory
+from planner.tests.utils import PlannerTestCase
+
+
+class TestSubscriptionCharge(PlannerTestCase):
+	def setUp(self):
+		super().setUp()
+		# 1500 and 4000 a month.
+		self.basic, self.premium = self.fixtures.packages[:2]
+
+	def get_charges(self, customer):
+		return frappe.get_all(
+			"Subscription Charge",
+			filters={"customer": customer},
+			fields=["posting_date", "charge_type", "amount"],
+			order_by="charge_type",
+		)
+
+	def test_mid_month_change_is_prorated(self):
+		customer = CustomerFactory.create(package_assigned=self.basic, register_date="2020-01-01").name
+
+		summary = change_package(customer, self.premium, "2020-02-10", charge_register_fee=1)
+
+		# 20 of February 2020's 29 days remain, counting the 10th.
+		proration = round(2500 * 20 / 29, 2)
+		self.assertAlmostEqual(summary["total"], proration + 1500)
+		self.assertEqual(
+			[(str(c.posting_date), c.charge_type, c.amount) for c in self.get_charges(customer)],
+			[("2020-02-10", "Proration", proration), ("2020-02-10", "Registration", 1500)],
+		)
+		self.assertAlmostEqual(self.get_balance(customer), proration + 1500)
+		self.assertEqual(frappe.db.get_value("Customer", customer, "package_assigned"), self.premium)
+
+		# Moving back down credits the rest of the month.
+		change_package(customer, self.basic, "2020-02-20")
+		self.assertEqual(
+			sorted(c.amount for c in self.get_charges(customer) if c.charge_type == "Proration"),
+			[-round(2500 * 10 / 29, 2), proration],
+		)
+
+	def test_preview_writes_nothing(self):
+		customer = CustomerFactory.create(package_assigned=self.basic, register_date="2020-01-01").name
+		summary = change_package(customer, self.premium, "2020-02-10", preview=1)
+
+		self.assertEqual(summary["total"], round(2500 * 20 / 29, 2))
+		self.assertEqual(self.get_charges(customer), [])
+		self.assertEqual(frappe.db.get_value("Customer", customer, "package_assigned"), self.basic)
+
+	def test_change_on_the_form(self):
+		customer = CustomerFactory.create(package_assigned=self.basic, register_date="2020-01-01")
+		customer.package_assigned = self.premium
+		customer.save()
+
+		charges = self.get_charges(customer.name)
+		self.assertEqual([c.amount for c in charges], [get_proration(1500, 4000, nowdate())])
+		self.assertEqual(self.get_balance(customer.name), charges[0].amount)
+
+		# The charge leaves `modified` alone, so the form can be saved again.
+		customer.phone_number = "0770000099"
+		customer.save()
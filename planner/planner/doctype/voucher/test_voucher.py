@@ -1,9 +1,37 @@
 # Copyright (c) 2025, YOUR COMPANY / NAME and Contributors
 # See license.txt
 
-# import frappe
-from frappe.tests import IntegrationTestCase
+import frappe
 
+from planner.planner.bulk_actions import apply_bulk_action
+from planner.tests.factories import CustomerFactory, VoucherFactory
+from planner.tests.utils import PlannerTestCase
 
-class TestVoucher(IntegrationTestCase):
-	pass
+
+class TestVoucher(PlannerTestCase):
+	def test_bulk_expire(self):
+		available = VoucherFactory.create_batch(3)
+		redeemed = VoucherFactory.create_batch(2, status="Redeemed")
+
+		summary = apply_bulk_action("Voucher", "expire", names=[*available, *redeemed, "_Missing Voucher"])
+		self.assertEqual((summary["changed"], summary["skipped"]), (3, 3))
+		self.assertEqual(
+			set(frappe.get_all("Voucher", filters={"name": ("in", available)}, pluck="status")), {"Expired"}
+		)
+		self.assertEqual(
+			set(frappe.get_all("Voucher", filters={"name": ("in", redeemed)}, pluck="status")), {"Redeemed"}
+		)
+
+	def test_bulk_deactivate_logs_status_changes(self):
+		branch = self.fixtures.branches[0]
+		customers = CustomerFactory.create_batch(4, customer_department=branch)
+
+		summary = apply_bulk_action(
+			"Customer",
+			"deactivate",
+			filters=[["name", "in", customers], ["customer_department", "=", branch]],
+		)
+		self.assertEqual(summary["changed"], 4)
+		self.assertEqual(
+			frappe.db.count("Customer Status Log", {"customer": ("in", customers), "reason": "Manual"}), 4
+		)
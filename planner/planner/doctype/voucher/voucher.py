@@ -1,9 +1,17 @@
 # Copyright (c) 2025, YOUR COMPANY / NAME and contributors
 # For license information, please see license.txt
 
-# import frappe
+import frappe
 from frappe.model.document import Document
 
+from planner.planner.branches import validate_branch_site
+
 
 class Voucher(Document):
-	pass
+	def validate(self):
+		if self.customer_department:
+			validate_branch_site(self.customer_department)
+
+
+def on_doctype_update():
+	frappe.db.add_index("Voucher", ["customer_department", "status"])
@@ -0,0 +1,175 @@
+# Copyright (c) 2026, Kebazz Technologies and contributors
+# For license information, please see license.txt
+
+"""
+Detection of Customer Payments recorded twice.
+
+Each payment stores a fingerprint of (customer, amount, payment type, voucher).
+Two payments with the same fingerprint whose dates are at most
+`planner_duplicate_window_days` apart (site_config.json, default 3) are
+considered duplicates. The later ones get `possible_duplicate_of` pointing at
+the earliest.
+
+On save, one query on the (fingerprint, payment_date) index looks for a match
+in the window: the date bucket is the index range around the payment date.
+With `planner_block_duplicate_payments` set, such a payment is rejected unless
+`flags.ignore_duplicate` is set.
+
+`scan_duplicates` checks the history in a single pass. Payments are read sorted
+by (fingerprint, date), so duplicates are always adjacent and each row is only
+compared with the one before it.
+"""
+
+import hashlib
+from datetime import timedelta
+
+import frappe
+from frappe import _
+from frappe.utils import add_days, cint, flt, get_link_to_form, getdate
+
+DEFAULT_WINDOW_DAYS = 3
+CHUNK_SIZE = 1000
+
+
+def get_window_days() -> int:
+	return cint(frappe.conf.planner_duplicate_window_days) or DEFAULT_WINDOW_DAYS
+
+
+def get_fingerprint(customer: str, amount: float, payment_type: str | None, voucher: str | None) -> str:
+	key = "|".join((customer or "", f"{flt(amount, 2):.2f}", payment_type or "", voucher or ""))
+	return hashlib.sha1(key.encode()).hexdigest()[:20]
+
+
+def check_duplicate(doc):
+	"""Called from Customer Payment.validate: fingerprints the payment and flags a match in the window."""
+	doc.duplicate_fingerprint = get_fingerprint(doc.customer, doc.amount, doc.payment_type, doc.voucher)
+	if not doc.payment_date:
+		return
+
+	window = get_window_days()
+	match = frappe.db.sql(
+		"""select name from `tabCustomer Payment`
+		where duplicate_fingerprint = %s and payment_date between %s and %s and name != %s
+		order by payment_date, creation
+		limit 1""",
+		(
+			doc.duplicate_fingerprint,
+			add_days(doc.payment_date, -window),
+			add_days(doc.payment_date, window),
+			doc.name or "",
+		),
+	)
+	doc.possible_duplicate_of = match[0][0] if match else None
+	if not doc.possible_duplicate_of:
+		return
+
+	message = _(
+		"This looks like a duplicate of {0}: same customer, amount, payment type and voucher."
+	).format(get_link_to_form("Customer Payment", doc.possible_duplicate_of))
+	if frappe.conf.planner_block_duplicate_payments and not doc.flags.ignore_duplicate:
+		frappe.throw(message, title=_("Possible Duplicate"))
+	frappe.msgprint(message, title=_("Possible Duplicate"), indicator="orange", alert=True)
+
+
+def update_fingerprints(chunk_size: int = CHUNK_SIZE):
+	"""
+	Fingerprints payments that don't have one yet, in chunks.
+
+	bench --site [site] execute planner.planner.duplicates.update_fingerprints
+	"""
+	last = ""
+	while True:
+		rows = frappe.db.sql(
+			"""select name, customer, amount, payment_type, voucher
+			from `tabCustomer Payment`
+			where ifnull(duplicate_fingerprint, '') = '' and name > %s
+			order by name
+			limit %s""",
+			(last, chunk_size),
+			as_dict=True,
+		)
+		if not rows:
+			return
+
+		frappe.db.bulk_update(
+			"Customer Payment",
+			{
+				row.name: {
+					"duplicate_fingerprint": get_fingerprint(
+						row.customer, row.amount, row.payment_type, row.voucher
+					)
+				}
+				for row in rows
+			},
+			update_modified=False,
+		)
+		frappe.db.commit()
+		last = rows[-1].name
+
+
+def scan_duplicates(from_date: str | None = None, to_date: str | None = None):
+	"""
+	Weekly scheduler job: flags duplicates across the payment history (or a date
+	range) and clears flags that no longer apply.
+
+	bench --site [site] execute planner.planner.duplicates.scan_duplicates
+	"""
+	update_fingerprints()
+
+	window = timedelta(days=get_window_days())
+	conditions, values = ["ifnull(duplicate_fingerprint, '') != ''", "payment_date is not null"], []
+	if from_date:
+		conditions.append("payment_date >= %s")
+		values.append(from_date)
+	if to_date:
+		conditions.append("payment_date <= %s")
+		values.append(to_date)
+
+	updates = {}
+	first = previous = None
+	# Streams the sorted rows, so the scan needs no more memory for a larger history.
+	with frappe.db.unbuffered_cursor():
+		rows = frappe.db.sql(
+			f"""select name, duplicate_fingerprint, payment_date, possible_duplicate_of
+			from `tabCustomer Payment`
+			where {" and ".join(conditions)}
+			order by duplicate_fingerprint, payment_date, creation""",
+			values,
+			as_dict=True,
+			as_iterator=True,
+		)
+		for row in rows:
+			same_group = (
+				previous is not None
+				and row.duplicate_fingerprint == previous.duplicate_fingerprint
+				and getdate(row.payment_date) - getdate(previous.payment_date) <= window
+			)
+			if not same_group:
+				first = row
+			expected = first.name if same_group else None
+			if (row.possible_duplicate_of or None) != expected:
+				updates[row.name] = {"possible_duplicate_of": expected}
+			previous = row
+
+	names = list(updates)
+	for start in range(0, len(names), CHUNK_SIZE):
+		frappe.db.bulk_update(
+			"Customer Payment",
+			{name: updates[name] for name in names[start : start + CHUNK_SIZE]},
+			update_modified=False,
+		)
+		frappe.db.commit()
+	return len(names)
+
+
+@frappe.whitelist(methods=["POST"])
+def start_duplicate_scan(from_date: str | None = None, to_date: str | None = None):
+	frappe.only_for("System Manager")
+	frappe.enqueue(
+		scan_duplicates,
+		queue="long",
+		job_id="planner_scan_duplicate_payments",
+		deduplicate=True,
+		from_date=from_date,
+		to_date=to_date,
+	)
@@ -0,0 +1,109 @@
+# Copyright (c) 2026, Kebazz Technologies and contributors
+# For license information, please see license.txt
+
+"""
+Per-account, per-month expense totals over the Expense Account tree.
+
+Expense doc_events keep Expense Account Period Total up to date: saving an
+Expense subtracts its previous (account, month, amount) and adds the new one.
+Because accounts are a nested set, the total of an account including all of
+its sub-accounts is one range query on `lft`/`rgt` over those monthly rows.
+"""
+
+from collections import defaultdict
+
+import frappe
+from frappe.utils import flt
+
+from planner.planner.ledger import get_period
+from planner.planner.replica import read_from_replica
+from planner.planner.utils import upsert_increments
+
+
+def get_totals_key(doc) -> tuple[str, str] | None:
+	if not doc or not doc.account or not doc.expense_date:
+		return None
+	return doc.account, get_period(doc.expense_date)
+
+
+def on_update(doc, method=None):
+	"""doc_events handler: moves the expense's amount between monthly totals if needed."""
+	before = doc.get_doc_before_save()
+	deltas = defaultdict(float)
+
+	if key := get_totals_key(before):
+		deltas[key] -= flt(before.amount)
+	if key := get_totals_key(doc):
+		deltas[key] += flt(doc.amount)
+
+	update_totals(deltas)
+
+
+def on_trash(doc, method=None):
+	if key := get_totals_key(doc):
+		update_totals({key: -flt(doc.amount)})
+
+
+def update_totals(deltas: dict):
+	upsert_increments(
+		"Expense Account Period Total",
+		[
+			{"name": f"{period}:{account}", "expense_account": account, "period": period, "amount": amount}
+			for (account, period), amount in deltas.items()
+			if amount
+		],
+		["amount"],
+	)
+
+
+def rebuild_totals():
+	"""
+	Recomputes all monthly totals from the Expense table in one statement.
+
+	bench --site [site] execute planner.planner.expense_accounts.rebuild_totals
+	"""
+	frappe.db.delete("Expense Account Period Total")
+	frappe.db.sql(
+		"""insert into `tabExpense Account Period Total`
+			(name, expense_account, period, amount, creation, modified, owner, modified_by, docstatus)
+		select concat(left(expense_date, 7), ':', account), account, left(expense_date, 7), sum(amount),
+			now(), now(), 'Administrator', 'Administrator', 0
+		from `tabExpense`
+		where ifnull(account, '') != '' and expense_date is not null
+		group by account, left(expense_date, 7)"""
+	)
+
+
+@frappe.whitelist()
+@read_from_replica
+def get_account_total(expense_account: str, from_period: str, to_period: str) -> float:
+	"""Total of `expense_account` and all its sub-accounts for the periods (YYYY-MM) in range."""
+	frappe.has_permission("Expense Account Period Total", "report", throw=True)
+	lft, rgt = frappe.db.get_value("Expense Account", expense_account, ["lft", "rgt"])
+	total = frappe.db.sql(
+		"""select sum(t.amount)
+		from `tabExpense Account Period Total` t
+		join `tabExpense Account` a on a.name = t.expense_account
+		where a.lft >= %s and a.rgt <= %s and t.period between %s and %s""",
+		(lft, rgt, from_period, to_period),
+	)[0][0]
+	return flt(total)
+
+
+@frappe.whitelist()
+@read_from_replica
+def get_tree_totals(from_period: str, to_period: str) -> list[dict]:
+	"""Rolled-up totals for every account in the tree, including sub-accounts."""
+	frappe.has_permission("Expense Account Period Total", "report", throw=True)
+	return frappe.db.sql(
+		"""select parent.name as expense_account, parent.parent_expense_account, parent.is_group,
+			ifnull(sum(t.amount), 0) as amount
+		from `tabExpense Account` parent
+		join `tabExpense Account` child on child.lft between parent.lft and parent.rgt
+		left join `tabExpense Account Period Total` t
+			on t.expense_account = child.name and t.period between %s and %s
+		group by parent.name, parent.parent_expense_account, parent.is_group, parent.lft
+		order by parent.lft""",
+		(from_period, to_period),
+		as_dict=True,
+	)
@@ -0,0 +1,379 @@
+# Copyright (c) 2026, Kebazz Technologies and contributors
+# For license information, please see license.txt
+
+"""
+Streaming export of planner lists to CSV, XLSX or Parquet.
+
+`start_export` queues a background job, which walks the list with keyset
+pagination on (date field, name). Each page is written to the output file as
+soon as it is read, so memory use stays the same however many rows are
+exported. Link columns get an extra column with the linked record's display
+value, looked up once per page for all rows. The job reports progress over
+realtime and ends with a private File the user can download.
+
+XLSX uses openpyxl's write-only mode. Parquet needs `pyarrow`, which is optional.
+"""
+
+import csv
+import importlib.util
+import os
+from dataclasses import dataclass
+
+import frappe
+from frappe import _
+from frappe.model import no_value_fields, table_fields
+from frappe.utils import cint, flt, now_datetime, scrub
+
+from planner.planner.replica import prefer_replica, replica_connection
+
+# doctype -> date field the export is ordered by
+SORT_FIELDS = {
+	"Customer Payment": "payment_date",
+	"Bank Transaction": "date",
+	"Expense": "expense_date",
+	"ISP Payment": "payment_date",
+	"Company Ledger": "entry_date",
+	"Customer": "register_date",
+	"Voucher": "date_issue",
+}
+
+# Linked doctype -> field shown next to the link value. Others use their title field, if any.
+DISPLAY_FIELDS = {
+	"User": "full_name",
+	"Voucher": "voucher_code",
+	"Bank Account": "account_name",
+}
+
+PAGE_SIZE = 5000
+# Display values remembered per link column; reset when full so memory stays bounded.
+MAX_DISPLAY_CACHE = 50_000
+XLSX_MAX_ROWS = 1_048_575  # excluding the header row
+NUMERIC_FIELDTYPES = ("Currency", "Float", "Percent")
+INTEGER_FIELDTYPES = ("Int", "Check")
+
+
+@dataclass
+class Column:
+	fieldname: str
+	label: str
+	fieldtype: str
+	link_doctype: str | None = None
+	display_field: str | None = None
+
+
+class CSVWriter:
+	extension = "csv"
+
+	def __init__(self, path: str, columns: list[Column]):
+		self.file = open(path, "w", newline="", encoding="utf-8")
+		self.writer = csv.writer(self.file)
+		self.writer.writerow([c.label for c in columns])
+
+	def write(self, rows: list[list]):
+		self.writer.writerows(rows)
+
+	def close(self):
+		self.file.close()
+
+
+class XLSXWriter:
+	extension = "xlsx"
+
+	def __init__(self, path: str, columns: list[Column]):
+		from openpyxl import Workbook
+
+		self.path = path
+		self.headers = [c.label for c in columns]
+		self.workbook = Workbook(write_only=True)
+		self.sheet = None
+		self.sheet_rows = 0
+		self.new_sheet()
+
+	def new_sheet(self):
+		# Sheets hold about a million rows; larger exports continue on the next sheet.
+		self.sheet = self.workbook.create_sheet(f"Sheet{len(self.workbook.worksheets) + 1}")
+		self.sheet.append(self.headers)
+		self.sheet_rows = 0
+
+	def write(self, rows: list[list]):
+		for row in rows:
+			if self.sheet_rows >= XLSX_MAX_ROWS:
+				self.new_sheet()
+			self.sheet.append(row)
+			self.sheet_rows += 1
+
+	def close(self):
+		self.workbook.save(self.path)
+
+
+class ParquetWriter:
+	extension = "parquet"
+
+	def __init__(self, path: str, columns: list[Column]):
+		import pyarrow as pa
+		import pyarrow.parquet as pq
+
+		self.pa = pa
+		self.schema = pa.schema([(c.label, self.get_type(c)) for c in columns])
+		self.converters = [
+			flt if c.fieldtype in NUMERIC_FIELDTYPES else cint if c.fieldtype in INTEGER_FIELDTYPES else None
+			for c in columns
+		]
+		self.writer = pq.ParquetWriter(path, self.schema, compression="zstd")
+
+	def get_type(self, column: Column):
+		if column.fieldtype in NUMERIC_FIELDTYPES:
+			return self.pa.float64()
+		if column.fieldtype in INTEGER_FIELDTYPES:
+			return self.pa.int64()
+		if column.fieldtype == "Date":
+			return self.pa.date32()
+		if column.fieldtype == "Datetime":
+			return self.pa.timestamp("us")
+		return self.pa.string()
+
+	def write(self, rows: list[list]):
+		# One row group per page.
+		arrays = []
+		for i, (field, convert) in enumerate(zip(self.schema, self.converters, strict=True)):
+			values = [row[i] for row in rows]
+			if convert:
+				values = [None if v is None else convert(v) for v in values]
+			arrays.append(self.pa.array(values, type=field.type))
+		self.writer.write_table(self.pa.Table.from_arrays(arrays, schema=self.schema))
+
+	def close(self):
+		self.writer.close()
+
+
+WRITERS = {
+	"csv": CSVWriter,
+	"xlsx": XLSXWriter,
+	"parquet": ParquetWriter,
+}
+
+
+@frappe.whitelist(methods=["POST"])
+def start_export(
+	doctype: str, file_format: str = "csv", filters: str | dict | list | None = None, fields=None
+) -> str:
+	"""Queues an export of `doctype` and returns its id, which the progress events carry."""
+	if doctype not in SORT_FIELDS:
+		frappe.throw(_("Export is not supported for {0}").format(doctype))
+	if file_format not in WRITERS:
+		frappe.throw(_("Unsupported export format: {0}").format(file_format))
+	if file_format == "parquet" and not importlib.util.find_spec("pyarrow"):
+		frappe.throw(_("Parquet export needs the pyarrow package to be installed"))
+	frappe.has_permission(doctype, "export", throw=True)
+
+	filters = normalize_filters(frappe.parse_json(filters) or [])
+	columns = get_columns(doctype, frappe.parse_json(fields) or None)
+	export_id = frappe.generate_hash(length=10)
+
+	frappe.enqueue(
+		export,
+		queue="long",
+		timeout=4 * 60 * 60,
+		job_id=f"planner_export::{export_id}",
+		doctype=doctype,
+		file_format=file_format,
+		filters=filters,
+		fieldnames=[c.fieldname for c in columns if not c.display_field],
+		export_id=export_id,
+	)
+	return export_id
+
+
+def normalize_filters(filters: dict | list) -> list[list]:
+	if isinstance(filters, dict):
+		return [
+			[key, *value] if isinstance(value, list | tuple) else [key, "=", value]
+			for key, value in filters.items()
+		]
+	return [list(f) for f in filters]
+
+
+def get_columns(doctype: str, fieldnames: list[str] | None = None) -> list[Column]:
+	"""The export's columns, each Link column followed by its display column when it has one."""
+	meta = frappe.get_meta(doctype)
+	if fieldnames:
+		invalid = [f for f in fieldnames if f != "name" and not meta.get_field(f)]
+		if invalid:
+			frappe.throw(_("Invalid fields for {0}: {1}").format(doctype, ", ".join(invalid)))
+	else:
+		fieldnames = [
+			df.fieldname
+			for df in meta.fields
+			if df.fieldtype not in no_value_fields and df.fieldtype not in table_fields
+		]
+
+	columns = [Column("name", _("ID"), "Data")]
+	for fieldname in fieldnames:
+		if fieldname == "name":
+			continue
+		df = meta.get_field(fieldname)
+		columns.append(Column(fieldname, _(df.label), df.fieldtype))
+		if df.fieldtype == "Link" and (display_field := get_display_field(df.options)):
+			link_meta = frappe.get_meta(df.options)
+			columns.append(
+				Column(
+					fieldname,
+					f"{_(df.label)} ({_(link_meta.get_label(display_field))})",
+					"Data",
+					link_doctype=df.options,
+					display_field=display_field,
+				)
+			)
+	return columns
+
+
+def get_display_field(doctype: str) -> str | None:
+	if doctype in DISPLAY_FIELDS:
+		return DISPLAY_FIELDS[doctype]
+	title_field = frappe.get_meta(doctype).title_field
+	return title_field if title_field and title_field != "name" else None
+
+
+def export(doctype: str, file_format: str, filters: list, fieldnames: list[str], export_id: str):
+	"""Background job: writes the export file page by page and attaches it as a private File."""
+	columns = get_columns(doctype, fieldnames)
+	writer_class = WRITERS[file_format]
+	file_name = f"{scrub(doctype)}-{now_datetime():%Y%m%d-%H%M%S}-{export_id}.{writer_class.extension}"
+	path = frappe.get_site_path("private", "files", file_name)
+	os.makedirs(os.path.dirname(path), exist_ok=True)
+
+	try:
+		writer = writer_class(path, columns)
+		try:
+			with prefer_replica(), replica_connection():
+				write_pages(writer, doctype, filters, columns, export_id)
+		finally:
+			writer.close()
+	except Exception:
+		if os.path.exists(path):
+			os.remove(path)
+		frappe.log_error(title=f"Planner: export of {doctype} failed")
+		publish(export_id, "failed")
+		raise
+
+	file = frappe.get_doc(
+		{
+			"doctype": "File",
+			"file_name": file_name,
+			"file_url": f"/private/files/{file_name}",
+			"is_private": 1,
+			"file_size": os.path.getsize(path),
+		}
+	).insert(ignore_permissions=True)
+	publish(export_id, "completed", file_url=file.file_url)
+
+
+def write_pages(writer, doctype: str, filters: list, columns: list[Column], export_id: str):
+	total = count_rows(doctype, filters)
+	display_cache = {}
+	written = 0
+
+	for page in iter_pages(doctype, filters, [c.fieldname for c in columns]):
+		displays = get_display_values(columns, page, display_cache)
+		writer.write(
+			[
+				[
+					displays[i].get(row[c.fieldname]) if c.display_field else row[c.fieldname]
+					for i, c in enumerate(columns)
+				]
+				for row in page
+			]
+		)
+		written += len(page)
+		frappe.publish_progress(
+			written * 100 / (total or written),
+			title=_("Exporting {0}").format(_(doctype)),
+			description=_("{0} of {1} rows").format(written, total),
+		)
+		publish(export_id, "running", written=written, total=total)
+
+
+def count_rows(doctype: str, filters: list) -> int:
+	return cint(frappe.get_list(doctype, filters=filters, fields=["count(name) as count"])[0].count)
+
+
+def iter_pages(doctype: str, filters: list, fieldnames: list[str], page_size: int = PAGE_SIZE):
+	"""
+	Yields the rows `frappe.get_list` returns for the filters, a page at a time,
+	ordered by (date field, name). Each page continues after the last row of the
+	previous one instead of using an offset, so late pages cost the same as early
+	ones. Rows without a date come first, ordered by name.
+	"""
+	sort_field = SORT_FIELDS[doctype]
+	fields = list(dict.fromkeys([*fieldnames, "name", sort_field]))
+
+	last_name = None
+	while True:
+		keyset = [[sort_field, "is", "not set"]]
+		if last_name:
+			keyset.append(["name", ">", last_name])
+		rows = frappe.get_list(
+			doctype,
+			fields=fields,
+			filters=filters + keyset,
+			order_by="name asc",
+			limit_page_length=page_size,
+		)
+		if rows:
+			yield rows
+			last_name = rows[-1].name
+		if len(rows) < page_size:
+			break
+
+	last = None
+	while True:
+		keyset, or_filters = [[sort_field, "is", "set"]], None
+		if last:
+			# (date, name) > last, written so the date part can use the index.
+			keyset.append([sort_field, ">=", last[0]])
+			or_filters = [[sort_field, ">", last[0]], ["name", ">", last[1]]]
+		rows = frappe.get_list(
+			doctype,
+			fields=fields,
+			filters=filters + keyset,
+			or_filters=or_filters,
+			order_by=f"`{sort_field}` asc, `name` asc",
+			limit_page_length=page_size,
+		)
+		if rows:
+			yield rows
+			last = (rows[-1][sort_field], rows[-1].name)
+		if len(rows) < page_size:
+			break
+
+
+def get_display_values(columns: list[Column], rows: list, cache: dict) -> dict[int, dict]:
+	"""For each display column, maps the page's link values to display values with one query per column."""
+	displays = {}
+	for i, column in enumerate(columns):
+		if not column.display_field:
+			continue
+
+		known = cache.setdefault(i, {})
+		missing = {row[column.fieldname] for row in rows if row[column.fieldname]} - known.keys()
+		if missing:
+			if len(known) + len(missing) > MAX_DISPLAY_CACHE:
+				known.clear()
+			known.update(
+				frappe.get_all(
+					column.link_doctype,
+					filters={"name": ("in", list(missing))},
+					fields=["name", column.display_field],
+					as_list=True,
+				)
+			)
+		displays[i] = known
+	return displays
+
+
+def publish(export_id: str, status: str, **data):
+	frappe.publish_realtime(
+		"planner_export",
+		{"export_id": export_id, "status": status, **data},
+		user=frappe.session.user,
+	)
@@ -0,0 +1,298 @@
+# Copyright (c) 2026, Kebazz Technologies and contributors
+# For license information, please see license.txt
+
+"""
+Double-entry posting of planner documents into the Company Ledger.
+
+Each supported document is turned into balanced ledger rows by its posting
+rule and written with one bulk insert. Editing a document reverses its active
+rows and posts the new ones in the same insert; deleting it only reverses
+(none of these doctypes is submittable, so there is no cancel). Every posting also updates the per-account, per-month totals in
+Ledger Period Balance with a single upsert, and the trial balance and P&L are
+read from there instead of from the raw entries.
+
+Books are kept on a cash basis with these accounts:
+
+- Cash and Bank Clearing receive Customer Payments and pay Expenses. Bank
+  Transactions move money between Bank Clearing and "Bank - <Bank Account>".
+- Subscription Income is credited by Customer Payments.
+- Expenses and ISP Charges are debited by Expenses and ISP Payments.
+"""
+
+from collections import defaultdict
+from typing import NamedTuple
+
+import frappe
+from frappe import _
+from frappe.utils import flt, getdate, now_datetime
+
+from planner.planner.replica import read_from_replica
+from planner.planner.utils import upsert_increments
+
+CASH = "Cash"
+BANK_CLEARING = "Bank Clearing"
+SUBSCRIPTION_INCOME = "Subscription Income"
+EXPENSES = "Expenses"
+ISP_CHARGES = "ISP Charges"
+
+ROOT_TYPES = {
+	CASH: "Asset",
+	BANK_CLEARING: "Asset",
+	SUBSCRIPTION_INCOME: "Income",
+	EXPENSES: "Expense",
+	ISP_CHARGES: "Expense",
+}
+
+# Rounding tolerance when checking that a posting balances.
+PRECISION = 2
+
+LEDGER_FIELDS = (
+	"name",
+	"owner",
+	"creation",
+	"modified",
+	"modified_by",
+	"docstatus",
+	"entry_date",
+	"entry_type",
+	"reference",
+	"account",
+	"root_type",
+	"debit",
+	"credit",
+	"period",
+	"voucher_type",
+	"voucher_no",
+	"is_cancelled",
+)
+
+
+class Entry(NamedTuple):
+	account: str
+	root_type: str
+	debit: float
+	credit: float
+
+
+def cash_or_bank(mode: str | None) -> str:
+	return BANK_CLEARING if mode == "Bank" else CASH
+
+
+def entry(account: str, debit: float = 0, credit: float = 0, root_type: str | None = None) -> Entry:
+	return Entry(account, root_type or ROOT_TYPES[account], flt(debit, PRECISION), flt(credit, PRECISION))
+
+
+def get_customer_payment_entries(doc) -> list[Entry]:
+	return [
+		entry(cash_or_bank(doc.payment_type), debit=doc.amount),
+		entry(SUBSCRIPTION_INCOME, credit=doc.amount),
+	]
+
+
+def get_expense_entries(doc) -> list[Entry]:
+	return [
+		entry(EXPENSES, debit=doc.amount),
+		entry(cash_or_bank(doc.paid_via), credit=doc.amount),
+	]
+
+
+def get_isp_payment_entries(doc) -> list[Entry]:
+	return [
+		entry(ISP_CHARGES, debit=doc.amount_paid),
+		entry(BANK_CLEARING, credit=doc.amount_paid),
+	]
+
+
+def get_bank_transaction_entries(doc) -> list[Entry]:
+	# Statement convention: credit is money into the bank account, debit is money out.
+	bank = f"Bank - {doc.bank_account}"
+	net = flt(doc.credit) - flt(doc.debit)
+	if net > 0:
+		return [entry(bank, debit=net, root_type="Asset"), entry(BANK_CLEARING, credit=net)]
+	return [entry(BANK_CLEARING, debit=-net), entry(bank, credit=-net, root_type="Asset")]
+
+
+# doctype: (posting date field, rule)
+POSTING_RULES = {
+	"Customer Payment": ("payment_date", get_customer_payment_entries),
+	"Expense": ("expense_date", get_expense_entries),
+	"ISP Payment": ("payment_date", get_isp_payment_entries),
+	"Bank Transaction": ("date", get_bank_transaction_entries),
+}
+
+
+def get_period(posting_date) -> str:
+	return getdate(posting_date).strftime("%Y-%m")
+
+
+def on_update(doc, method=None):
+	"""doc_events handler: (re)posts the document if its ledger entries changed."""
+	date_field, rule = POSTING_RULES[doc.doctype]
+	posting_date = doc.get(date_field) or getdate(doc.creation)
+	entries = [e for e in rule(doc) if e.debit or e.credit]
+	make_ledger_entries(doc.doctype, doc.name, posting_date, entries)
+
+
+def on_cancel(doc, method=None):
+	"""doc_events handler for on_trash: reverses the active entries."""
+	make_ledger_entries(doc.doctype, doc.name, None, [])
+
+
+def make_ledger_entries(voucher_type: str, voucher_no: str, posting_date, entries: list[Entry]):
+	"""
+	Makes the active ledger entries of a voucher equal `entries`.
+
+	Active rows that differ are reversed and the new rows posted, all in one
+	bulk insert, followed by one upsert into Ledger Period Balance. Passing no
+	entries reverses the voucher.
+	"""
+	validate_balanced(entries)
+
+	active = frappe.get_all(
+		"Company Ledger",
+		filters={"voucher_type": voucher_type, "voucher_no": voucher_no, "is_cancelled": 0},
+		fields=["name", "entry_date", "account", "root_type", "debit", "credit"],
+	)
+	period = get_period(posting_date) if posting_date else None
+	current = sorted(Entry(r.account, r.root_type, flt(r.debit), flt(r.credit)) for r in active)
+	same_date = all(posting_date and getdate(r.entry_date) == getdate(posting_date) for r in active)
+	if current == sorted(entries) and same_date:
+		return
+
+	now = now_datetime()
+	user = frappe.session.user
+	reference = f"{voucher_type} {voucher_no}"
+	rows, deltas = [], defaultdict(lambda: [0.0, 0.0])
+
+	def add(entry_date, row_period, e, is_cancelled):
+		rows.append(
+			(
+				frappe.generate_hash(length=10),
+				user,
+				now,
+				now,
+				user,
+				0,
+				entry_date,
+				"Debit" if e.debit else "Credit",
+				reference,
+				e.account,
+				e.root_type,
+				e.debit,
+				e.credit,
+				row_period,
+				voucher_type,
+				voucher_no,
+				is_cancelled,
+			)
+		)
+		delta = deltas[(e.account, e.root_type, row_period)]
+		delta[0] += e.debit
+		delta[1] += e.credit
+
+	for r in active:
+		# The reversal lands in the original period so that period nets to zero.
+		add(
+			r.entry_date,
+			get_period(r.entry_date),
+			Entry(r.account, r.root_type, flt(r.credit), flt(r.debit)),
+			1,
+		)
+	for e in entries:
+		add(posting_date, period, e, 0)
+
+	if active:
+		frappe.db.set_value(
+			"Company Ledger",
+			{"name": ("in", [r.name for r in active])},
+			"is_cancelled",
+			1,
+			update_modified=False,
+		)
+	frappe.db.bulk_insert("Company Ledger", LEDGER_FIELDS, rows)
+	update_period_balances(deltas)
+
+
+def validate_balanced(entries: list[Entry]):
+	debit = flt(sum(e.debit for e in entries), PRECISION)
+	credit = flt(sum(e.credit for e in entries), PRECISION)
+	if debit != credit:
+		frappe.throw(_("Ledger entries are not balanced: debit {0} and credit {1}").format(debit, credit))
+
+
+def update_period_balances(deltas: dict):
+	"""Adds the given (account, root_type, period) -> [debit, credit] deltas in a single upsert."""
+	upsert_increments(
+		"Ledger Period Balance",
+		[
+			{
+				"name": f"{period}:{account}",
+				"account": account,
+				"root_type": root_type,
+				"period": period,
+				"debit": debit,
+				"credit": credit,
+			}
+			for (account, root_type, period), (debit, credit) in deltas.items()
+		],
+		["debit", "credit"],
+	)
+
+
+def repost(doctype: str | None = None, chunk_size: int = 500):
+	"""
+	Posts every existing document of the supported doctypes. Already posted
+	documents are left untouched, so this is safe to re-run.
+
+	bench --site [site] execute planner.planner.ledger.repost
+	"""
+	for dt in [doctype] if doctype else POSTING_RULES:
+		names = frappe.get_all(dt, pluck="name", order_by="creation")
+		for start in range(0, len(names), chunk_size):
+			for name in names[start : start + chunk_size]:
+				on_update(frappe.get_doc(dt, name))
+			frappe.db.commit()
+
+
+@frappe.whitelist()
+@read_from_replica
+def get_trial_balance(from_period: str, to_period: str) -> list[dict]:
+	"""Per-account debit and credit totals for the periods (YYYY-MM) in the given range."""
+	frappe.has_permission("Ledger Period Balance", "report", throw=True)
+	return frappe.db.sql(
+		"""select account, root_type, sum(debit) as debit, sum(credit) as credit,
+			sum(debit) - sum(credit) as balance
+		from `tabLedger Period Balance`
+		where period between %s and %s
+		group by account, root_type
+		order by root_type, account""",
+		(from_period, to_period),
+		as_dict=True,
+	)
+
+
+@frappe.whitelist()
+@read_from_replica
+def get_profit_and_loss(from_period: str, to_period: str) -> dict:
+	"""Income, expense and net profit per period (YYYY-MM) in the given range."""
+	frappe.has_permission("Ledger Period Balance", "report", throw=True)
+	rows = frappe.db.sql(
+		"""select period,
+			sum(case when root_type = 'Income' then credit - debit else 0 end) as income,
+			sum(case when root_type = 'Expense' then debit - credit else 0 end) as expense
+		from `tabLedger Period Balance`
+		where period between %s and %s and root_type in ('Income', 'Expense')
+		group by period
+		order by period""",
+		(from_period, to_period),
+		as_dict=True,
+	)
+	for row in rows:
+		row.net_profit = flt(row.income) - flt(row.expense)
+
+	return {
+		"periods": rows,
+		"income": sum(flt(r.income) for r in rows),
+		"expense": sum(flt(r.expense) for r in rows),
+		"net_profit": sum(r.net_profit for r in rows),
+	}
@@ -0,0 +1,161 @@
+# Copyright (c) 2026, Kebazz Technologies and contributors
+# For license information, please see license.txt
+
+"""
+Cached lookups for planner's master data: Lak Package and Customer Department.
+
+These tables are small and rarely change, so each doctype is cached as a whole
+in two levels:
+
+1. an LRU in the worker process, keyed by site and doctype, and
+2. a snapshot in redis, shared by all workers of the site.
+
+Each doctype has a version number in redis. doc_events bump it after the change
+is committed, and every worker rechecks the version at most once every
+`VERSION_CHECK_SECONDS`. A new version makes the local copy stale. The next
+lookup then reloads the snapshot, and the database is only read when no
+snapshot exists for the new version yet.
+
+Hot paths use the typed accessors (`get_package`, `get_monthly_fee`,
+`get_department`, ...) instead of `frappe.db.get_value`.
+"""
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from threading import Lock
+
+import frappe
+from frappe.utils import flt
+
+VERSION_KEY = "planner:master_data_version"
+SNAPSHOT_KEY = "planner:master_data"
+SNAPSHOT_EXPIRY = 24 * 60 * 60
+VERSION_CHECK_SECONDS = 5
+MAX_LOCAL_ENTRIES = 32
+
+
+@dataclass(frozen=True, slots=True)
+class Package:
+	name: str
+	package_name: str
+	register_fee: float
+	monthly_fee: float
+
+
+@dataclass(frozen=True, slots=True)
+class Department:
+	name: str
+	department_name: str
+
+
+def _load_packages() -> dict[str, Package]:
+	return {
+		row.name: Package(row.name, row.package_name, flt(row.register_fee), flt(row.monthly_fee))
+		for row in frappe.get_all(
+			"Lak Package", fields=["name", "package_name", "register_fee", "monthly_fee"]
+		)
+	}
+
+
+def _load_departments() -> dict[str, Department]:
+	return {
+		row.name: Department(row.name, row.department_name)
+		for row in frappe.get_all("Customer Department", fields=["name", "department_name"])
+	}
+
+
+LOADERS = {
+	"Lak Package": _load_packages,
+	"Customer Department": _load_departments,
+}
+
+# (site, doctype) -> (version, checked_at, records); shared by the threads of a worker.
+_local_cache: OrderedDict[tuple[str, str], tuple[int, float, dict]] = OrderedDict()
+_lock = Lock()
+
+
+def _version_key(doctype: str) -> str:
+	return frappe.cache.make_key(f"{VERSION_KEY}:{doctype}")
+
+
+def get_version(doctype: str) -> int:
+	return int(frappe.cache.get(_version_key(doctype)) or 0)
+
+
+def get_records(doctype: str) -> dict:
+	"""All records of a cached master doctype, by name."""
+	key = (frappe.local.site, doctype)
+	now = time.monotonic()
+
+	with _lock:
+		cached = _local_cache.get(key)
+		if cached:
+			_local_cache.move_to_end(key)
+			if now - cached[1] < VERSION_CHECK_SECONDS:
+				return cached[2]
+
+	version = get_version(doctype)
+	if cached and cached[0] == version:
+		records = cached[2]
+	else:
+		snapshot_key = f"{SNAPSHOT_KEY}:{doctype}:{version}"
+		records = frappe.cache.get_value(snapshot_key)
+		if records is None:
+			records = LOADERS[doctype]()
+			frappe.cache.set_value(snapshot_key, records, expires_in_sec=SNAPSHOT_EXPIRY)
+
+	with _lock:
+		_local_cache[key] = (version, now, records)
+		_local_cache.move_to_end(key)
+		while len(_local_cache) > MAX_LOCAL_ENTRIES:
+			_local_cache.popitem(last=False)
+	return records
+
+
+def get_package(name: str | None) -> Package | None:
+	return get_records("Lak Package").get(name) if name else None
+
+
+def get_packages() -> list[Package]:
+	return list(get_records("Lak Package").values())
+
+
+def get_monthly_fee(package: str | None) -> float:
+	p = get_package(package)
+	return p.monthly_fee if p else 0.0
+
+
+def get_register_fee(package: str | None) -> float:
+	p = get_package(package)
+	return p.register_fee if p else 0.0
+
+
+def get_department(name: str | None) -> Department | None:
+	return get_records("Customer Department").get(name) if name else None
+
+
+def get_departments() -> list[Department]:
+	return list(get_records("Customer Department").values())
+
+
+def invalidate(doc, method=None):
+	"""doc_events handler for Lak Package and Customer Department."""
+	doctype = doc.doctype
+	with _lock:
+		_local_cache.pop((frappe.local.site, doctype), None)
+
+	# Bump only once committed, or another worker could reload the old rows under the new version.
+	frappe.db.after_commit.add(lambda: frappe.cache.incr(_version_key(doctype)))
+
+
+def clear_cache(doctypes=tuple(LOADERS)):
+	"""
+	Drops the cached copies right away, for writes that bypass doc_events such as
+	bulk inserts or rolled back test data.
+	"""
+	with _lock:
+		for doctype in doctypes:
+			_local_cache.pop((frappe.local.site, doctype), None)
+	for doctype in doctypes:
+		frappe.cache.incr(_version_key(doctype))
@@ -0,0 +1,345 @@
+# Copyright (c) 2026, Kebazz Technologies and contributors
+# For license information, please see license.txt
+
+"""
+Month-end close: period locks and immutable Monthly Summary snapshots.
+
+`close_month` locks the month right away. After that, Customer Payments,
+Expenses, ISP Payments and Bank Transactions dated in that month can't be
+created, edited or deleted. A background job then computes the Monthly
+Summary figures and the detailed breakdowns once. It mostly reads the
+incrementally kept tables (Ledger Period Balance, Collection Rollup, Expense
+Account Period Total). The result is stored as a snapshot: a JSON file plus a
+rendered PDF, attached to the Monthly Summary with the JSON's SHA-256.
+`get_month_report` serves a closed month's snapshot as is. An open month is
+computed live, on the read replica when one is configured.
+
+`carry_forward` is the net profit of every month up to and including this one,
+so it depends on all earlier months. `reopen_month` unlocks a single month and
+drops its snapshot, keeping the old files. It also marks the later closed
+months as outdated. Closing the month again re-snapshots those later months as
+well, each as a new snapshot version.
+"""
+
+import hashlib
+import json
+import re
+
+import frappe
+from frappe import _
+from frappe.utils import cint, flt, get_first_day, get_last_day, now_datetime
+from frappe.utils.pdf import get_pdf
+
+from planner.planner.ledger import BANK_CLEARING, CASH, POSTING_RULES, get_period
+from planner.planner.replica import prefer_replica, replica_connection
+
+CLOSED_MONTHS_KEY = "planner:closed_months"
+# Bounds how long a stale cache could leave a closed month open.
+CLOSED_MONTHS_EXPIRY = 5 * 60
+LOCKED_STATUSES = ("Closing", "Closed")
+EVENT = "planner_month_close"
+TEMPLATE = "planner/templates/month_close_report.html"
+
+
+def validate_month(month: str) -> str:
+	if not month or not re.fullmatch(r"\d{4}-(0[1-9]|1[0-2])", month):
+		frappe.throw(_("Month must be given as YYYY-MM, not {0}").format(month))
+	return month
+
+
+def get_closed_months() -> set[str]:
+	months = frappe.cache.get_value(CLOSED_MONTHS_KEY)
+	if months is None:
+		months = frappe.get_all("Monthly Summary", filters={"status": ("in", LOCKED_STATUSES)}, pluck="month")
+		frappe.cache.set_value(CLOSED_MONTHS_KEY, months, expires_in_sec=CLOSED_MONTHS_EXPIRY)
+	return set(months)
+
+
+def clear_closed_months_cache():
+	"""
+	Clears now and again after commit: a request reading between the two would
+	cache the months as they were before this transaction.
+	"""
+	frappe.cache.delete_value(CLOSED_MONTHS_KEY)
+	frappe.db.after_commit.add(lambda: frappe.cache.delete_value(CLOSED_MONTHS_KEY))
+
+
+def validate_period_open(doc, method=None):
+	"""doc_events handler (validate, on_trash): rejects changes dated in a closed month."""
+	if doc.flags.ignore_period_lock:
+		return
+	closed = get_closed_months()
+	if not closed:
+		return
+
+	date_field = POSTING_RULES[doc.doctype][0]
+	dates = {doc.get(date_field)}
+	if before := doc.get_doc_before_save():
+		dates.add(before.get(date_field))
+	for date in filter(None, dates):
+		if (month := get_period(date)) in closed:
+			frappe.throw(
+				_("{0} is closed. {1} dated {2} can't be added, changed or deleted.").format(
+					month, _(doc.doctype), frappe.format(date, "Date")
+				),
+				title=_("Period Closed"),
+			)
+
+
+def get_summary_name(month: str) -> str | None:
+	return frappe.db.get_value("Monthly Summary", {"month": month})
+
+
+@frappe.whitelist(methods=["POST"])
+def close_month(month: str) -> str:
+	"""Locks `month` and queues the computation of its snapshot. Returns the Monthly Summary."""
+	frappe.only_for("System Manager")
+	validate_month(month)
+	if name := get_summary_name(month):
+		doc = frappe.get_doc("Monthly Summary", name, for_update=True)
+		if doc.status in LOCKED_STATUSES:
+			frappe.throw(_("{0} is already closed").format(month))
+	else:
+		doc = frappe.get_doc({"doctype": "Monthly Summary", "month": month})
+
+	doc.status = "Closing"
+	doc.flags.allow_month_close = True
+	doc.save(ignore_permissions=True)
+
+	frappe.enqueue(
+		snapshot_months,
+		queue="long",
+		job_id=f"planner_month_close::{month}",
+		deduplicate=True,
+		enqueue_after_commit=True,
+		month=month,
+	)
+	return doc.name
+
+
+@frappe.whitelist(methods=["POST"])
+def reopen_month(month: str) -> str:
+	"""Unlocks `month`, drops its snapshot and marks the later closed months outdated."""
+	frappe.only_for("System Manager")
+	validate_month(month)
+	name = get_summary_name(month)
+	if not name or frappe.db.get_value("Monthly Summary", name, "status") != "Closed":
+		frappe.throw(_("{0} is not closed").format(month))
+
+	doc = frappe.get_doc("Monthly Summary", name, for_update=True)
+	doc.update(
+		{
+			"status": "Open",
+			"carry_forward_stale": 0,
+			"snapshot_json": None,
+			"snapshot_pdf": None,
+			"snapshot_hash": None,
+		}
+	)
+	doc.flags.allow_month_close = True
+	doc.save(ignore_permissions=True)
+
+	frappe.db.set_value(
+		"Monthly Summary",
+		{"month": (">", month), "status": "Closed"},
+		"carry_forward_stale",
+		1,
+	)
+	return doc.name
+
+
+def snapshot_months(month: str):
+	"""
+	Background job: snapshots `month`, then every later closed month whose
+	carry forward is outdated, oldest first, committing after each.
+	"""
+	user = frappe.session.user
+	try:
+		snapshot_month(month)
+		frappe.db.commit()
+		for later in frappe.get_all(
+			"Monthly Summary",
+			filters={"month": (">", month), "status": "Closed", "carry_forward_stale": 1},
+			pluck="month",
+			order_by="month asc",
+		):
+			snapshot_month(later)
+			frappe.db.commit()
+	except Exception:
+		frappe.db.rollback()
+		frappe.log_error(title=f"Planner: closing {month} failed")
+		# Unlock the month rather than leave it stuck in Closing.
+		if name := get_summary_name(month):
+			doc = frappe.get_doc("Monthly Summary", name)
+			if doc.status == "Closing":
+				doc.status = "Open"
+				doc.flags.allow_month_close = True
+				doc.save(ignore_permissions=True)
+				frappe.db.commit()
+		frappe.publish_realtime(EVENT, {"month": month, "status": "failed"}, user=user)
+		raise
+
+	frappe.publish_realtime(EVENT, {"month": month, "status": "closed"}, user=user)
+
+
+def snapshot_month(month: str):
+	"""Computes the month's report, stores it as a new snapshot version and marks the month Closed."""
+	doc = frappe.get_doc("Monthly Summary", get_summary_name(month), for_update=True)
+	report = get_report(month)
+	version = cint(doc.snapshot_version) + 1
+	report["snapshot"] = {
+		"version": version,
+		"created_on": str(now_datetime()),
+		"created_by": frappe.session.user,
+	}
+
+	content = json.dumps(report, indent=1, sort_keys=True, default=str).encode()
+	base = f"month-close-{month}-v{version}"
+	json_file = save_file(doc.name, f"{base}.json", content)
+	pdf_file = save_file(
+		doc.name, f"{base}.pdf", get_pdf(frappe.render_template(TEMPLATE, {"report": report}))
+	)
+
+	doc.update(report["summary"])
+	doc.update(
+		{
+			"status": "Closed",
+			"carry_forward_stale": 0,
+			"closed_by": frappe.session.user,
+			"closed_on": now_datetime(),
+			"snapshot_version": version,
+			"snapshot_json": json_file,
+			"snapshot_pdf": pdf_file,
+			"snapshot_hash": hashlib.sha256(content).hexdigest(),
+		}
+	)
+	doc.flags.allow_month_close = True
+	doc.save(ignore_permissions=True)
+
+
+def save_file(summary: str, file_name: str, content: bytes) -> str:
+	return (
+		frappe.get_doc(
+			{
+				"doctype": "File",
+				"file_name": file_name,
+				"attached_to_doctype": "Monthly Summary",
+				"attached_to_name": summary,
+				"is_private": 1,
+				"content": content,
+			}
+		)
+		.insert(ignore_permissions=True)
+		.file_url
+	)
+
+
+@frappe.whitelist()
+def get_month_report(month: str) -> dict:
+	"""A closed month's snapshot as stored, or the live figures of an open month."""
+	frappe.has_permission("Monthly Summary", "read", throw=True)
+	validate_month(month)
+	summary = frappe.db.get_value(
+		"Monthly Summary",
+		{"month": month},
+		["name", "status", "snapshot_json", "snapshot_hash", "carry_forward_stale"],
+		as_dict=True,
+	)
+	if summary and summary.status == "Closed" and summary.snapshot_json:
+		file = frappe.get_doc("File", {"file_url": summary.snapshot_json})
+		content = file.get_content()
+		content = content.encode() if isinstance(content, str) else content
+		if hashlib.sha256(content).hexdigest() != summary.snapshot_hash:
+			frappe.throw(_("The snapshot of {0} does not match its recorded hash").format(month))
+		return {**json.loads(content), "live": False, "carry_forward_outdated": summary.carry_forward_stale}
+	# Live figures are read-only and tolerate replica lag; snapshots are computed on the primary.
+	with prefer_replica(), replica_connection():
+		report = get_report(month)
+	return {**report, "live": True}
+
+
+def get_report(month: str) -> dict:
+	"""Monthly Summary figures and breakdowns for `month`."""
+	from_date, to_date = get_first_day(f"{month}-01"), get_last_day(f"{month}-01")
+	collections = frappe.db.sql(
+		"""select payment_type, customer_department, collector, sum(amount) as amount,
+			sum(payments) as payments
+		from `tabCollection Rollup`
+		where date between %s and %s
+		group by payment_type, customer_department, collector
+		order by payment_type, customer_department, collector""",
+		(from_date, to_date),
+		as_dict=True,
+	)
+	profit = get_profit(month)
+	balances = dict(
+		frappe.db.sql(
+			"""select case when account = %(cash)s then 'cash' else 'bank' end, sum(debit - credit)
+			from `tabLedger Period Balance`
+			where period <= %(month)s and (account = %(cash)s or account = %(clearing)s or account like 'Bank - %%')
+			group by 1""",
+			{"month": month, "cash": CASH, "clearing": BANK_CLEARING},
+		)
+	)
+
+	summary = {
+		"month": month,
+		"total_cash_collection": flt(sum(r.amount for r in collections if r.payment_type != "Bank"), 2),
+		"total_bank_collection": flt(sum(r.amount for r in collections if r.payment_type == "Bank"), 2),
+		"cash_in_hand": flt(balances.get("cash"), 2),
+		"bank_balance": flt(balances.get("bank"), 2),
+		"total_expense": profit["expense"],
+		"net_profit": profit["net_profit"],
+		"carry_forward": get_profit(month, cumulative=True)["net_profit"],
+	}
+	return {
+		"summary": summary,
+		"collections": collections,
+		"expenses_by_account": frappe.db.sql(
+			"""select expense_account, amount from `tabExpense Account Period Total`
+			where period = %s and amount != 0
+			order by expense_account""",
+			month,
+			as_dict=True,
+		),
+		"isp_payments": frappe.db.sql(
+			"""select count(*) as payments, ifnull(sum(amount_paid), 0) as amount
+			from `tabISP Payment` where payment_date between %s and %s""",
+			(from_date, to_date),
+			as_dict=True,
+		)[0],
+		"bank_transactions": frappe.db.sql(
+			"""select bank_account, sum(credit) as credit, sum(debit) as debit, count(*) as transactions
+			from `tabBank Transaction`
+			where date between %s and %s
+			group by bank_account
+			order by bank_account""",
+			(from_date, to_date),
+			as_dict=True,
+		),
+		"trial_balance": frappe.db.sql(
+			"""select account, root_type, sum(debit) as debit, sum(credit) as credit
+			from `tabLedger Period Balance`
+			where period = %s
+			group by account, root_type
+			order by root_type, account""",
+			month,
+			as_dict=True,
+		),
+	}
+
+
+def get_profit(month: str, cumulative: bool = False) -> dict:
+	income, expense = frappe.db.sql(
+		"""select
+			ifnull(sum(case when root_type = 'Income' then credit - debit end), 0),
+			ifnull(sum(case when root_type = 'Expense' then debit - credit end), 0)
+		from `tabLedger Period Balance`
+		where period {} %s and root_type in ('Income', 'Expense')""".format("<=" if cumulative else "="),
+		month,
+	)[0]
+	return {
+		"income": flt(income, 2),
+		"expense": flt(expense, 2),
+		"net_profit": flt(flt(income) - flt(expense), 2),
+	}
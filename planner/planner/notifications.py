@@ -0,0 +1,332 @@
+# Copyright (c) 2026, Kebazz Technologies and contributors
+# For license information, please see license.txt
+
+"""
+Customer SMS/WhatsApp notifications through the Notification Outbox.
+
+Events only insert an outbox row, so recording a payment never waits on the
+gateway. `flush_outbox` drains due rows in the background: messages to the
+same customer are merged into one, sending is capped by a per-minute rate
+limit, messages go out in the transport's batch size and failures are
+retried with exponential backoff.
+
+The transport is chosen with `planner_notification_transport` in
+site_config.json (a dotted path to a `NotificationTransport` subclass).
+"""
+
+import json
+import os
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import ClassVar
+
+import frappe
+from frappe import _
+from frappe.utils import add_to_date, cint, fmt_money, formatdate, now_datetime
+
+from planner.planner.master_data import get_monthly_fee
+
+DEFAULT_TRANSPORT = "planner.planner.notifications.FileTransport"
+DEFAULT_CHANNEL = "SMS"
+DEFAULT_RATE_LIMIT = 60  # messages per minute
+
+CLAIM_LIMIT = 500
+MAX_ATTEMPTS = 5
+BACKOFF_SECONDS = 60
+MAX_BACKOFF_SECONDS = 6 * 60 * 60
+STUCK_AFTER_MINUTES = 10
+
+RATE_LIMIT_KEY = "planner:notifications_sent"
+FLUSH_JOB_ID = "planner_flush_notification_outbox"
+
+
+@dataclass
+class OutboundMessage:
+	phone_number: str
+	channel: str
+	body: str
+	outbox_names: list[str] = field(default_factory=list)
+
+
+@dataclass
+class SendResult:
+	ok: bool
+	error: str | None = None
+
+
+class NotificationTransport:
+	"""Sends messages to a gateway. Subclasses implement `send_batch`."""
+
+	# Largest number of messages the gateway accepts per request.
+	batch_size = 50
+
+	def send_batch(self, messages: list[OutboundMessage]) -> list[SendResult]:
+		"""Returns one result per message, in the same order."""
+		raise NotImplementedError
+
+
+class FileTransport(NotificationTransport):
+	"""Appends messages as JSON lines to the site's logs folder instead of sending them."""
+
+	batch_size = 100
+
+	def send_batch(self, messages):
+		path = frappe.get_site_path("logs", "planner_notifications.jsonl")
+		os.makedirs(os.path.dirname(path), exist_ok=True)
+		with open(path, "a") as f:
+			for message in messages:
+				f.write(
+					json.dumps(
+						{
+							"sent_at": str(now_datetime()),
+							"phone_number": message.phone_number,
+							"channel": message.channel,
+							"body": message.body,
+						}
+					)
+					+ "\n"
+				)
+		return [SendResult(ok=True) for _ in messages]
+
+
+class MockTransport(NotificationTransport):
+	"""Keeps sent messages in memory for tests. Numbers in `failing_numbers` fail."""
+
+	batch_size = 10
+	sent: ClassVar[list[OutboundMessage]] = []
+	failing_numbers: ClassVar[set[str]] = set()
+
+	def send_batch(self, messages):
+		results = []
+		for message in messages:
+			if message.phone_number in self.failing_numbers:
+				results.append(SendResult(ok=False, error="Mock failure"))
+			else:
+				self.sent.append(message)
+				results.append(SendResult(ok=True))
+		return results
+
+
+def get_transport() -> NotificationTransport:
+	return frappe.get_attr(frappe.conf.planner_notification_transport or DEFAULT_TRANSPORT)()
+
+
+def queue_payment_receipt(doc, method=None):
+	"""doc_events handler: queues a receipt for a newly recorded Customer Payment."""
+	phone_number = frappe.db.get_value("Customer", doc.customer, "phone_number")
+	if not phone_number:
+		return
+
+	frappe.get_doc(
+		{
+			"doctype": "Notification Outbox",
+			"customer": doc.customer,
+			"phone_number": phone_number,
+			"channel": frappe.conf.planner_notification_channel or DEFAULT_CHANNEL,
+			"message_type": "Payment Receipt",
+			"message": _("Payment of {0} received on {1}. Thank you.").format(
+				fmt_money(doc.amount), formatdate(doc.payment_date)
+			),
+			"reference_doctype": doc.doctype,
+			"reference_name": doc.name,
+		}
+	).insert(ignore_permissions=True)
+
+	# Send soon rather than on the next scheduler tick; one pending job covers any burst.
+	frappe.enqueue(
+		flush_outbox,
+		queue="short",
+		job_id=FLUSH_JOB_ID,
+		deduplicate=True,
+		enqueue_after_commit=True,
+	)
+
+
+def queue_arrears_reminders():
+	"""Monthly scheduler job: queues a reminder for every active customer with arrears."""
+	customers = frappe.get_all(
+		"Customer",
+		filters={"status": "Active", "balance_total": (">", 0), "phone_number": ("is", "set")},
+		fields=["name", "phone_number", "balance_total", "package_assigned"],
+	)
+	if not customers:
+		return
+
+	now = now_datetime()
+	channel = frappe.conf.planner_notification_channel or DEFAULT_CHANNEL
+	fields = [
+		"name",
+		"owner",
+		"creation",
+		"modified",
+		"modified_by",
+		"docstatus",
+		"customer",
+		"phone_number",
+		"channel",
+		"message_type",
+		"message",
+		"status",
+		"attempts",
+	]
+	values = [
+		(
+			frappe.generate_hash(length=10),
+			"Administrator",
+			now,
+			now,
+			"Administrator",
+			0,
+			c.name,
+			c.phone_number,
+			channel,
+			"Arrears Reminder",
+			get_arrears_message(c.balance_total, get_monthly_fee(c.package_assigned)),
+			"Queued",
+			0,
+		)
+		for c in customers
+	]
+	frappe.db.bulk_insert("Notification Outbox", fields, values, chunk_size=5000)
+
+
+def get_arrears_message(balance: float, monthly_fee: float) -> str:
+	if monthly_fee > 0 and balance >= monthly_fee:
+		return _(
+			"Your outstanding balance is {0} ({1} months of your package). "
+			"Please settle it to avoid interruption."
+		).format(fmt_money(balance), int(balance // monthly_fee))
+	return _("Your outstanding balance is {0}. Please settle it to avoid interruption.").format(
+		fmt_money(balance)
+	)
+
+
+def flush_outbox():
+	"""Scheduler job: sends due outbox rows. Safe to run from several workers at once."""
+	transport = get_transport()
+	release_stuck_rows()
+
+	rows = claim_due_rows(CLAIM_LIMIT)
+	if not rows:
+		return
+
+	messages = coalesce(rows)
+	allowed = take_rate_limit(len(messages))
+	if allowed < len(messages):
+		# Over the limit: hand the rest back without counting an attempt.
+		deferred = [name for m in messages[allowed:] for name in m.outbox_names]
+		set_status(deferred, "Queued", next_attempt_at=add_to_date(now_datetime(), minutes=1))
+		messages = messages[:allowed]
+
+	attempts = {row.name: row.attempts for row in rows}
+	for start in range(0, len(messages), transport.batch_size):
+		batch = messages[start : start + transport.batch_size]
+		try:
+			results = transport.send_batch(batch)
+		except Exception as e:
+			frappe.log_error(title="Planner: notification batch failed")
+			results = [SendResult(ok=False, error=str(e))] * len(batch)
+
+		record_results(batch, results, attempts)
+		frappe.db.commit()
+
+
+def release_stuck_rows():
+	"""Requeues rows left in Sending by a worker that died mid-batch."""
+	frappe.db.sql(
+		"""update `tabNotification Outbox` set status = 'Queued'
+		where status = 'Sending' and modified < %s""",
+		add_to_date(now_datetime(), minutes=-STUCK_AFTER_MINUTES),
+	)
+
+
+def claim_due_rows(limit):
+	"""Locks up to `limit` due rows, skipping rows another worker holds, and marks them Sending."""
+	rows = frappe.db.sql(
+		"""select name, customer, phone_number, channel, message, attempts
+		from `tabNotification Outbox`
+		where status = 'Queued' and (next_attempt_at is null or next_attempt_at <= %s)
+		order by creation
+		limit %s
+		for update skip locked""",
+		(now_datetime(), limit),
+		as_dict=True,
+	)
+	if rows:
+		set_status([row.name for row in rows], "Sending")
+	frappe.db.commit()
+	return rows
+
+
+def coalesce(rows) -> list[OutboundMessage]:
+	"""Merges all pending messages for the same customer and channel into one."""
+	grouped = defaultdict(list)
+	for row in rows:
+		grouped[(row.customer or row.phone_number, row.channel)].append(row)
+
+	return [
+		OutboundMessage(
+			phone_number=group[-1].phone_number,
+			channel=channel,
+			body="\n".join(row.message for row in group),
+			outbox_names=[row.name for row in group],
+		)
+		for (_key, channel), group in grouped.items()
+	]
+
+
+def take_rate_limit(wanted: int) -> int:
+	"""Reserves up to `wanted` sends from the current minute's budget and returns how many were granted."""
+	limit = cint(frappe.conf.planner_notification_rate_limit) or DEFAULT_RATE_LIMIT
+	key = frappe.cache.make_key(f"{RATE_LIMIT_KEY}:{now_datetime():%Y%m%d%H%M}")
+	used = frappe.cache.incrby(key, wanted)
+	frappe.cache.expire(key, 120)
+
+	granted = max(0, min(wanted, limit - (used - wanted)))
+	if granted < wanted:
+		frappe.cache.decrby(key, wanted - granted)
+	return granted
+
+
+def record_results(batch, results, attempts):
+	now = now_datetime()
+	sent = [
+		name
+		for message, result in zip(batch, results, strict=True)
+		if result.ok
+		for name in message.outbox_names
+	]
+	if sent:
+		set_status(sent, "Sent", sent_at=now)
+
+	# Rows retried together share their attempt count, so group the updates by it.
+	retries = defaultdict(list)
+	for message, result in zip(batch, results, strict=True):
+		if result.ok:
+			continue
+		for name in message.outbox_names:
+			retries[(attempts[name] + 1, result.error)].append(name)
+
+	for (attempt, error), names in retries.items():
+		if attempt >= MAX_ATTEMPTS:
+			set_status(names, "Failed", attempts=attempt, last_error=error)
+		else:
+			delay = min(BACKOFF_SECONDS * 2 ** (attempt - 1), MAX_BACKOFF_SECONDS)
+			set_status(
+				names,
+				"Queued",
+				attempts=attempt,
+				last_error=error,
+				next_attempt_at=add_to_date(now, seconds=delay),
+			)
+
+
+def set_status(names, status, **values):
+	if not names:
+		return
+	frappe.db.set_value(
+		"Notification Outbox",
+		{"name": ("in", names)},
+		{"status": status, **values},
+		update_modified=True,
+	)
@@ -0,0 +1,226 @@
+# Copyright (c) 2026, Kebazz Technologies and contributors
+# For license information, please see license.txt
+
+"""
+Row-level access for collectors and department managers.
+
+List views go through the `permission_query_conditions` hooks, which return a
+single SQL predicate on indexed columns, so restricting a collector costs one
+index range scan instead of a permission check per row. `has_permission` only
+ever looks at the one document being opened.
+"""
+
+import frappe
+from frappe import _
+from frappe.utils import cstr
+
+COLLECTOR_ROLE = "Collector"
+DEPARTMENT_MANAGER_ROLE = "Department Manager"
+
+# Roles that always see every row, even when combined with a restricted role.
+UNRESTRICTED_ROLES = ("System Manager",)
+
+# Roles that may write the permlevel 1 approval fields (cash submission status, company receipt).
+APPROVER_ROLES = (*UNRESTRICTED_ROLES, DEPARTMENT_MANAGER_ROLE)
+
+DEPARTMENTS_CACHE_KEY = "planner:allowed_departments"
+
+
+def get_restricted_roles(user: str) -> set[str]:
+	"""Returns the restricted planner roles of `user`, or an empty set if they see everything."""
+	if user == "Administrator":
+		return set()
+
+	roles = set(frappe.get_roles(user))
+	if roles.intersection(UNRESTRICTED_ROLES):
+		return set()
+
+	return roles.intersection((COLLECTOR_ROLE, DEPARTMENT_MANAGER_ROLE))
+
+
+def get_allowed_departments(user: str) -> list[str]:
+	"""
+	Customer Departments a department manager may see, taken from their User Permissions.
+
+	Cached in redis per user and memoised on `frappe.local` for the rest of the request;
+	the cache is dropped whenever a User Permission or Customer Department changes.
+	"""
+	if not hasattr(frappe.local, "planner_allowed_departments"):
+		frappe.local.planner_allowed_departments = {}
+
+	local_cache = frappe.local.planner_allowed_departments
+	if user not in local_cache:
+		local_cache[user] = frappe.cache.hget(
+			DEPARTMENTS_CACHE_KEY, user, generator=lambda: _get_allowed_departments(user)
+		)
+	return local_cache[user]
+
+
+def _get_allowed_departments(user: str) -> list[str]:
+	return frappe.get_all(
+		"User Permission",
+		filters={"user": user, "allow": "Customer Department"},
+		pluck="for_value",
+		order_by="for_value",
+	)
+
+
+def clear_department_cache(doc=None, method=None):
+	"""doc_events handler for User Permission and Customer Department."""
+	if doc and doc.doctype == "User Permission" and doc.allow != "Customer Department":
+		return
+
+	frappe.cache.delete_value(DEPARTMENTS_CACHE_KEY)
+	frappe.local.planner_allowed_departments = {}
+
+
+def validate_approval_fields(doc, fieldnames: tuple[str, ...]):
+	"""
+	Rejects changes to `fieldnames` by users without an approver role.
+
+	The fields sit at permlevel 1 so the form shows them read-only to collectors; this
+	covers REST and import writes, which don't apply field levels on insert.
+	"""
+	user = frappe.session.user
+	if doc.flags.ignore_permissions or user == "Administrator":
+		return
+	if set(frappe.get_roles(user)).intersection(APPROVER_ROLES):
+		return
+
+	before = doc.get_doc_before_save()
+	for fieldname in fieldnames:
+		old = before.get(fieldname) if before else doc.meta.get_field(fieldname).default
+		if cstr(doc.get(fieldname)) != cstr(old):
+			frappe.throw(
+				_("Only an approver can change {0}").format(_(doc.meta.get_label(fieldname))),
+				frappe.PermissionError,
+			)
+
+
+def _in_list(column: str, values: list[str]) -> str:
+	return f"{column} in ({', '.join(frappe.db.escape(v) for v in values)})"
+
+
+def _combine(clauses: list[str]) -> str:
+	# A restricted user without any matching rule sees nothing.
+	return "({})".format(" or ".join(clauses)) if clauses else "1=0"
+
+
+def get_customer_conditions(user: str | None = None) -> str:
+	user = user or frappe.session.user
+	roles = get_restricted_roles(user)
+	if not roles:
+		return ""
+
+	if COLLECTOR_ROLE in roles:
+		# Collectors need to pick any customer when recording a payment.
+		return ""
+
+	clauses = []
+	if departments := get_allowed_departments(user):
+		clauses.append(_in_list("`tabCustomer`.`customer_department`", departments))
+
+	return _combine(clauses)
+
+
+def get_customer_payment_conditions(user: str | None = None) -> str:
+	user = user or frappe.session.user
+	roles = get_restricted_roles(user)
+	if not roles:
+		return ""
+
+	clauses = []
+	if COLLECTOR_ROLE in roles:
+		clauses.append(f"`tabCustomer Payment`.`collected_by` = {frappe.db.escape(user)}")
+	if DEPARTMENT_MANAGER_ROLE in roles and (departments := get_allowed_departments(user)):
+		clauses.append(_in_list("`tabCustomer Payment`.`customer_department`", departments))
+
+	return _combine(clauses)
+
+
+def get_staff_cash_submission_conditions(user: str | None = None) -> str:
+	user = user or frappe.session.user
+	roles = get_restricted_roles(user)
+	if not roles:
+		return ""
+
+	clauses = []
+	if COLLECTOR_ROLE in roles:
+		clauses.append(f"`tabStaff Cash Submission`.`staff_user` = {frappe.db.escape(user)}")
+	if DEPARTMENT_MANAGER_ROLE in roles and (departments := get_allowed_departments(user)):
+		clauses.append(_in_list("`tabStaff Cash Submission`.`customer_department`", departments))
+		# Submissions of staff spanning several branches have no branch; they belong
+		# to the departments the staff member holds a User Permission for.
+		clauses.append(
+			"(ifnull(`tabStaff Cash Submission`.`customer_department`, '') = ''"
+			" and `tabStaff Cash Submission`.`staff_user` in (select `user` from `tabUser Permission`"
+			" where `allow` = 'Customer Department' and {}))".format(_in_list("`for_value`", departments))
+		)
+
+	return _combine(clauses)
+
+
+def get_collection_rollup_conditions(user: str | None = None) -> str:
+	user = user or frappe.session.user
+	roles = get_restricted_roles(user)
+	if not roles:
+		return ""
+
+	clauses = []
+	if COLLECTOR_ROLE in roles:
+		clauses.append(f"`tabCollection Rollup`.`collector` = {frappe.db.escape(user)}")
+	if DEPARTMENT_MANAGER_ROLE in roles and (departments := get_allowed_departments(user)):
+		clauses.append(_in_list("`tabCollection Rollup`.`customer_department`", departments))
+
+	return _combine(clauses)
+
+
+def has_customer_permission(doc, ptype=None, user=None) -> bool:
+	user = user or frappe.session.user
+	roles = get_restricted_roles(user)
+	if not roles or COLLECTOR_ROLE in roles:
+		return True
+
+	return doc.customer_department in get_allowed_departments(user)
+
+
+def has_customer_payment_permission(doc, ptype=None, user=None) -> bool:
+	user = user or frappe.session.user
+	roles = get_restricted_roles(user)
+	if not roles:
+		return True
+
+	if COLLECTOR_ROLE in roles and doc.collected_by == user:
+		return True
+
+	if DEPARTMENT_MANAGER_ROLE in roles and doc.customer:
+		department = doc.customer_department or frappe.db.get_value(
+			"Customer", doc.customer, "customer_department"
+		)
+		return department in get_allowed_departments(user)
+
+	return False
+
+
+def has_staff_cash_submission_permission(doc, ptype=None, user=None) -> bool:
+	user = user or frappe.session.user
+	roles = get_restricted_roles(user)
+	if not roles:
+		return True
+
+	if COLLECTOR_ROLE in roles and doc.staff_user == user:
+		return True
+
+	if DEPARTMENT_MANAGER_ROLE in roles and doc.customer_department:
+		return doc.customer_department in get_allowed_departments(user)
+
+	if DEPARTMENT_MANAGER_ROLE in roles and doc.staff_user:
+		departments = get_allowed_departments(user)
+		return bool(departments) and bool(
+			frappe.db.exists(
+				"User Permission",
+				{"user": doc.staff_user, "allow": "Customer Department", "for_value": ("in", departments)},
+			)
+		)
+
+	return False
@@ -0,0 +1,274 @@
+# Copyright (c) 2026, Kebazz Technologies and contributors
+# For license information, please see license.txt
+
+"""
+Realtime collections feed for office dashboards.
+
+Saving a Customer Payment or Staff Cash Submission does no publishing itself.
+After commit it appends a small event to a redis buffer and adds its amounts to
+the day's running totals, both in one pipelined round trip. The first event of a
+window also queues `flush_feed`.
+
+The flush waits for the rest of the window (`planner_feed_window_ms`, default
+1000), drains the buffer and sends one `planner_collections` message per room:
+
+- each collector, to their user room, and
+- each department, to the Customer Department document room.
+
+Every message carries the room's running totals, so dashboards don't need to
+query. A burst of hundreds of payments becomes one publish per room per window.
+`get_feed_totals` returns the current totals for a dashboard's first render.
+`flush_stale_feed` runs with the scheduler and flushes anything left behind.
+"""
+
+import json
+import time
+from collections import defaultdict
+
+import frappe
+import redis
+from frappe.utils import cint, flt, getdate, nowdate
+
+from planner.planner.permissions import (
+	COLLECTOR_ROLE,
+	DEPARTMENT_MANAGER_ROLE,
+	get_allowed_departments,
+	get_restricted_roles,
+)
+
+EVENT = "planner_collections"
+BUFFER_KEY = "planner:feed_buffer"
+FLUSH_FLAG_KEY = "planner:feed_flush_queued"
+TOTALS_KEY = "planner:feed_totals"
+FLUSH_JOB_ID = "planner_flush_collections_feed"
+
+DEFAULT_WINDOW_MS = 1000
+# A crashed flush must not keep new events from queueing another one.
+FLAG_EXPIRY = 60
+TOTALS_EXPIRY = 3 * 24 * 60 * 60
+
+
+def get_window() -> float:
+	return (cint(frappe.conf.planner_feed_window_ms) or DEFAULT_WINDOW_MS) / 1000
+
+
+def get_scopes(user: str | None, department: str | None) -> list[str]:
+	return (
+		["all"]
+		+ ([f"collector:{user}"] if user else [])
+		+ ([f"department:{department}"] if department else [])
+	)
+
+
+def get_payment_totals(doc) -> dict[tuple[str, str], float]:
+	"""(day, "scope:metric") -> value that `doc` contributes to the running totals."""
+	if not doc or not doc.payment_date:
+		return {}
+	day = str(getdate(doc.payment_date))
+	metric = "bank" if doc.payment_type == "Bank" else "cash"
+	totals = {}
+	for scope in get_scopes(doc.collected_by, doc.customer_department):
+		totals[(day, f"{scope}:{metric}")] = flt(doc.amount)
+		totals[(day, f"{scope}:payments")] = 1
+	return totals
+
+
+def get_submission_totals(doc) -> dict[tuple[str, str], float]:
+	if not doc or not doc.submit_date or doc.status == "Rejected":
+		return {}
+	day = str(getdate(doc.submit_date))
+	totals = {}
+	for scope in get_scopes(doc.staff_user, doc.customer_department):
+		totals[(day, f"{scope}:submitted_cash")] = flt(doc.amount_cash)
+		totals[(day, f"{scope}:submitted_bank")] = flt(doc.amount_bank)
+	return totals
+
+
+def get_deltas(before: dict, after: dict) -> dict:
+	deltas = defaultdict(float)
+	for key, value in before.items():
+		deltas[key] -= value
+	for key, value in after.items():
+		deltas[key] += value
+	return {key: value for key, value in deltas.items() if value}
+
+
+def make_event(doc, action: str) -> dict:
+	if doc.doctype == "Customer Payment":
+		fields = ("customer", "amount", "payment_type", "payment_date")
+		user = doc.collected_by
+	else:
+		fields = ("status", "amount_cash", "amount_bank", "submit_date")
+		user = doc.staff_user
+	return {
+		"doctype": doc.doctype,
+		"name": doc.name,
+		"action": action,
+		"user": user,
+		"department": doc.customer_department,
+		**{f: doc.get(f) for f in fields},
+	}
+
+
+def on_update(doc, method=None):
+	"""doc_events handler for Customer Payment and Staff Cash Submission."""
+	get_totals = get_payment_totals if doc.doctype == "Customer Payment" else get_submission_totals
+	before = doc.get_doc_before_save()
+	queue_event(
+		make_event(doc, "update" if before else "insert"),
+		get_deltas(get_totals(before), get_totals(doc)),
+	)
+
+
+def on_trash(doc, method=None):
+	get_totals = get_payment_totals if doc.doctype == "Customer Payment" else get_submission_totals
+	queue_event(make_event(doc, "delete"), get_deltas(get_totals(doc), {}))
+
+
+def queue_event(event: dict, deltas: dict):
+	# Only committed changes reach the feed and the totals.
+	frappe.db.after_commit.add(lambda: push_event(event, deltas))
+
+
+def push_event(event: dict, deltas: dict):
+	cache = frappe.cache
+	pipe = cache.pipeline(transaction=False)
+	pipe.rpush(cache.make_key(BUFFER_KEY), json.dumps(event, default=str))
+	for (day, field), value in deltas.items():
+		key = cache.make_key(f"{TOTALS_KEY}:{day}")
+		pipe.hincrbyfloat(key, field, value)
+		pipe.expire(key, TOTALS_EXPIRY)
+	pipe.execute()
+
+	# Only the first event of a window queues the flush. Each window gets its own
+	# job id: the previous window's flush may still be running once it has
+	# cleared the flag, and deduplicating against it would drop this one.
+	queued_at = time.time()
+	if cache.set(cache.make_key(FLUSH_FLAG_KEY), queued_at, nx=True, ex=FLAG_EXPIRY):
+		frappe.enqueue(flush_feed, queue="short", job_id=f"{FLUSH_JOB_ID}::{queued_at:.6f}")
+
+
+def flush_feed():
+	"""Background job: publishes everything buffered during the window, one message per room."""
+	cache = frappe.cache
+	flag_key = cache.make_key(FLUSH_FLAG_KEY)
+	window = get_window()
+	if queued_at := cache.get(flag_key):
+		time.sleep(max(0.0, min(window, float(queued_at) + window - time.time())))
+
+	# Events arriving from here on queue the next flush.
+	cache.delete(flag_key)
+	pipe = cache.pipeline(transaction=True)
+	pipe.lrange(cache.make_key(BUFFER_KEY), 0, -1)
+	pipe.delete(cache.make_key(BUFFER_KEY))
+	raw, _deleted = pipe.execute()
+	if raw:
+		publish_events([json.loads(e) for e in raw])
+
+
+def flush_stale_feed():
+	"""
+	Scheduler job: flushes events left in the buffer with no flush queued, e.g.
+	after a flush job failed and traffic stopped before the flag expired.
+	"""
+	cache = frappe.cache
+	# Raw commands: the wrapper's llen/exists would prefix the keys a second time.
+	pipe = cache.pipeline(transaction=False)
+	pipe.llen(cache.make_key(BUFFER_KEY))
+	pipe.exists(cache.make_key(FLUSH_FLAG_KEY))
+	buffered, flush_queued = pipe.execute()
+	if buffered and not flush_queued:
+		flush_feed()
+
+
+def publish_events(events: list[dict]):
+	by_collector, by_department = defaultdict(list), defaultdict(list)
+	days = set()
+	for event in events:
+		if event.get("user"):
+			by_collector[event["user"]].append(event)
+		if event.get("department"):
+			by_department[event["department"]].append(event)
+		days.add(str(getdate(event.get("payment_date") or event.get("submit_date") or nowdate())))
+
+	totals = {day: get_day_totals(day) for day in days}
+
+	for user, user_events in by_collector.items():
+		frappe.publish_realtime(
+			EVENT,
+			{"events": user_events, "totals": scope_totals(totals, f"collector:{user}")},
+			user=user,
+		)
+	for department, department_events in by_department.items():
+		frappe.publish_realtime(
+			EVENT,
+			{"events": department_events, "totals": scope_totals(totals, f"department:{department}")},
+			doctype="Customer Department",
+			docname=department,
+		)
+
+
+def get_day_totals(day: str) -> dict[str, dict[str, float]]:
+	"""scope -> metric -> value for the day."""
+	totals = defaultdict(dict)
+	# The totals are plain redis floats, not pickled values: bypass RedisWrapper.hgetall.
+	key = frappe.cache.make_key(f"{TOTALS_KEY}:{day}")
+	for field, value in redis.Redis.hgetall(frappe.cache, key).items():
+		scope, metric = frappe.safe_decode(field).rsplit(":", 1)
+		totals[scope][metric] = flt(frappe.safe_decode(value))
+	return totals
+
+
+def scope_totals(totals: dict, scope: str) -> dict[str, dict[str, float]]:
+	return {day: day_totals.get(scope, {}) for day, day_totals in totals.items()}
+
+
+@frappe.whitelist()
+def get_feed_totals(day: str | None = None) -> dict[str, dict[str, float]]:
+	"""The day's running totals for the scopes the user may see."""
+	frappe.has_permission("Customer Payment", "read", throw=True)
+	totals = get_day_totals(str(getdate(day or nowdate())))
+	user = frappe.session.user
+	roles = get_restricted_roles(user)
+	if not roles:
+		return totals
+
+	visible = {}
+	if COLLECTOR_ROLE in roles:
+		visible[f"collector:{user}"] = totals.get(f"collector:{user}", {})
+	if DEPARTMENT_MANAGER_ROLE in roles:
+		for department in get_allowed_departments(user):
+			visible[f"department:{department}"] = totals.get(f"department:{department}", {})
+	return visible
+
+
+def rebuild_totals(day: str | None = None):
+	"""
+	Recomputes a day's running totals from the database, e.g. after redis was flushed.
+
+	bench --site [site] execute planner.planner.realtime.rebuild_totals --kwargs "{'day': '2026-01-31'}"
+	"""
+	day = str(getdate(day or nowdate()))
+	totals = defaultdict(float)
+	for doc in frappe.get_all(
+		"Customer Payment",
+		filters={"payment_date": day},
+		fields=["collected_by", "customer_department", "payment_type", "payment_date", "amount"],
+	):
+		for key, value in get_payment_totals(doc).items():
+			totals[key[1]] += value
+	for doc in frappe.get_all(
+		"Staff Cash Submission",
+		filters={"submit_date": day},
+		fields=["staff_user", "customer_department", "status", "submit_date", "amount_cash", "amount_bank"],
+	):
+		for key, value in get_submission_totals(doc).items():
+			totals[key[1]] += value
+
+	key = frappe.cache.make_key(f"{TOTALS_KEY}:{day}")
+	pipe = frappe.cache.pipeline(transaction=True)
+	pipe.delete(key)
+	if totals:
+		pipe.hset(key, mapping=totals)
+		pipe.expire(key, TOTALS_EXPIRY)
+	pipe.execute()
@@ -0,0 +1,118 @@
+# Copyright (c) 2026, Kebazz Technologies and contributors
+# For license information, please see license.txt
+
+"""
+Routes planner's heavy read-only queries to the read replica.
+
+Uses the replica Frappe already knows about (`read_from_replica`, `replica_host`
+and `replica_db_port` in site_config.json). Queries only go there when
+
+- the site opted in with `planner_read_from_replica` in site_config.json,
+- the code path opted in, either through `@read_from_replica` or by setting
+  `frappe.local.planner_read_from_replica` (see `prefer_replica`), and
+- the replica is less than `planner_replica_max_lag` seconds behind (default 30).
+
+Otherwise everything transparently stays on the primary. Code that reads rows
+it has just written (e.g. the verify scripts after a seed) must not opt in.
+"""
+
+import functools
+from contextlib import contextmanager
+
+import frappe
+
+FLAG = "planner_read_from_replica"
+LAG_CACHE_KEY = "planner:replica_lag"
+LAG_CACHE_SECONDS = 10
+DEFAULT_MAX_LAG = 30
+
+
+def replica_configured() -> bool:
+	return bool(
+		frappe.conf.planner_read_from_replica and frappe.conf.read_from_replica and frappe.conf.replica_host
+	)
+
+
+def replica_requested() -> bool:
+	return bool(getattr(frappe.local, FLAG, False))
+
+
+def get_replica_lag() -> float | None:
+	"""
+	Seconds the replica is behind the primary, or None when replication is broken
+	or the status can't be read. Cached in redis so the status query runs at most
+	once every few seconds per site.
+	"""
+	cached = frappe.cache.get_value(LAG_CACHE_KEY)
+	if cached is not None:
+		return cached.get("lag")
+
+	lag = None
+	try:
+		with _swapped_connection():
+			status = frappe.db.sql("show slave status", as_dict=True)
+			if status:
+				lag = status[0].get("Seconds_Behind_Master")
+	except Exception:
+		frappe.log_error(title="Planner: could not read replica status")
+
+	frappe.cache.set_value(LAG_CACHE_KEY, {"lag": lag}, expires_in_sec=LAG_CACHE_SECONDS)
+	return lag
+
+
+def replica_healthy() -> bool:
+	lag = get_replica_lag()
+	return lag is not None and lag <= (frappe.conf.planner_replica_max_lag or DEFAULT_MAX_LAG)
+
+
+@contextmanager
+def _swapped_connection():
+	"""Points `frappe.db` at the replica for the block, mirroring `frappe.read_only`."""
+	if hasattr(frappe.local, "primary_db"):
+		# Already on the replica further up the stack.
+		yield
+		return
+
+	frappe.connect_replica()
+	try:
+		yield
+	finally:
+		frappe.local.db.close()
+		frappe.local.db = frappe.local.primary_db
+		del frappe.local.primary_db
+		del frappe.local.replica_db
+
+
+@contextmanager
+def replica_connection():
+	"""Runs the block on the replica when requested and healthy, else on the primary."""
+	if replica_requested() and replica_configured() and replica_healthy():
+		with _swapped_connection():
+			yield
+	else:
+		yield
+
+
+@contextmanager
+def prefer_replica():
+	"""Opts the block into replica reads by setting the `frappe.local` flag."""
+	previous = getattr(frappe.local, FLAG, False)
+	setattr(frappe.local, FLAG, True)
+	try:
+		yield
+	finally:
+		setattr(frappe.local, FLAG, previous)
+
+
+def read_from_replica(fn):
+	"""
+	Decorator for read-only report and dashboard endpoints. The wrapped function
+	must not write: the replica connection rejects writes.
+	"""
+
+	@functools.wraps(fn)
+	def wrapper(*args, **kwargs):
+		with prefer_replica(), replica_connection():
+			return fn(*args, **kwargs)
+
+	return wrapper
@@ -0,0 +1,375 @@
+# Copyright (c) 2026, Kebazz Technologies and contributors
+# For license information, please see license.txt
+
+"""
+Package changes with effective-dated subscription periods and prorated charges.
+
+Every customer has at most one open Customer Subscription Period (no `to_date`)
+holding their package and the monthly fee they pay. Monthly fees are billed in
+advance for the calendar month. Moving to another package or fee partway
+through a month therefore charges the fee difference for the days left in that
+month, including the effective date:
+
+	(new fee - old fee) * days left / days in month
+
+A negative amount is a credit. The register fee of the new package can be
+charged as well. Charges are recorded as Subscription Charges and added to
+`Customer.balance_total`.
+
+`change_package` handles a single customer. `migrate_package` moves or
+reprices every customer on a package in batches. Each batch closes and opens
+the periods, inserts the charges and adjusts the balances with a handful of
+statements, instead of saving every customer. Its preview mode computes the
+totals in one query and writes nothing.
+"""
+
+from calendar import monthrange
+
+import frappe
+from frappe import _
+from frappe.utils import add_days, cint, flt, getdate, now_datetime, nowdate
+
+from planner.planner.master_data import get_package
+
+BATCH_SIZE = 1000
+
+PERIOD_FIELDS = (
+	"name",
+	"owner",
+	"creation",
+	"modified",
+	"modified_by",
+	"docstatus",
+	"customer",
+	"package",
+	"monthly_fee",
+	"from_date",
+	"reason",
+	"batch",
+)
+CHARGE_FIELDS = (
+	"name",
+	"owner",
+	"creation",
+	"modified",
+	"modified_by",
+	"docstatus",
+	"customer",
+	"posting_date",
+	"charge_type",
+	"amount",
+	"subscription_period",
+	"description",
+	"batch",
+)
+
+
+def get_remaining_ratio(date) -> float:
+	"""Share of the month still to come on `date`, counting that day."""
+	date = getdate(date)
+	days_in_month = monthrange(date.year, date.month)[1]
+	return (days_in_month - date.day + 1) / days_in_month
+
+
+def get_proration(old_fee: float, new_fee: float, effective_date) -> float:
+	return flt((flt(new_fee) - flt(old_fee)) * get_remaining_ratio(effective_date), 2)
+
+
+def get_open_period(customer: str):
+	periods = frappe.get_all(
+		"Customer Subscription Period",
+		filters={"customer": customer, "to_date": ("is", "not set")},
+		fields=["name", "package", "monthly_fee", "from_date"],
+		order_by="from_date desc",
+		limit=1,
+	)
+	return periods[0] if periods else None
+
+
+def start_subscription(customer: str, package: str, from_date, reason: str = "New") -> str:
+	"""Opens the customer's first period without charging anything."""
+	p = get_package(package)
+	return (
+		frappe.get_doc(
+			{
+				"doctype": "Customer Subscription Period",
+				"customer": customer,
+				"package": package,
+				"monthly_fee": p.monthly_fee if p else 0,
+				"from_date": getdate(from_date),
+				"reason": reason,
+			}
+		)
+		.insert(ignore_permissions=True)
+		.name
+	)
+
+
+@frappe.whitelist()
+def change_package(
+	customer: str,
+	package: str,
+	effective_date: str | None = None,
+	charge_register_fee: bool | int = False,
+	preview: bool | int = False,
+) -> dict:
+	"""Moves a customer to `package` from `effective_date` (default today) and posts the prorated charge."""
+	frappe.has_permission("Customer", "write", customer, throw=True)
+	effective_date = getdate(effective_date or nowdate())
+	new = get_package(package)
+	if not new:
+		frappe.throw(_("Lak Package {0} not found").format(package))
+
+	current = get_open_period(customer)
+	if current and current.package == package:
+		frappe.throw(_("Customer {0} is already on {1}").format(customer, package))
+	if current and getdate(current.from_date) > effective_date:
+		frappe.throw(_("The change must take effect on or after {0}").format(current.from_date))
+
+	old_fee = current.monthly_fee if current else 0
+	charges = []
+	if proration := get_proration(old_fee, new.monthly_fee, effective_date):
+		charges.append(
+			{
+				"charge_type": "Proration",
+				"amount": proration,
+				"description": _("{0} to {1} from {2}").format(
+					current.package if current else _("no package"), package, effective_date
+				),
+			}
+		)
+	if cint(charge_register_fee) and new.register_fee:
+		charges.append(
+			{
+				"charge_type": "Registration",
+				"amount": new.register_fee,
+				"description": _("Registration for {0}").format(package),
+			}
+		)
+
+	summary = {"customer": customer, "charges": charges, "total": flt(sum(c["amount"] for c in charges), 2)}
+	if cint(preview):
+		return summary
+
+	if current:
+		close_periods([current], effective_date)
+	period = start_subscription(customer, package, effective_date, reason="Package Change")
+	post_charges(
+		[{"customer": customer, "subscription_period": period, **charge} for charge in charges],
+		effective_date,
+	)
+	# Runs from Customer.on_update too, so leave `modified` alone: the form's next save would be rejected.
+	frappe.db.set_value("Customer", customer, "package_assigned", package, update_modified=False)
+	return summary
+
+
+@frappe.whitelist()
+def migrate_package(
+	package: str,
+	effective_date: str | None = None,
+	new_package: str | None = None,
+	new_monthly_fee: float | None = None,
+	preview: bool | int = True,
+) -> dict:
+	"""
+	Moves every customer on `package` to `new_package`, or reprices `package` to
+	`new_monthly_fee`, from `effective_date`. Previews by default; otherwise the
+	migration runs in the background.
+	"""
+	frappe.only_for("System Manager")
+	effective_date = getdate(effective_date or nowdate())
+	target = new_package or package
+	if not get_package(target):
+		frappe.throw(_("Lak Package {0} not found").format(target))
+	new_fee = flt(new_monthly_fee) if new_monthly_fee not in (None, "") else get_package(target).monthly_fee
+
+	if cint(preview):
+		return preview_migration(package, target, new_fee, effective_date)
+
+	frappe.enqueue(
+		apply_migration,
+		queue="long",
+		timeout=4 * 60 * 60,
+		job_id=f"planner_migrate_package::{package}",
+		deduplicate=True,
+		package=package,
+		target=target,
+		new_fee=new_fee,
+		effective_date=str(effective_date),
+	)
+	return {"queued": True}
+
+
+def preview_migration(package: str, target: str, new_fee: float, effective_date) -> dict:
+	# The ratio depends on the date each period takes the change from, so compute it per row in SQL.
+	customers, total, lowest, highest = frappe.db.sql(
+		"""select count(*), sum(charge), min(charge), max(charge) from (
+			select round((%(fee)s - monthly_fee) * (day(last_day(d)) - day(d) + 1) / day(last_day(d)), 2) as charge
+			from (
+				select monthly_fee, greatest(from_date, %(date)s) as d
+				from `tabCustomer Subscription Period`
+				where package = %(package)s and to_date is null
+					and (monthly_fee != %(fee)s or package != %(target)s)
+			) periods
+		) charges""",
+		{"package": package, "target": target, "fee": new_fee, "date": effective_date},
+	)[0]
+	return {
+		"package": package,
+		"new_package": target,
+		"new_monthly_fee": new_fee,
+		"effective_date": str(effective_date),
+		"customers": cint(customers),
+		"total_charge": flt(total, 2),
+		"smallest_charge": flt(lowest, 2),
+		"largest_charge": flt(highest, 2),
+	}
+
+
+def apply_migration(package: str, target: str, new_fee: float, effective_date: str):
+	"""Background job: migrates the open periods of `package` in batches, committing after each."""
+	effective_date = getdate(effective_date)
+	batch = frappe.generate_hash(length=10)
+	reason = "Repricing" if target == package else "Migration"
+
+	while True:
+		# Migrated periods no longer match, so each pass picks up the next batch.
+		periods = frappe.db.sql(
+			"""select name, customer, package, monthly_fee, from_date
+			from `tabCustomer Subscription Period`
+			where package = %(package)s and to_date is null
+				and (monthly_fee != %(fee)s or package != %(target)s)
+			order by customer
+			limit %(limit)s
+			for update""",
+			{"package": package, "target": target, "fee": new_fee, "limit": BATCH_SIZE},
+			as_dict=True,
+		)
+		if not periods:
+			break
+
+		close_periods(periods, effective_date)
+		opened = open_periods(
+			[(p.customer, max(getdate(p.from_date), effective_date)) for p in periods],
+			target,
+			new_fee,
+			reason,
+			batch,
+		)
+		post_charges(
+			[
+				{
+					"customer": p.customer,
+					"subscription_period": opened[p.customer],
+					"charge_type": "Proration",
+					"amount": get_proration(
+						p.monthly_fee, new_fee, max(getdate(p.from_date), effective_date)
+					),
+					"description": _("{0} to {1} at {2} from {3}").format(
+						p.package, target, new_fee, effective_date
+					),
+				}
+				for p in periods
+			],
+			effective_date,
+			batch,
+		)
+		if target != package:
+			frappe.db.set_value(
+				"Customer",
+				{"name": ("in", [p.customer for p in periods])},
+				"package_assigned",
+				target,
+				update_modified=True,
+			)
+		frappe.db.commit()
+
+	if target == package and get_package(package).monthly_fee != new_fee:
+		# Saved as a document so the master data cache is invalidated.
+		doc = frappe.get_doc("Lak Package", package)
+		doc.monthly_fee = new_fee
+		doc.save(ignore_permissions=True)
+		frappe.db.commit()
+
+
+def close_periods(periods: list, effective_date):
+	"""Ends the periods the day before `effective_date`; periods starting on or after it are dropped."""
+	ending = [p.name for p in periods if getdate(p.from_date) < effective_date]
+	replaced = [p.name for p in periods if getdate(p.from_date) >= effective_date]
+	if ending:
+		frappe.db.set_value(
+			"Customer Subscription Period",
+			{"name": ("in", ending)},
+			"to_date",
+			add_days(effective_date, -1),
+		)
+	if replaced:
+		frappe.db.delete("Customer Subscription Period", {"name": ("in", replaced)})
+
+
+def open_periods(starts: list[tuple[str, object]], package: str, fee: float, reason: str, batch: str) -> dict:
+	"""Opens one period per (customer, from_date) and returns their names by customer."""
+	now = now_datetime()
+	user = frappe.session.user
+	rows = [
+		(
+			frappe.generate_hash(length=10),
+			user,
+			now,
+			now,
+			user,
+			0,
+			customer,
+			package,
+			fee,
+			from_date,
+			reason,
+			batch,
+		)
+		for customer, from_date in starts
+	]
+	frappe.db.bulk_insert("Customer Subscription Period", PERIOD_FIELDS, rows)
+	return {row[6]: row[0] for row in rows}
+
+
+def post_charges(charges: list[dict], posting_date, batch: str | None = None):
+	"""Inserts the charges and adds them to the customers' balances, in one statement each."""
+	charges = [c for c in charges if c["amount"]]
+	if not charges:
+		return
+
+	now = now_datetime()
+	user = frappe.session.user
+	frappe.db.bulk_insert(
+		"Subscription Charge",
+		CHARGE_FIELDS,
+		[
+			(
+				frappe.generate_hash(length=10),
+				user,
+				now,
+				now,
+				user,
+				0,
+				c["customer"],
+				posting_date,
+				c["charge_type"],
+				c["amount"],
+				c.get("subscription_period"),
+				c.get("description"),
+				batch,
+			)
+			for c in charges
+		],
+	)
+
+	deltas = {}
+	for c in charges:
+		deltas[c["customer"]] = flt(deltas.get(c["customer"], 0) + c["amount"], 2)
+	values = [v for customer, amount in deltas.items() for v in (customer, amount)]
+	frappe.db.sql(
+		"""update `tabCustomer`
+		set balance_total = ifnull(balance_total, 0) + case name {} end
+		where name in %s""".format(" ".join(["when %s then %s"] * len(deltas))),
+		[*values, tuple(deltas)],
+	)
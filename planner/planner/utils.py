@@ -0,0 +1,41 @@
+# Copyright (c) 2026, Kebazz Technologies and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.utils import now_datetime
+
+
+def upsert_increments(doctype: str, rows: list[dict], increment_fields: list[str]):
+	"""
+	Inserts `rows` into `doctype` in one statement. Rows whose `name` already
+	exists get their `increment_fields` added onto the stored values instead.
+
+	Used for the incrementally maintained aggregate tables, whose names are
+	derived from their key (e.g. "2026-01:Cash").
+	"""
+	if not rows:
+		return
+
+	now = now_datetime()
+	user = frappe.session.user
+	columns = [*rows[0], "creation", "modified", "owner", "modified_by", "docstatus"]
+	values = []
+	for row in rows:
+		values.extend([*(row[c] for c in rows[0]), now, now, user, user, 0])
+
+	table = f"`tab{doctype}`"
+	placeholders = ", ".join(["({})".format(", ".join(["%s"] * len(columns)))] * len(rows))
+
+	if frappe.db.db_type == "postgres":
+		updates = ", ".join(f"`{f}` = {table}.`{f}` + excluded.`{f}`" for f in increment_fields)
+		conflict = f"on conflict (name) do update set {updates}, `modified` = excluded.`modified`"
+	else:
+		updates = ", ".join(f"`{f}` = `{f}` + values(`{f}`)" for f in increment_fields)
+		conflict = f"on duplicate key update {updates}, `modified` = values(`modified`)"
+
+	frappe.db.sql(
+		"insert into {} ({}) values {} {}".format(
+			table, ", ".join(f"`{c}`" for c in columns), placeholders, conflict
+		),
+		values,
+	)
@@ -0,0 +1,179 @@
+import random
+import time
+from datetime import datetime, timedelta
+
+import frappe
+
+from planner.planner.permissions import COLLECTOR_ROLE
+
+# ANSI Colors
+GREEN = "\033[92m"
+YELLOW = "\033[93m"
+RED = "\033[91m"
+BLUE = "\033[94m"
+RESET = "\033[0m"
+
+# --- Configuration ---
+NAME_PREFIX = "BENCH-PAY-"
+CUSTOMER_NAME = "Benchmark Customer"
+COLLECTOR_EMAIL = "bench-collector-{}@planner.test"
+
+
+def log(msg, color=BLUE):
+	"""Prints a colored message to the console."""
+	print(f"{color}{msg}{RESET}")
+
+
+def ensure_collectors(count):
+	"""Creates `count` users holding only the Collector role."""
+	users = []
+	for i in range(count):
+		email = COLLECTOR_EMAIL.format(i)
+		if not frappe.db.exists("User", email):
+			user = frappe.get_doc(
+				{
+					"doctype": "User",
+					"email": email,
+					"first_name": f"Bench Collector {i}",
+					"send_welcome_email": 0,
+					"roles": [{"role": COLLECTOR_ROLE}],
+				}
+			)
+			user.insert(ignore_permissions=True)
+		users.append(email)
+	return users
+
+
+def ensure_customer():
+	if not frappe.db.exists("Customer", CUSTOMER_NAME):
+		frappe.get_doc({"doctype": "Customer", "customer_name": CUSTOMER_NAME}).insert(
+			ignore_permissions=True
+		)
+	return CUSTOMER_NAME
+
+
+def insert_payments(rows, collectors, customer, chunk_size):
+	"""Bulk inserts synthetic payments until `rows` benchmark rows exist."""
+	existing = frappe.db.count("Customer Payment", {"name": ("like", f"{NAME_PREFIX}%")})
+	if existing >= rows:
+		log(f"  ⏩ {existing} benchmark payments already exist", YELLOW)
+		return
+
+	fields = [
+		"name",
+		"owner",
+		"creation",
+		"modified",
+		"modified_by",
+		"docstatus",
+		"customer",
+		"payment_date",
+		"amount",
+		"payment_type",
+		"collected_by",
+		"company_received",
+	]
+	start = datetime.now() - timedelta(days=365)
+	rng = random.Random(existing)
+
+	for offset in range(existing, rows, chunk_size):
+		values = []
+		for i in range(offset, min(offset + chunk_size, rows)):
+			ts = start + timedelta(seconds=rng.randrange(365 * 86400))
+			values.append(
+				(
+					f"{NAME_PREFIX}{i:09d}",
+					"Administrator",
+					ts,
+					ts,
+					"Administrator",
+					0,
+					customer,
+					ts.date(),
+					rng.choice((1500, 2500, 4000)),
+					rng.choice(("Cash", "Bank")),
+					rng.choice(collectors),
+					rng.randint(0, 1),
+				)
+			)
+		frappe.db.bulk_insert("Customer Payment", fields, values, ignore_duplicates=True)
+		frappe.db.commit()
+		log(f"  ✅ Inserted {min(offset + chunk_size, rows)} / {rows}", GREEN)
+
+
+def time_list_view(user, repeats):
+	"""Times the queries the desk list view issues: one page of rows and the total count."""
+	frappe.set_user(user)
+	try:
+		query = frappe.get_list(
+			"Customer Payment",
+			fields=["name", "customer", "amount", "payment_date", "modified"],
+			order_by="`tabCustomer Payment`.`modified` desc",
+			limit_page_length=20,
+			run=False,
+		)
+		plan = frappe.db.sql(f"explain {query}", as_dict=True)
+
+		page_times, count_times = [], []
+		for _ in range(repeats):
+			t = time.perf_counter()
+			frappe.get_list(
+				"Customer Payment",
+				fields=["name", "customer", "amount", "payment_date", "modified"],
+				order_by="`tabCustomer Payment`.`modified` desc",
+				limit_page_length=20,
+			)
+			page_times.append(time.perf_counter() - t)
+
+			t = time.perf_counter()
+			frappe.get_list("Customer Payment", fields=["count(*) as count"], limit_page_length=0)
+			count_times.append(time.perf_counter() - t)
+	finally:
+		frappe.set_user("Administrator")
+
+	return plan, sorted(page_times), sorted(count_times)
+
+
+def cleanup_payments():
+	frappe.db.delete("Customer Payment", {"name": ("like", f"{NAME_PREFIX}%")})
+	frappe.db.commit()
+	log("🧹 Benchmark payments deleted.", YELLOW)
+
+
+def run(rows=1_000_000, collectors=50, chunk_size=10_000, repeats=20, cleanup=False):
+	"""
+	Entry point for the `bench execute` command, e.g.
+
+	    bench --site [site] execute planner.scripts.benchmark_permissions.run --kwargs "{'rows': 2000000}"
+
+	Fills Customer Payment with `rows` synthetic rows spread over `collectors`
+	Collector users, then times the list view as one of them and prints the
+	query plan, which should use the (collected_by, modified) index.
+	"""
+	log("=" * 50)
+	log(f"Benchmarking collector list views over {rows} payments...", BLUE)
+
+	users = ensure_collectors(collectors)
+	customer = ensure_customer()
+	frappe.db.commit()
+	insert_payments(rows, users, customer, chunk_size)
+
+	plan, page_times, count_times = time_list_view(users[0], repeats)
+
+	log("\n--- Query Plan ---", BLUE)
+	for row in plan:
+		log(
+			f"  table={row.get('table')} type={row.get('type')} key={row.get('key')} rows={row.get('rows')} extra={row.get('Extra')}",
+			BLUE,
+		)
+
+	def ms(values, q):
+		return round(values[min(int(len(values) * q), len(values) - 1)] * 1000, 2)
+
+	log("\n--- List View Timings ---", BLUE)
+	log(f"  Page of 20: p50 {ms(page_times, 0.5)} ms, p95 {ms(page_times, 0.95)} ms", GREEN)
+	log(f"  Row count:  p50 {ms(count_times, 0.5)} ms, p95 {ms(count_times, 0.95)} ms", GREEN)
+
+	if cleanup:
+		cleanup_payments()
+	log("=" * 50)
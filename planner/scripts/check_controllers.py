@@ -0,0 +1,321 @@
+import ast
+import hashlib
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+import frappe
+
+# ANSI Colors
+GREEN = "\033[92m"
+YELLOW = "\033[93m"
+RED = "\033[91m"
+BLUE = "\033[94m"
+RESET = "\033[0m"
+
+# --- Configuration ---
+APP_NAME = "planner"
+CACHE_FILE = ".planner_controller_cache.json"
+CACHE_VERSION = 1
+
+# Hooks that Frappe only calls on submittable doctypes.
+SUBMIT_HOOKS = (
+	"before_submit",
+	"on_submit",
+	"before_cancel",
+	"on_cancel",
+	"before_update_after_submit",
+	"on_update_after_submit",
+)
+
+# Child table rows are saved through their parent, so their own lifecycle hooks never run.
+CHILD_TABLE_HOOKS = (
+	"before_insert",
+	"after_insert",
+	"validate",
+	"before_save",
+	"on_update",
+	"on_trash",
+	"after_delete",
+	*SUBMIT_HOOKS,
+)
+
+
+def log(msg, color=BLUE):
+	"""Prints a colored message to the console."""
+	print(f"{color}{msg}{RESET}")
+
+
+def safe(name: str) -> str:
+	"""Convert doctype name to folder/file safe name"""
+	return name.lower().replace(" ", "_")
+
+
+def pascal_case(name: str) -> str:
+	"""Convert doctype name to PascalCase for class names"""
+	return "".join(word.capitalize() for word in name.replace("_", " ").split())
+
+
+def file_stat(path):
+	"""Returns the (mtime_ns, size) pair used to decide whether a cached entry is stale."""
+	try:
+		st = os.stat(path)
+	except FileNotFoundError:
+		return None
+	return [st.st_mtime_ns, st.st_size]
+
+
+def analyze_controller(doctype_name, py_path, json_path):
+	"""
+	Parses one controller and its DocType JSON. Runs inside the process pool,
+	so it must stay a plain module-level function without Frappe access.
+	"""
+	result = {"doctype": doctype_name, "sha256": None, "meta": {}, "classes": [], "error": None}
+
+	if os.path.exists(json_path):
+		try:
+			with open(json_path) as f:
+				spec = json.load(f)
+			result["meta"] = {
+				"is_submittable": bool(spec.get("is_submittable")),
+				"istable": bool(spec.get("istable")),
+			}
+		except ValueError as e:
+			result["error"] = f"Invalid JSON: {e}"
+
+	with open(py_path, "rb") as f:
+		source = f.read()
+	result["sha256"] = hashlib.sha256(source).hexdigest()
+
+	try:
+		tree = ast.parse(source, filename=py_path)
+	except SyntaxError as e:
+		result["error"] = f"Syntax error on line {e.lineno}: {e.msg}"
+		return result
+
+	for node in tree.body:
+		if not isinstance(node, ast.ClassDef):
+			continue
+		result["classes"].append(
+			{
+				"name": node.name,
+				"lineno": node.lineno,
+				"col_offset": node.col_offset,
+				"bases": [ast.unparse(base) for base in node.bases],
+				"methods": [
+					item.name
+					for item in node.body
+					if isinstance(item, ast.FunctionDef | ast.AsyncFunctionDef)
+				],
+			}
+		)
+
+	return result
+
+
+def find_controller_class(result, expected):
+	"""Picks the controller class out of a parsed file, preferring the expected name."""
+	classes = result["classes"]
+	for cls in classes:
+		if cls["name"] == expected:
+			return cls
+	for cls in classes:
+		if any(base.split(".")[-1] in ("Document", "NestedSet") for base in cls["bases"]):
+			return cls
+	return classes[0] if classes else None
+
+
+def dead_hooks(result, cls):
+	"""Returns (method, reason) pairs for hooks Frappe will never call on this doctype."""
+	meta = result["meta"]
+	findings = []
+	for method in cls["methods"]:
+		if meta.get("istable") and method in CHILD_TABLE_HOOKS:
+			findings.append((method, "child table rows do not run their own hooks"))
+		elif method in SUBMIT_HOOKS and not meta.get("is_submittable"):
+			findings.append((method, "doctype is not submittable"))
+	return findings
+
+
+def load_cache(cache_path):
+	if not cache_path or not os.path.exists(cache_path):
+		return {}
+	try:
+		with open(cache_path) as f:
+			cache = json.load(f)
+	except ValueError:
+		return {}
+	if cache.get("version") != CACHE_VERSION:
+		return {}
+	return cache.get("entries", {})
+
+
+def save_cache(cache_path, entries):
+	if not cache_path:
+		return
+	tmp_path = cache_path + ".tmp"
+	with open(tmp_path, "w") as f:
+		json.dump({"version": CACHE_VERSION, "entries": entries}, f, sort_keys=True)
+	os.replace(tmp_path, cache_path)
+
+
+def analyze(app_path, doctypes, cache_path=None, max_workers=None):
+	"""
+	Analyzes the controllers of `doctypes`, returning one report per doctype.
+
+	Only files whose (mtime, size) changed since the cached run are read; those are
+	parsed in a process pool. An unchanged tree costs two `stat` calls per doctype.
+	"""
+	entries = load_cache(cache_path)
+	reports, stale = {}, []
+
+	for doctype_name in doctypes:
+		safe_name = safe(doctype_name)
+		folder = os.path.join(app_path, APP_NAME, "doctype", safe_name)
+		py_path = os.path.join(folder, f"{safe_name}.py")
+		json_path = os.path.join(folder, f"{safe_name}.json")
+
+		py_stat = file_stat(py_path)
+		if py_stat is None:
+			entries.pop(doctype_name, None)
+			continue
+
+		stats = [py_stat, file_stat(json_path)]
+		entry = entries.get(doctype_name)
+		if entry and entry["stats"] == stats:
+			reports[doctype_name] = dict(entry["result"], py_path=py_path)
+		else:
+			stale.append((doctype_name, py_path, json_path, stats))
+
+	if len(stale) > 1:
+		with ProcessPoolExecutor(max_workers=max_workers or min(len(stale), os.cpu_count() or 1)) as pool:
+			results = list(pool.map(analyze_controller, *zip(*[s[:3] for s in stale], strict=True)))
+	else:
+		results = [analyze_controller(*s[:3]) for s in stale]
+
+	for (doctype_name, py_path, _json_path, stats), result in zip(stale, results, strict=True):
+		result["py_path"] = py_path
+		entries[doctype_name] = {"stats": stats, "result": result}
+		reports[doctype_name] = result
+
+	if stale:
+		save_cache(cache_path, entries)
+
+	return [reports[name] for name in doctypes if name in reports]
+
+
+def rename_class(result, cls, new_name):
+	"""
+	Renames only the class definition node of `cls`, leaving any other
+	occurrence of the old name (comments, strings, other classes) untouched.
+	"""
+	py_path = result["py_path"]
+	with open(py_path, "rb") as f:
+		source = f.read()
+
+	if hashlib.sha256(source).hexdigest() != result["sha256"]:
+		raise RuntimeError(f"{py_path} changed since it was analyzed, re-run the check")
+
+	lines = source.decode("utf-8").splitlines(keepends=True)
+	line = lines[cls["lineno"] - 1]
+	col = cls["col_offset"]
+	pattern = re.compile(r"class\s+" + re.escape(cls["name"]) + r"\b")
+	match = pattern.match(line, col)
+	if not match:
+		raise RuntimeError(
+			f"Class definition for {cls['name']} not found on line {cls['lineno']} of {py_path}"
+		)
+
+	lines[cls["lineno"] - 1] = (
+		line[:col] + match.group(0).replace(cls["name"], new_name) + line[match.end() :]
+	)
+	with open(py_path, "w") as f:
+		f.write("".join(lines))
+
+
+def check(fix=False):
+	"""
+	Runs the analysis for every doctype in doctypes.json and logs the findings.
+	With `fix=True` misnamed controller classes are renamed in place.
+
+	Returns a dict of doctype name lists keyed by outcome.
+	"""
+	summary = {"fixed": [], "correct": [], "mismatched": [], "errors": [], "dead_hooks": []}
+
+	try:
+		app_path = frappe.get_app_path(APP_NAME)
+		cfg_path = os.path.join(app_path, "doctypes.json")
+	except frappe.exceptions.DoesNotExistError:
+		log(f"❌ App '{APP_NAME}' not found.", RED)
+		return summary
+
+	if not os.path.exists(cfg_path):
+		log(f"❌ doctypes.json not found in the '{APP_NAME}' app directory.", RED)
+		return summary
+
+	with open(cfg_path) as f:
+		config = json.load(f)
+
+	reports = analyze(app_path, config.get("order", []), cache_path=frappe.get_site_path(CACHE_FILE))
+
+	for result in reports:
+		doctype_name = result["doctype"]
+		correct_class_name = pascal_case(doctype_name)
+
+		if result["error"]:
+			log(f"  ❌ Error processing {doctype_name}: {result['error']}", RED)
+			summary["errors"].append(doctype_name)
+			continue
+
+		cls = find_controller_class(result, correct_class_name)
+		if not cls:
+			log(f"  ⚠️  Could not find class definition in: {doctype_name}. Skipping.", YELLOW)
+			summary["errors"].append(doctype_name)
+			continue
+
+		findings = dead_hooks(result, cls)
+		for method, reason in findings:
+			log(f"  ⚠️  {doctype_name}: {cls['name']}.{method} will never fire ({reason})", YELLOW)
+		if findings:
+			summary["dead_hooks"].append(doctype_name)
+
+		if cls["name"] == correct_class_name:
+			log(f"  ✅  Correct: {doctype_name} (Class: {cls['name']})", GREEN)
+			summary["correct"].append(doctype_name)
+		elif not fix:
+			log(
+				f"  ❌ Mismatch: {doctype_name} (Found: {cls['name']} -> Expected: {correct_class_name})", RED
+			)
+			summary["mismatched"].append(doctype_name)
+		else:
+			log(
+				f"  🔧 Fixing: {doctype_name} (Incorrect: {cls['name']} -> Correct: {correct_class_name})",
+				YELLOW,
+			)
+			try:
+				rename_class(result, cls, correct_class_name)
+				summary["fixed"].append(doctype_name)
+			except Exception as e:
+				log(f"  ❌ Error processing {doctype_name}: {e}", RED)
+				summary["errors"].append(doctype_name)
+
+	return summary
+
+
+def run():
+	"""Entry point for the `bench execute` command. Reports without modifying any file."""
+	log("=" * 50)
+	log(f"🔎 Checking controllers for app: {APP_NAME}...", BLUE)
+
+	summary = check(fix=False)
+
+	log("\n🔎 Controller Check Summary:")
+	log(f"  Correct: {len(summary['correct'])}", GREEN)
+	log(f"  Misnamed: {len(summary['mismatched'])}", RED)
+	log(f"  Dead Hooks: {len(summary['dead_hooks'])}", YELLOW)
+	log(f"  Errors/Skipped: {len(summary['errors'])}", RED)
+	if summary["mismatched"]:
+		log("\n  Suggestion: Run the PascalCase fix to rename the misnamed classes.", BLUE)
+		log("  `bench --site [your_site_name] execute planner.scripts.fix_pascal_case.run`", BLUE)
+	log("=" * 50)
@@ -1,13 +1,9 @@
 import frappe
 import os
 
-# Import the main 'run' function from each of our stable scripts
-from .scaffold_doctypes import run as scaffold
-from .fix_pascal_case import run as fix_pascal_case
-from .load_doctypes import run as load
-from .seed_data import run as seed
-from .verify_doctypes import run as verify_doctypes
-from .verify_data import run as verify_data
+# Every action goes through the pipeline runner, which can also be used
+# non-interactively: `bench --site [site] execute planner.scripts.pipeline.run`
+from .pipeline import run as run_pipeline
 
 # ANSI Colors for logging
 BLUE = "\033[94m"
@@ -51,43 +47,35 @@ def run():
             log("Action: Scaffold DocTypes")
             force_input = input("Force overwrite existing files? (y/n): ").lower()
             force = force_input == 'y'
-            scaffold(force=force)
+            run_pipeline(steps=["scaffold"], force=True, scaffold_force=force)
             
         elif choice == '2':
             log("Action: Load DocTypes")
             log("Running PascalCase check before loading...")
-            fix_pascal_case()
-            log("Proceeding with loading DocTypes...")
-            load()
+            run_pipeline(steps=["fix_pascal_case", "load"], force=True)
 
         elif choice == '3':
             log("Action: Seed Data")
-            seed()
+            run_pipeline(steps=["seed"], force=True)
 
         elif choice == '4':
             log("Action: Run Full Setup")
             force_input = input("Force overwrite existing files during scaffold? (y/n): ").lower()
             force = force_input == 'y'
-            scaffold(force=force)
-            
-            log("Running PascalCase check before loading...")
-            fix_pascal_case()
-            log("Proceeding with loading DocTypes...")
-            load()
-            
-            seed()
+            # Unlike the single actions, the full setup skips steps whose inputs are unchanged.
+            run_pipeline(steps=["scaffold", "fix_pascal_case", "load", "seed"], scaffold_force=force)
 
         elif choice == '5':
             log("Action: Fix PascalCase")
-            fix_pascal_case()
+            run_pipeline(steps=["fix_pascal_case"], force=True)
 
         elif choice == '6':
             log("Action: Verify DocTypes")
-            verify_doctypes()
+            run_pipeline(steps=["verify_doctypes"])
 
         elif choice == '7':
             log("Action: Verify Seed Data")
-            verify_data()
+            run_pipeline(steps=["verify_data"])
 
         elif choice == '0':
             log("Exiting Manager.")
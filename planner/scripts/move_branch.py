@@ -0,0 +1,161 @@
+import os
+
+import frappe
+from frappe.database import get_db
+from frappe.installer import update_site_config
+
+from planner.planner.branches import get_branch_sites
+
+# ANSI Colors
+GREEN = "\033[92m"
+YELLOW = "\033[93m"
+RED = "\033[91m"
+BLUE = "\033[94m"
+RESET = "\033[0m"
+
+# (doctype, condition selecting the branch's rows); parents before children so links resolve.
+BRANCH_TABLES = [
+	("Customer Department", "name = %(branch)s"),
+	("Lak Package", "1 = 1"),
+	("Customer", "customer_department = %(branch)s"),
+	(
+		"Customer Status Log",
+		"customer in (select name from `tabCustomer` where customer_department = %(branch)s)",
+	),
+	(
+		"Customer Subscription Period",
+		"customer in (select name from `tabCustomer` where customer_department = %(branch)s)",
+	),
+	(
+		"Subscription Charge",
+		"customer in (select name from `tabCustomer` where customer_department = %(branch)s)",
+	),
+	("Voucher", "customer_department = %(branch)s"),
+	("Customer Payment", "customer_department = %(branch)s"),
+	("Collection Rollup", "customer_department = %(branch)s"),
+	("Staff Cash Submission", "customer_department = %(branch)s"),
+	(
+		"Staff Cash Submission Item",
+		"parenttype = 'Staff Cash Submission' and parent in"
+		" (select name from `tabStaff Cash Submission` where customer_department = %(branch)s)",
+	),
+]
+
+# Shared masters stay on this site as well.
+SHARED_TABLES = ("Customer Department", "Lak Package")
+
+
+def log(msg, color=BLUE):
+	"""Prints a colored message to the console."""
+	print(f"{color}{msg}{RESET}")
+
+
+def connect_target(site):
+	"""Opens a connection to another site of this bench."""
+	site_path = os.path.join(frappe.local.sites_path, site)
+	if not os.path.exists(os.path.join(site_path, "site_config.json")):
+		frappe.throw(f"Site {site} does not exist in this bench")
+
+	conf = frappe.get_site_config(sites_path=frappe.local.sites_path, site_path=site_path)
+	db = get_db(
+		host=conf.db_host or frappe.conf.db_host,
+		port=conf.db_port or frappe.conf.db_port,
+		user=conf.db_user or conf.db_name,
+		password=conf.db_password,
+		cur_db_name=conf.db_name,
+	)
+	db.connect()
+	return db
+
+
+def copy_table(target, doctype, condition, branch, chunk_size):
+	"""Copies the selected rows in name order, one multi-row insert per chunk. Rows already there are kept."""
+	columns = [c for c in frappe.db.get_table_columns(doctype) if c in set(target.get_table_columns(doctype))]
+	column_list = ", ".join(f"`{c}`" for c in columns)
+	insert = "insert ignore" if target.db_type == "mariadb" else "insert"
+	conflict = "" if target.db_type == "mariadb" else " on conflict (name) do nothing"
+
+	copied, last = 0, ""
+	while True:
+		rows = frappe.db.sql(
+			f"""select {column_list} from `tab{doctype}`
+            where ({condition}) and name > %(last)s
+            order by name limit %(limit)s""",
+			{"branch": branch, "last": last, "limit": chunk_size},
+			as_list=True,
+		)
+		if not rows:
+			break
+
+		placeholders = ", ".join(["({})".format(", ".join(["%s"] * len(columns)))] * len(rows))
+		target.sql(
+			f"{insert} into `tab{doctype}` ({column_list}) values {placeholders}{conflict}",
+			[value for row in rows for value in row],
+		)
+		target.commit()
+		copied += len(rows)
+		last = rows[-1][columns.index("name")]
+
+	return copied
+
+
+def purge_table(doctype, condition, branch, chunk_size):
+	deleted = 0
+	while True:
+		names = frappe.db.sql_list(
+			f"select name from `tab{doctype}` where {condition} limit %(limit)s",
+			{"branch": branch, "limit": chunk_size},
+		)
+		if not names:
+			return deleted
+		frappe.db.sql(f"delete from `tab{doctype}` where name in %(names)s", {"names": tuple(names)})
+		frappe.db.commit()
+		deleted += len(names)
+
+
+def run(branch, target_site, purge=False, chunk_size=2000):
+	"""
+	Moves a branch (Customer Department) with its customers, payments, vouchers and cash
+	submissions to another site on this bench, and registers it in `planner_branch_sites`
+	so consolidated branch reports read it from there. The target site must have planner
+	installed and the branch's staff users. The company ledger stays on this site.
+
+	bench --site [site] execute planner.scripts.move_branch.run --kwargs "{'branch': 'Regional Office - Kandy', 'target_site': 'kandy.example.com'}"
+
+	Pass 'purge': True to delete the copied rows here afterwards.
+	"""
+	if not frappe.db.exists("Customer Department", branch):
+		log(f"❌ Customer Department '{branch}' not found.", RED)
+		return
+	if target_site == frappe.local.site:
+		log("❌ The target site is this site.", RED)
+		return
+
+	target = connect_target(target_site)
+	try:
+		if not target.table_exists("Customer Payment"):
+			log(f"❌ planner is not installed on {target_site}.", RED)
+			return
+
+		log(f"Copying branch '{branch}' to {target_site}...", BLUE)
+		for doctype, condition in BRANCH_TABLES:
+			copied = copy_table(target, doctype, condition, branch, chunk_size)
+			log(f"  ✅ {doctype}: {copied} rows", GREEN)
+	finally:
+		target.close()
+
+	update_site_config("planner_branch_sites", {**get_branch_sites(), branch: target_site})
+	log(f"  ✅ Registered '{branch}' under planner_branch_sites", GREEN)
+
+	if purge:
+		log(f"Purging branch '{branch}' from {frappe.local.site}...", BLUE)
+		# Children first, so the parent conditions still match while deleting.
+		for doctype, condition in reversed(BRANCH_TABLES):
+			if doctype in SHARED_TABLES:
+				continue
+			deleted = purge_table(doctype, condition, branch, chunk_size)
+			log(f"  ✅ {doctype}: {deleted} rows deleted", GREEN)
+	else:
+		log("  ⏩ Rows kept on this site; run again with purge to remove them.", YELLOW)
+
+	log("🎉 Branch moved.", GREEN)
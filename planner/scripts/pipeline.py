@@ -0,0 +1,309 @@
+import glob
+import hashlib
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+import frappe
+
+# ANSI Colors
+GREEN = "\033[92m"
+YELLOW = "\033[93m"
+RED = "\033[91m"
+BLUE = "\033[94m"
+RESET = "\033[0m"
+
+# --- Configuration ---
+APP_NAME = "planner"
+STATE_FILE = ".planner_pipeline.json"
+REPORT_FILE = "planner_pipeline_report.json"
+
+
+@dataclass(frozen=True)
+class Step:
+	"""A pipeline step. `inputs` are globs relative to the app path whose stats make up its fingerprint."""
+
+	name: str
+	method: str
+	deps: tuple = ()
+	inputs: tuple = ()
+	needs_db: bool = True
+	cacheable: bool = True
+
+
+STEPS = {
+	step.name: step
+	for step in (
+		Step(
+			"scaffold",
+			"planner.scripts.scaffold_doctypes.run",
+			inputs=("doctypes.json", "planner/doctype/*/*.json", "planner/doctype/*/*.py"),
+			needs_db=False,
+		),
+		Step(
+			"fix_pascal_case",
+			"planner.scripts.fix_pascal_case.run",
+			deps=("scaffold",),
+			inputs=("planner/doctype/*/*.py", "planner/doctype/*/*.json"),
+			needs_db=False,
+		),
+		Step(
+			"load",
+			"planner.scripts.load_doctypes.run",
+			deps=("fix_pascal_case",),
+			inputs=("doctypes.json", "planner/doctype/*/*.json"),
+		),
+		Step("seed", "planner.scripts.seed_data.run", deps=("load",), inputs=("scripts/seed_data.py",)),
+		Step("verify_doctypes", "planner.scripts.verify_doctypes.run", deps=("load",), cacheable=False),
+		Step("verify_data", "planner.scripts.verify_data.run", deps=("seed",), cacheable=False),
+	)
+}
+
+
+def log(msg, color=BLUE):
+	"""Prints a colored message to the console."""
+	print(f"{color}{msg}{RESET}")
+
+
+@contextmanager
+def site_context(site, sites_path, connect=True):
+	"""Initializes Frappe for `site` on the current thread, committing on success."""
+	frappe.init(site=site, sites_path=sites_path)
+	try:
+		if connect:
+			frappe.connect()
+		yield
+		if connect:
+			frappe.db.commit()
+	except Exception:
+		if connect and frappe.db:
+			frappe.db.rollback()
+		raise
+	finally:
+		frappe.destroy()
+
+
+def load_state(path):
+	if not os.path.exists(path):
+		return {}
+	try:
+		with open(path) as f:
+			return json.load(f)
+	except ValueError:
+		return {}
+
+
+def save_state(path, state):
+	tmp_path = path + ".tmp"
+	with open(tmp_path, "w") as f:
+		json.dump(state, f, indent=1, sort_keys=True)
+	os.replace(tmp_path, path)
+
+
+def get_state_path(sites_path, site=None):
+	"""App-level steps keep their state in one file for the bench, database steps in one per site."""
+	return os.path.join(sites_path, site, STATE_FILE) if site else os.path.join(sites_path, STATE_FILE)
+
+
+def fingerprint(step, app_path, kwargs, dep_fingerprints):
+	"""
+	Hashes the stats (not contents) of the step's input files together with its
+	arguments and the fingerprints of its dependencies, so an upstream change
+	invalidates everything downstream of it.
+	"""
+	h = hashlib.sha256()
+	h.update(step.name.encode())
+	h.update(json.dumps(kwargs, sort_keys=True, default=str).encode())
+	for dep in step.deps:
+		h.update(str(dep_fingerprints.get(dep)).encode())
+	for pattern in step.inputs:
+		for path in sorted(glob.glob(os.path.join(app_path, pattern))):
+			st = os.stat(path)
+			h.update(f"{os.path.relpath(path, app_path)}:{st.st_mtime_ns}:{st.st_size}".encode())
+	return h.hexdigest()
+
+
+def run_step(step, site, sites_path, kwargs):
+	"""Runs a single step in its own Frappe context. Executed on a worker thread."""
+	with site_context(site, sites_path, connect=step.needs_db):
+		frappe.get_attr(step.method)(**kwargs)
+
+
+def run_steps(steps, site, sites_path, force=False, step_kwargs=None, max_workers=4, app_level=False):
+	"""
+	Runs `steps` for one site, starting every step as soon as its dependencies
+	are done. Dependencies outside `steps` are treated as already satisfied.
+	With `app_level`, the steps' state is kept in the bench-level state file.
+
+	Returns a list of report rows, one per step.
+	"""
+	step_kwargs = step_kwargs or {}
+	app_path = frappe.get_app_path(APP_NAME)
+	state_path = get_state_path(sites_path, None if app_level else site)
+	state = load_state(state_path)
+	# Database steps depend on app-level steps, whose fingerprints are shared by all sites.
+	fingerprints = {**state, **load_state(get_state_path(sites_path))}
+
+	pending = {name: STEPS[name] for name in steps}
+	done, failed, report = set(), set(), []
+
+	with ThreadPoolExecutor(max_workers=max_workers) as pool:
+		running = {}
+
+		def is_ready(step):
+			busy = pending.keys() | {s.name for s, _, _ in running.values()}
+			return not any(dep in busy for dep in step.deps)
+
+		while pending or running:
+			for name, step in list(pending.items()):
+				if any(dep in failed for dep in step.deps):
+					failed.add(name)
+					del pending[name]
+					report.append({"site": site, "step": name, "status": "blocked", "seconds": 0})
+					log(f"⏩ [{site}] {name}: blocked by a failed dependency", YELLOW)
+					continue
+				if not is_ready(step):
+					continue
+
+				del pending[name]
+				kwargs = step_kwargs.get(name, {})
+				fp = fingerprint(step, app_path, kwargs, fingerprints)
+				if step.cacheable and not force and state.get(name) == fp:
+					done.add(name)
+					report.append({"site": site, "step": name, "status": "skipped", "seconds": 0})
+					log(f"⏩ [{site}] {name}: unchanged, skipping", YELLOW)
+					continue
+
+				log(f"▶️  [{site}] {name}: starting", BLUE)
+				future = pool.submit(run_step, step, site, sites_path, kwargs)
+				running[future] = (step, kwargs, time.monotonic())
+
+			if not running:
+				if pending:
+					# Nothing running and nothing ready means the remaining steps were just blocked.
+					continue
+				break
+
+			finished, _ = wait(running, return_when=FIRST_COMPLETED)
+			for future in finished:
+				step, kwargs, started = running.pop(future)
+				seconds = round(time.monotonic() - started, 3)
+				try:
+					future.result()
+				except Exception as e:
+					failed.add(step.name)
+					state.pop(step.name, None)
+					report.append(
+						{
+							"site": site,
+							"step": step.name,
+							"status": "failed",
+							"seconds": seconds,
+							"error": str(e),
+						}
+					)
+					log(f"❌ [{site}] {step.name}: failed after {seconds}s: {e}", RED)
+					continue
+
+				done.add(step.name)
+				# Fingerprint after the run, since steps like scaffold create their own inputs.
+				fingerprints[step.name] = fingerprint(step, app_path, kwargs, fingerprints)
+				if step.cacheable:
+					state[step.name] = fingerprints[step.name]
+				report.append({"site": site, "step": step.name, "status": "ran", "seconds": seconds})
+				log(f"✅ [{site}] {step.name}: done in {seconds}s", GREEN)
+
+	save_state(state_path, state)
+	return report
+
+
+def run_site(site, sites_path, steps, force=False, step_kwargs=None, max_workers=4):
+	"""Process pool entry point for running the database steps of one site."""
+	frappe.init(site=site, sites_path=sites_path)
+	try:
+		return run_steps(
+			steps, site, sites_path, force=force, step_kwargs=step_kwargs, max_workers=max_workers
+		)
+	finally:
+		frappe.destroy()
+
+
+def write_report(report, sites_path, sites):
+	"""Writes the per-step timing report into each site's logs folder and prints it."""
+	log("\n--- Pipeline Timing Report ---", BLUE)
+	for row in report:
+		color = {"ran": GREEN, "skipped": YELLOW}.get(row["status"], RED)
+		log(f"  {row['site']:<30} {row['step']:<18} {row['status']:<8} {row['seconds']:>8}s", color)
+
+	for site in sites:
+		logs_path = os.path.join(sites_path, site, "logs")
+		os.makedirs(logs_path, exist_ok=True)
+		with open(os.path.join(logs_path, REPORT_FILE), "w") as f:
+			json.dump([row for row in report if row["site"] in (site, "*")], f, indent=1)
+
+
+def run(steps=None, sites=None, force=False, scaffold_force=False, max_workers=4):
+	"""
+	Entry point for the `bench execute` command. Runs without any prompt, e.g.
+
+	    bench --site site1 execute planner.scripts.pipeline.run --kwargs "{'sites': ['site1', 'site2']}"
+
+	App-level steps (scaffold, PascalCase fix) run once; database steps run for
+	every site, with sites processed in parallel. Steps whose fingerprint is
+	unchanged since their last successful run are skipped unless `force` is set.
+	"""
+	steps = list(steps or STEPS)
+	unknown = [name for name in steps if name not in STEPS]
+	if unknown:
+		log(f"❌ Unknown steps: {unknown}. Available: {list(STEPS)}", RED)
+		return []
+
+	site = frappe.local.site
+	sites_path = os.path.abspath(frappe.local.sites_path)
+	sites = list(sites or [site])
+	step_kwargs = {"scaffold": {"force": scaffold_force}} if scaffold_force else {}
+
+	app_steps = [name for name in steps if not STEPS[name].needs_db]
+	db_steps = [name for name in steps if STEPS[name].needs_db]
+
+	log("=" * 50)
+	log(f"Running planner pipeline on {sites}: {steps}", BLUE)
+
+	# App-level steps touch files shared by all sites, so they run once here.
+	report = [
+		dict(row, site="*")
+		for row in run_steps(
+			app_steps,
+			site,
+			sites_path,
+			force=force,
+			step_kwargs=step_kwargs,
+			max_workers=max_workers,
+			app_level=True,
+		)
+	]
+	if any(row["status"] in ("failed", "blocked") for row in report):
+		db_steps = []
+		log("❌ App-level steps failed, skipping database steps.", RED)
+
+	if db_steps and len(sites) == 1:
+		report += run_steps(db_steps, sites[0], sites_path, force=force, max_workers=max_workers)
+	elif db_steps:
+		# Spawn rather than fork so the children don't inherit this process's DB connection.
+		with ProcessPoolExecutor(
+			max_workers=len(sites), mp_context=multiprocessing.get_context("spawn")
+		) as pool:
+			futures = [
+				pool.submit(run_site, s, sites_path, db_steps, force=force, max_workers=max_workers)
+				for s in sites
+			]
+			for future in futures:
+				report += future.result()
+
+	write_report(report, sites_path, sites)
+	log("=" * 50)
+	return report
@@ -10,6 +10,9 @@ APP_NAME = "planner"
 APP_MODULE = "Planner" 
 COMPANY_NAME = "YOUR COMPANY / NAME"
 
+# Optional DocType properties copied as-is from doctypes.json when set
+EXTRA_KEYS = ("istable", "is_tree", "nsm_parent_field", "issingle", "is_submittable", "track_changes", "title_field", "in_create")
+
 def log(msg, color=BLUE, logfile=None):
     print(f"{color}{msg}{RESET}")
     if logfile:
@@ -109,7 +112,8 @@ class Test{pascal_case(name)}(IntegrationTestCase):
                 "autoname": doctype_config.get("autoname"),
                 "sort_field": "modified", "sort_order": "DESC", "states": []
             }
-            if doctype_config.get("istable"): spec["istable"] = 1
+            for key in EXTRA_KEYS:
+                if key in doctype_config: spec[key] = doctype_config[key]
             write_file(paths["json"], json.dumps(spec, indent=1, sort_keys=True), dry_run)
             created["json"].append(name)
             log(f"  ✅ Created {os.path.basename(paths['json'])}", GREEN)
@@ -0,0 +1,464 @@
+import csv
+import gzip
+import hashlib
+import hmac
+import importlib.util
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import frappe
+from frappe.installer import update_site_config
+from frappe.utils import add_to_date, cint, now_datetime, scrub
+
+from planner.planner.branches import run_on_site
+from planner.planner.export import Column, ParquetWriter
+from planner.planner.replica import DEFAULT_MAX_LAG, replica_configured
+
+# ANSI Colors
+GREEN = "\033[92m"
+YELLOW = "\033[93m"
+RED = "\033[91m"
+BLUE = "\033[94m"
+RESET = "\033[0m"
+
+CHUNK_SIZE = 5000
+DEFAULT_WORKERS = 4
+# Secret HMAC key used when masking, kept in the source site's site_config.json.
+MASK_KEY_CONF = "planner_snapshot_mask_key"
+# Marks NULL in the csv.gz fallback, as in MySQL dumps.
+CSV_NULL = "\\N"
+# Seconds between a row's `modified` and its commit that incremental snapshots allow for.
+COMMIT_MARGIN = 60
+
+STANDARD_FIELDTYPES = {
+	"creation": "Datetime",
+	"modified": "Datetime",
+	"docstatus": "Int",
+	"idx": "Int",
+}
+
+# Columns holding personal data besides links to Customer, replaced when masking.
+PII_FIELDS = {
+	("Customer", "customer_name"): "name",
+	("Customer", "phone_number"): "phone",
+	("Notification Outbox", "phone_number"): "phone",
+	("Notification Outbox", "message"): "blank",
+}
+
+
+def log(msg, color=BLUE):
+	"""Prints a colored message to the console."""
+	print(f"{color}{msg}{RESET}")
+
+
+def get_planner_doctypes():
+	return frappe.get_all(
+		"DocType",
+		filters={"module": "Planner", "issingle": 0, "is_virtual": 0},
+		pluck="name",
+		order_by="name",
+	)
+
+
+def get_columns(doctype):
+	"""The table's columns typed from the DocType, so Parquet files keep numbers and dates."""
+	meta = frappe.get_meta(doctype)
+	columns = []
+	for column in frappe.db.get_table_columns(doctype):
+		df = meta.get_field(column)
+		columns.append(
+			Column(column, column, df.fieldtype if df else STANDARD_FIELDTYPES.get(column, "Data"))
+		)
+	return columns
+
+
+class Masker:
+	"""
+	Replaces customer names, phone numbers and message texts with stable pseudonyms.
+	A customer's name is masked the same way wherever it appears (the Customer
+	itself, Link fields and Dynamic Links), so masked data stays linked. Values are
+	HMACs under the source site's secret key, which never leaves that site; the
+	manifest only records the key's id, so incremental snapshots can check they
+	mask the same way as their base.
+	"""
+
+	def __init__(self, key):
+		self.key = key.encode()
+		self.plans = {}
+
+	def digest(self, value):
+		return hmac.new(self.key, str(value).encode(), hashlib.sha256).hexdigest()
+
+	def mask_customer(self, value):
+		if not value:
+			return value
+		return "Customer " + self.digest(value)[:10]
+
+	def mask_phone(self, value):
+		if not value:
+			return value
+		digits = int(self.digest(value)[:12], 16) % 10**8
+		return f"07{digits:08d}"
+
+	def get_plan(self, doctype, fieldnames):
+		if doctype not in self.plans:
+			meta = frappe.get_meta(doctype)
+			index = {f: i for i, f in enumerate(fieldnames)}
+			masks, dynamic = {}, []
+			if doctype == "Customer":
+				masks[index["name"]] = self.mask_customer
+			for df in meta.fields:
+				if df.fieldname not in index:
+					continue
+				kind = PII_FIELDS.get((doctype, df.fieldname))
+				if kind or (df.fieldtype == "Link" and df.options == "Customer"):
+					masks[index[df.fieldname]] = {
+						"phone": self.mask_phone,
+						"blank": lambda value: "",
+					}.get(kind, self.mask_customer)
+				elif df.fieldtype == "Dynamic Link" and df.options in index:
+					dynamic.append((index[df.options], index[df.fieldname]))
+			self.plans[doctype] = (masks, dynamic)
+		return self.plans[doctype]
+
+	def mask(self, doctype, fieldnames, row):
+		masks, dynamic = self.get_plan(doctype, fieldnames)
+		if not masks and not dynamic:
+			return row
+		row = list(row)
+		for i, mask in masks.items():
+			row[i] = mask(row[i])
+		for type_index, name_index in dynamic:
+			if row[type_index] == "Customer":
+				row[name_index] = self.mask_customer(row[name_index])
+		return row
+
+
+class GzipCSVWriter:
+	"""Fallback when pyarrow is not installed."""
+
+	extension = "csv.gz"
+
+	def __init__(self, path, columns):
+		self.file = gzip.open(path, "wt", newline="", encoding="utf-8")
+		self.writer = csv.writer(self.file)
+		self.writer.writerow([c.fieldname for c in columns])
+
+	def write(self, rows):
+		self.writer.writerows([CSV_NULL if v is None else v for v in row] for row in rows)
+
+	def close(self):
+		self.file.close()
+
+
+def iter_file(path, file_format, chunk_size):
+	"""Yields the rows of a snapshot file as lists, a chunk at a time."""
+	if file_format == "parquet":
+		import pyarrow.parquet as pq
+
+		for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+			yield [list(row) for row in zip(*(column.to_pylist() for column in batch.columns), strict=True)]
+		return
+
+	with gzip.open(path, "rt", newline="", encoding="utf-8") as f:
+		reader = csv.reader(f)
+		next(reader)
+		chunk = []
+		for row in reader:
+			chunk.append([None if v == CSV_NULL else v for v in row])
+			if len(chunk) >= chunk_size:
+				yield chunk
+				chunk = []
+		if chunk:
+			yield chunk
+
+
+def get_mask_key():
+	"""This site's masking key, created on first use."""
+	if not frappe.conf.get(MASK_KEY_CONF):
+		key = frappe.generate_hash(length=64)
+		update_site_config(MASK_KEY_CONF, key)
+		frappe.local.conf[MASK_KEY_CONF] = key
+		log(f"  ⏩ Added a new {MASK_KEY_CONF} to site_config.json.", YELLOW)
+	return frappe.conf[MASK_KEY_CONF]
+
+
+def get_key_id(key):
+	return hashlib.sha256(f"planner-snapshot-key:{key}".encode()).hexdigest()[:16]
+
+
+def get_snapshot_time():
+	"""
+	The point from which the next incremental snapshot has to start. Rows are read
+	on the replica, which may lag up to `planner_replica_max_lag` behind, and a row
+	is only visible once its transaction commits, after `modified` was set. Rows
+	from the overlap are dumped twice, which restoring with upserts absorbs.
+	"""
+	margin = COMMIT_MARGIN
+	if replica_configured():
+		margin += cint(frappe.conf.planner_replica_max_lag) or DEFAULT_MAX_LAG
+	return str(add_to_date(now_datetime(), seconds=-margin))
+
+
+def dump_table(doctype, directory, file_format, since, mask_key, chunk_size):
+	"""Streams one table into its file. Runs in a worker thread with its own connection."""
+	columns = get_columns(doctype)
+	fieldnames = [c.fieldname for c in columns]
+	writer_class = ParquetWriter if file_format == "parquet" else GzipCSVWriter
+	file_name = f"{scrub(doctype)}.{writer_class.extension}"
+	masker = Masker(mask_key) if mask_key else None
+
+	writer = writer_class(os.path.join(directory, file_name), columns)
+	rows = 0
+	try:
+		with frappe.db.unbuffered_cursor():
+			cursor = frappe.db.sql(
+				"select {} from `tab{}` {}".format(
+					", ".join(f"`{f}`" for f in fieldnames), doctype, "where modified >= %s" if since else ""
+				),
+				(since,) if since else (),
+				as_iterator=True,
+			)
+			chunk = []
+			for row in cursor:
+				chunk.append(masker.mask(doctype, fieldnames, row) if masker else row)
+				if len(chunk) >= chunk_size:
+					writer.write(chunk)
+					rows += len(chunk)
+					chunk = []
+			if chunk:
+				writer.write(chunk)
+				rows += len(chunk)
+	finally:
+		writer.close()
+
+	return {"file": file_name, "format": file_format, "rows": rows, "columns": fieldnames}
+
+
+def dump(path=None, mask_pii=False, base=None, workers=DEFAULT_WORKERS, chunk_size=CHUNK_SIZE):
+	"""
+	Writes the planner tables of this site to a snapshot directory: one Parquet file per
+	table (csv.gz when pyarrow is missing) and a manifest.json. Tables are streamed in
+	parallel, from the read replica when one is configured.
+
+	bench --site [site] execute planner.scripts.snapshot.dump --kwargs "{'mask_pii': True}"
+
+	Pass 'base': <previous snapshot directory> for an incremental snapshot with only the
+	rows modified since then, plus the documents deleted since. Rows changed without
+	updating `modified` are not included; take a full snapshot now and then.
+	"""
+	since, base_id = None, None
+	if base:
+		with open(os.path.join(base, "manifest.json")) as f:
+			base_manifest = json.load(f)
+		since, base_id = base_manifest["snapshot_time"], base_manifest["id"]
+		mask_pii = bool(base_manifest["mask_key_id"])
+
+	mask_key = get_mask_key() if mask_pii else None
+	key_id = get_key_id(mask_key) if mask_key else None
+	if base and key_id != base_manifest["mask_key_id"]:
+		log(f"❌ {MASK_KEY_CONF} changed since snapshot {base_id}; take a full snapshot instead.", RED)
+		return
+
+	snapshot_id = f"{now_datetime():%Y%m%d-%H%M%S}-{frappe.generate_hash(length=6)}"
+	# Rows modified while the dump runs are picked up by the next incremental snapshot.
+	snapshot_time = get_snapshot_time()
+	directory = path or frappe.get_site_path("private", "planner_snapshots", snapshot_id)
+	os.makedirs(directory, exist_ok=True)
+	file_format = "parquet" if importlib.util.find_spec("pyarrow") else "csv.gz"
+	if file_format != "parquet":
+		log("  ⏩ pyarrow is not installed; writing csv.gz files instead of Parquet.", YELLOW)
+
+	doctypes = get_planner_doctypes()
+	log(f"{'Incremental' if base else 'Full'} snapshot of {len(doctypes)} tables to {directory}...", BLUE)
+	with ThreadPoolExecutor(max_workers=cint(workers) or DEFAULT_WORKERS) as executor:
+		futures = {
+			doctype: executor.submit(
+				run_on_site,
+				frappe.local.site,
+				frappe.local.sites_path,
+				dump_table,
+				doctype,
+				directory,
+				file_format,
+				since,
+				mask_key,
+				cint(chunk_size),
+			)
+			for doctype in doctypes
+		}
+		tables = {}
+		for doctype, future in futures.items():
+			tables[doctype] = future.result()
+			log(f"  ✅ {doctype}: {tables[doctype]['rows']} rows", GREEN)
+
+	deleted = {}
+	if since:
+		masker = Masker(mask_key) if mask_key else None
+		for row in frappe.get_all(
+			"Deleted Document",
+			filters={"deleted_doctype": ("in", doctypes), "creation": (">=", since)},
+			fields=["deleted_doctype", "deleted_name"],
+		):
+			name = row.deleted_name
+			if masker and row.deleted_doctype == "Customer":
+				name = masker.mask_customer(name)
+			deleted.setdefault(row.deleted_doctype, []).append(name)
+
+	manifest = {
+		"id": snapshot_id,
+		"site": frappe.local.site,
+		"snapshot_time": snapshot_time,
+		"base": base_id,
+		"since": since,
+		"masked": bool(mask_pii),
+		"mask_key_id": key_id,
+		"tables": tables,
+		"deleted": deleted,
+	}
+	with open(os.path.join(directory, "manifest.json"), "w") as f:
+		json.dump(manifest, f, indent=1)
+	log(f"🎉 Snapshot {snapshot_id} written.", GREEN)
+	return directory
+
+
+def run_with_connection(site, sites_path, fn, *args):
+	"""Runs `fn` with its own (primary) connection to `site`."""
+	frappe.init(site=site, sites_path=sites_path)
+	try:
+		frappe.connect()
+		return fn(*args)
+	finally:
+		frappe.destroy()
+
+
+def get_secondary_indexes(doctype):
+	"""(name, unique, column list) of the table's indexes other than the primary key."""
+	indexes = {}
+	for row in frappe.db.sql(f"show index from `tab{doctype}`", as_dict=True):
+		if row.Key_name == "PRIMARY":
+			continue
+		column = f"`{row.Column_name}`" + (f"({row.Sub_part})" if row.Sub_part else "")
+		index = indexes.setdefault(row.Key_name, {"unique": not cint(row.Non_unique), "columns": {}})
+		index["columns"][cint(row.Seq_in_index)] = column
+	return [
+		(name, index["unique"], ", ".join(index["columns"][i] for i in sorted(index["columns"])))
+		for name, index in indexes.items()
+	]
+
+
+def insert_rows(doctype, fieldnames, rows, upsert):
+	column_list = ", ".join(f"`{f}`" for f in fieldnames)
+	placeholders = ", ".join(["({})".format(", ".join(["%s"] * len(fieldnames)))] * len(rows))
+	conflict = ""
+	if upsert and frappe.db.db_type == "mariadb":
+		conflict = " on duplicate key update " + ", ".join(f"`{f}` = values(`{f}`)" for f in fieldnames)
+	elif upsert:
+		conflict = " on conflict (name) do update set " + ", ".join(
+			f"`{f}` = excluded.`{f}`" for f in fieldnames if f != "name"
+		)
+	frappe.db.sql(
+		f"insert into `tab{doctype}` ({column_list}) values {placeholders}{conflict}",
+		[value for row in rows for value in row],
+	)
+
+
+def restore_table(doctype, directory, table, incremental, chunk_size):
+	"""Loads one table's file. Runs in a worker thread with its own connection."""
+	target = set(frappe.db.get_table_columns(doctype))
+	keep = [i for i, f in enumerate(table["columns"]) if f in target]
+	fieldnames = [table["columns"][i] for i in keep]
+	path = os.path.join(directory, table["file"])
+
+	indexes = []
+	if not incremental:
+		frappe.db.truncate(doctype)
+		if frappe.db.db_type == "mariadb":
+			# Loading into a table without secondary indexes and building them once
+			# afterwards is much faster than updating them row by row.
+			frappe.db.sql("set session unique_checks = 0, foreign_key_checks = 0")
+			indexes = get_secondary_indexes(doctype)
+			if indexes:
+				frappe.db.sql_ddl(
+					f"alter table `tab{doctype}` "
+					+ ", ".join(f"drop index `{name}`" for name, _u, _c in indexes)
+				)
+
+	loaded = 0
+	try:
+		for chunk in iter_file(path, table["format"], chunk_size):
+			insert_rows(doctype, fieldnames, [[row[i] for i in keep] for row in chunk], upsert=incremental)
+			frappe.db.commit()
+			loaded += len(chunk)
+	finally:
+		if indexes:
+			frappe.db.sql_ddl(
+				f"alter table `tab{doctype}` "
+				+ ", ".join(
+					f"add {'unique ' if unique else ''}index `{name}` ({columns})"
+					for name, unique, columns in indexes
+				)
+			)
+		if not incremental and frappe.db.db_type == "mariadb":
+			frappe.db.sql("set session unique_checks = 1, foreign_key_checks = 1")
+
+	return loaded
+
+
+def restore(path, workers=DEFAULT_WORKERS, chunk_size=CHUNK_SIZE):
+	"""
+	Loads a snapshot made by `dump` into this site's planner tables, in parallel per table.
+	A full snapshot replaces the tables' contents. An incremental one upserts its rows and
+	removes the deleted documents; it must follow the snapshot it was taken against.
+
+	Only runs on sites with "planner_allow_snapshot_restore": 1 in site_config.json.
+
+	bench --site [site] execute planner.scripts.snapshot.restore --kwargs "{'path': '/path/to/snapshot'}"
+	"""
+	if not frappe.conf.planner_allow_snapshot_restore:
+		log("❌ Set planner_allow_snapshot_restore in site_config.json to restore on this site.", RED)
+		return
+
+	with open(os.path.join(path, "manifest.json")) as f:
+		manifest = json.load(f)
+	incremental = bool(manifest["base"])
+	if incremental and frappe.db.get_global("planner_snapshot_restored") != manifest["base"]:
+		log(f"❌ Snapshot {manifest['id']} must be restored after {manifest['base']}.", RED)
+		return
+
+	doctypes = set(get_planner_doctypes())
+	tables = {dt: table for dt, table in manifest["tables"].items() if dt in doctypes}
+	for doctype in set(manifest["tables"]) - doctypes:
+		log(f"  ⏩ Skipped {doctype}: not a planner DocType on this site.", YELLOW)
+
+	log(f"Restoring {'incremental' if incremental else 'full'} snapshot {manifest['id']}...", BLUE)
+	with ThreadPoolExecutor(max_workers=cint(workers) or DEFAULT_WORKERS) as executor:
+		futures = {
+			doctype: executor.submit(
+				run_with_connection,
+				frappe.local.site,
+				frappe.local.sites_path,
+				restore_table,
+				doctype,
+				path,
+				table,
+				incremental,
+				cint(chunk_size),
+			)
+			for doctype, table in tables.items()
+		}
+		for doctype, future in futures.items():
+			log(f"  ✅ {doctype}: {future.result()} rows", GREEN)
+
+	for doctype, names in manifest["deleted"].items():
+		if doctype not in doctypes:
+			continue
+		for start in range(0, len(names), CHUNK_SIZE):
+			frappe.db.delete(doctype, {"name": ("in", names[start : start + CHUNK_SIZE])})
+		log(f"  ✅ {doctype}: {len(names)} deleted", GREEN)
+
+	frappe.db.set_global("planner_snapshot_restored", manifest["id"])
+	frappe.db.commit()
+	frappe.clear_cache()
+	log(f"🎉 Snapshot {manifest['id']} restored.", GREEN)
@@ -0,0 +1,184 @@
+# Copyright (c) 2026, Kebazz Technologies and contributors
+# For license information, please see license.txt
+
+"""
+Test data factories for the planner doctypes.
+
+Every factory knows how to build a valid record with sensible defaults:
+
+	customer = CustomerFactory.create(customer_department=branch)
+	names = PaymentFactory.create_batch(500, customer=customer.name)
+
+`create` inserts one document through the ORM, running controllers and
+doc_events, for the code under test. `create_batch` writes plain rows with a
+single bulk insert and skips controllers, for background data. Generated names
+carry a per-process run id, so test processes sharing a site don't collide.
+"""
+
+import itertools
+import os
+from typing import ClassVar
+
+import frappe
+from frappe.utils import now_datetime, nowdate
+
+RUN_ID = f"{os.getpid()}{frappe.generate_hash(length=4)}"
+
+STANDARD_FIELDS = ("name", "owner", "creation", "modified", "modified_by", "docstatus")
+
+
+def unique(prefix: str, n: int) -> str:
+	return f"{prefix} {RUN_ID}-{n}"
+
+
+class Factory:
+	doctype: ClassVar[str]
+	# Field that becomes the document name (autoname "field:..."), if any.
+	name_field: ClassVar[str | None] = None
+	# Default values; callables get the factory's sequence number.
+	defaults: ClassVar[dict] = {}
+
+	_sequence = itertools.count(1)
+
+	@classmethod
+	def build(cls, **overrides) -> dict:
+		n = next(cls._sequence)
+		values = {
+			field: default(n) if callable(default) else default for field, default in cls.defaults.items()
+		}
+		values.update(overrides)
+		return {"doctype": cls.doctype, **values}
+
+	@classmethod
+	def create(cls, **overrides):
+		return frappe.get_doc(cls.build(**overrides)).insert(ignore_permissions=True)
+
+	@classmethod
+	def create_batch(cls, count: int, **overrides) -> list[str]:
+		"""Inserts `count` rows in one statement, without running controllers; returns their names."""
+		return cls.insert_many([cls.build(**overrides) for _ in range(count)])
+
+	@classmethod
+	def insert_many(cls, records: list[dict]) -> list[str]:
+		"""Inserts records made by `build` (sharing the same fields) in one statement; returns their names."""
+		if not records:
+			return []
+
+		fields = [f for f in records[0] if f != "doctype"]
+		now = now_datetime()
+		user = frappe.session.user
+		rows, names = [], []
+		for record in records:
+			name = record[cls.name_field] if cls.name_field else frappe.generate_hash(length=10)
+			names.append(name)
+			rows.append((name, user, now, now, user, 0, *(record[f] for f in fields)))
+
+		frappe.db.bulk_insert(cls.doctype, [*STANDARD_FIELDS, *fields], rows, chunk_size=5000)
+		return names
+
+
+class DepartmentFactory(Factory):
+	doctype = "Customer Department"
+	name_field = "department_name"
+	defaults: ClassVar[dict] = {"department_name": lambda n: unique("_Test Branch", n)}
+
+
+class PackageFactory(Factory):
+	doctype = "Lak Package"
+	name_field = "package_name"
+	defaults: ClassVar[dict] = {
+		"package_name": lambda n: unique("_Test Package", n),
+		"register_fee": 1000,
+		"monthly_fee": 1500,
+	}
+
+
+class CustomerFactory(Factory):
+	doctype = "Customer"
+	name_field = "customer_name"
+	defaults: ClassVar[dict] = {
+		"customer_name": lambda n: unique("_Test Customer", n),
+		"phone_number": lambda n: f"07{n:08d}",
+		"register_date": lambda n: nowdate(),
+		"package_assigned": None,
+		"customer_department": None,
+		"balance_total": 0,
+		"status": "Active",
+	}
+
+
+class PaymentFactory(Factory):
+	doctype = "Customer Payment"
+	defaults: ClassVar[dict] = {
+		"customer": None,
+		"customer_department": None,
+		"payment_date": lambda n: nowdate(),
+		"amount": 1500,
+		"payment_type": "Cash",
+		"collected_by": "Administrator",
+	}
+
+
+class VoucherFactory(Factory):
+	doctype = "Voucher"
+	defaults: ClassVar[dict] = {
+		"voucher_code": lambda n: unique("_TEST-VCH", n),
+		"date_issue": lambda n: nowdate(),
+		"status": "Available",
+	}
+
+
+class StaffCashSubmissionFactory(Factory):
+	doctype = "Staff Cash Submission"
+	defaults: ClassVar[dict] = {
+		"staff_user": "Administrator",
+		"submit_date": lambda n: nowdate(),
+		"amount_cash": 0,
+		"amount_bank": 0,
+		"status": "Pending",
+	}
+
+
+class ExpenseFactory(Factory):
+	doctype = "Expense"
+	defaults: ClassVar[dict] = {
+		"expense_date": lambda n: nowdate(),
+		"amount": 500,
+		"paid_via": "Cash",
+	}
+
+
+class ExpenseAccountFactory(Factory):
+	doctype = "Expense Account"
+	name_field = "account_name"
+	defaults: ClassVar[dict] = {
+		"account_name": lambda n: unique("_Test Expense Account", n),
+		"parent_expense_account": None,
+		"is_group": 0,
+	}
+
+
+class ISPPaymentFactory(Factory):
+	doctype = "ISP Payment"
+	defaults: ClassVar[dict] = {
+		"payment_date": lambda n: nowdate(),
+		"amount_paid": 10000,
+	}
+
+
+class BankAccountFactory(Factory):
+	doctype = "Bank Account"
+	defaults: ClassVar[dict] = {
+		"account_name": lambda n: unique("_Test Account", n),
+		"bank_name": "_Test Bank",
+	}
+
+
+class BankTransactionFactory(Factory):
+	doctype = "Bank Transaction"
+	defaults: ClassVar[dict] = {
+		"date": lambda n: nowdate(),
+		"bank_account": None,
+		"debit": 0,
+		"credit": 1000,
+	}
@@ -0,0 +1,105 @@
+# Copyright (c) 2026, Kebazz Technologies and contributors
+# For license information, please see license.txt
+
+"""
+Shared planner fixture data, built once per site and reused by every test.
+
+The dataset (branches, packages, customers and their payment history) is
+written with bulk inserts and committed, and its names are stored as a global
+default. Later runs and parallel test processes on the same site reuse it as
+long as `FIXTURE_VERSION` and the requested size match. Building happens under
+a redis lock, so parallel processes build it only once.
+
+Set PLANNER_TEST_CUSTOMERS to run the suite against a larger dataset.
+"""
+
+import json
+import os
+from dataclasses import asdict, dataclass, field
+
+import frappe
+from frappe.utils import add_months, cint, nowdate
+
+from planner.planner import master_data
+from planner.tests.factories import CustomerFactory, DepartmentFactory, PackageFactory, PaymentFactory
+
+# Bump when the shape of the dataset changes.
+FIXTURE_VERSION = 1
+GLOBAL_KEY = "planner_test_fixtures"
+DEFAULT_CUSTOMERS = 200
+PAYMENT_MONTHS = 3
+
+_fixtures = None
+
+
+@dataclass
+class Fixtures:
+	version: int
+	customer_count: int
+	branches: list[str] = field(default_factory=list)
+	packages: list[str] = field(default_factory=list)
+	customers: list[str] = field(default_factory=list)
+
+
+def get_fixture_size() -> int:
+	return cint(os.environ.get("PLANNER_TEST_CUSTOMERS")) or DEFAULT_CUSTOMERS
+
+
+def get_fixtures() -> Fixtures:
+	"""The fixture data for this site, built first if there is no matching set yet."""
+	global _fixtures
+	if _fixtures is None:
+		_fixtures = load_fixtures() or build_fixtures_once()
+	return _fixtures
+
+
+def load_fixtures() -> Fixtures | None:
+	stored = frappe.db.get_global(GLOBAL_KEY)
+	if not stored:
+		return None
+	fixtures = Fixtures(**json.loads(stored))
+	if fixtures.version != FIXTURE_VERSION or fixtures.customer_count != get_fixture_size():
+		return None
+	if not frappe.db.exists("Customer", fixtures.customers[0]):
+		return None
+	return fixtures
+
+
+def build_fixtures_once() -> Fixtures:
+	with frappe.cache.lock(frappe.cache.make_key(GLOBAL_KEY), timeout=600, blocking_timeout=600):
+		# Another process may have built it while this one waited for the lock.
+		return load_fixtures() or build_fixtures()
+
+
+def build_fixtures() -> Fixtures:
+	size = get_fixture_size()
+	branches = DepartmentFactory.create_batch(3)
+	packages = [
+		*PackageFactory.create_batch(1, register_fee=1000, monthly_fee=1500),
+		*PackageFactory.create_batch(1, register_fee=1500, monthly_fee=4000),
+	]
+
+	customers, payments = [], []
+	for i in range(size):
+		branch = branches[i % len(branches)]
+		customer = CustomerFactory.build(
+			customer_department=branch, package_assigned=packages[i % len(packages)]
+		)
+		customers.append(customer)
+		payments += [
+			PaymentFactory.build(
+				customer=customer["customer_name"],
+				customer_department=branch,
+				payment_date=add_months(nowdate(), -month),
+			)
+			for month in range(PAYMENT_MONTHS)
+		]
+	CustomerFactory.insert_many(customers)
+	PaymentFactory.insert_many(payments)
+
+	fixtures = Fixtures(FIXTURE_VERSION, size, branches, packages, [c["customer_name"] for c in customers])
+	frappe.db.set_global(GLOBAL_KEY, json.dumps(asdict(fixtures)))
+	frappe.db.commit()
+	# The bulk inserts skipped the doc_events that invalidate cached master data.
+	master_data.clear_cache()
+	return fixtures
@@ -0,0 +1,65 @@
+# Copyright (c) 2026, Kebazz Technologies and Contributors
+# See license.txt
+
+import json
+import os
+import shutil
+import tempfile
+
+from frappe.tests import IntegrationTestCase
+
+from planner.scripts import check_controllers
+
+CONTROLLER = """from frappe.model.document import Document
+
+
+class Stockmovement(Document):
+	# Stockmovement keeps its comments.
+	def validate(self):
+		pass
+
+	def on_submit(self):
+		pass
+"""
+
+
+class TestCheckControllers(IntegrationTestCase):
+	def setUp(self):
+		self.app_path = tempfile.mkdtemp()
+		self.addCleanup(shutil.rmtree, self.app_path)
+		self.cache_path = os.path.join(self.app_path, check_controllers.CACHE_FILE)
+		folder = os.path.join(self.app_path, check_controllers.APP_NAME, "doctype", "stock_movement")
+		os.makedirs(folder)
+		self.py_path = os.path.join(folder, "stock_movement.py")
+		with open(self.py_path, "w") as f:
+			f.write(CONTROLLER)
+		with open(os.path.join(folder, "stock_movement.json"), "w") as f:
+			json.dump({"name": "Stock Movement", "is_submittable": 0}, f)
+
+	def analyze(self):
+		(result,) = check_controllers.analyze(self.app_path, ["Stock Movement"], cache_path=self.cache_path)
+		return result, check_controllers.find_controller_class(result, "StockMovement")
+
+	def test_detects_and_fixes_misnamed_class(self):
+		result, cls = self.analyze()
+		self.assertIsNone(result["error"])
+		self.assertEqual(cls["name"], "Stockmovement")
+		self.assertEqual(
+			check_controllers.dead_hooks(result, cls), [("on_submit", "doctype is not submittable")]
+		)
+
+		check_controllers.rename_class(result, cls, "StockMovement")
+		with open(self.py_path) as f:
+			source = f.read()
+		self.assertIn("class StockMovement(Document):", source)
+		self.assertIn("# Stockmovement keeps its comments.", source)
+
+		# The rewrite changed the file's stats, so the cached result is not reused.
+		_result, cls = self.analyze()
+		self.assertEqual(cls["name"], "StockMovement")
+
+	def test_rename_refuses_a_changed_file(self):
+		result, cls = self.analyze()
+		with open(self.py_path, "a") as f:
+			f.write("\n# edited\n")
+		self.assertRaises(RuntimeError, check_controllers.rename_class, result, cls, "StockMovement")
@@ -0,0 +1,64 @@
+# Copyright (c) 2026, Kebazz Technologies and Contributors
+# See license.txt
+
+import csv
+import importlib.util
+import os
+import unittest
+
+import frappe
+
+from planner.planner.export import export, get_columns, iter_pages
+from planner.tests.factories import CustomerFactory, PaymentFactory
+from planner.tests.utils import PlannerTestCase
+
+
+class TestExport(PlannerTestCase):
+	def setUp(self):
+		super().setUp()
+		self.customer = CustomerFactory.create().name
+		self.filters = [["customer", "=", self.customer]]
+		self.undated = PaymentFactory.create_batch(2, customer=self.customer, payment_date=None)
+		self.later = PaymentFactory.create_batch(4, customer=self.customer, payment_date="2017-01-02")
+		self.earlier = PaymentFactory.create_batch(3, customer=self.customer, payment_date="2017-01-01")
+
+	def export_file(self, file_format):
+		export_id = frappe.generate_hash(length=10)
+		export("Customer Payment", file_format, self.filters, ["amount", "collected_by"], export_id)
+		file_url = frappe.db.get_value("File", {"file_name": ("like", f"%{export_id}%")}, "file_url")
+		self.assertTrue(file_url)
+		path = frappe.get_site_path(*file_url.strip("/").split("/"))
+		self.addCleanup(os.remove, path)
+		return path
+
+	def test_keyset_pages_cover_every_row_once(self):
+		pages = list(iter_pages("Customer Payment", self.filters, ["name"], page_size=3))
+		self.assertEqual([len(page) for page in pages], [2, 3, 3, 1])
+		self.assertEqual(
+			[row.name for page in pages for row in page],
+			sorted(self.undated) + sorted(self.earlier) + sorted(self.later),
+		)
+
+	def test_csv_export_with_display_columns(self):
+		with open(self.export_file("csv"), newline="", encoding="utf-8") as f:
+			header, *rows = list(csv.reader(f))
+
+		self.assertEqual(
+			[c.label for c in get_columns("Customer Payment", ["amount", "collected_by"])], header
+		)
+		self.assertEqual(len(rows), 9)
+		full_name = frappe.db.get_value("User", "Administrator", "full_name")
+		self.assertEqual({tuple(row[-2:]) for row in rows}, {("Administrator", full_name)})
+
+	@unittest.skipUnless(importlib.util.find_spec("pyarrow"), "pyarrow is not installed")
+	def test_parquet_export_keeps_types(self):
+		import pyarrow.parquet as pq
+
+		table = pq.read_table(self.export_file("parquet"))
+		self.assertEqual(table.num_rows, 9)
+		self.assertEqual(str(table.schema.field(1).type), "double")
+
+	def test_invalid_fields_are_rejected(self):
+		self.assertRaises(
+			frappe.ValidationError, get_columns, "Customer Payment", ["amount", "no_such_field"]
+		)
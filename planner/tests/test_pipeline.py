@@ -0,0 +1,69 @@
+# Copyright (c) 2026, Kebazz Technologies and Contributors
+# See license.txt
+
+import os
+import shutil
+import tempfile
+from unittest.mock import patch
+
+from frappe.tests import IntegrationTestCase
+
+from planner.scripts import pipeline
+
+
+class TestPipeline(IntegrationTestCase):
+	def setUp(self):
+		self.app_path = tempfile.mkdtemp()
+		self.sites_path = tempfile.mkdtemp()
+		for path in (self.app_path, self.sites_path):
+			self.addCleanup(shutil.rmtree, path)
+		self.folder = os.path.join(self.app_path, "planner", "doctype", "voucher")
+		os.makedirs(self.folder)
+		for file_name in ("voucher.json", "voucher.py"):
+			self.write(file_name, "{}")
+		with open(os.path.join(self.app_path, "doctypes.json"), "w") as f:
+			f.write("{}")
+
+		self.calls = []
+		for patcher in (
+			patch("frappe.get_app_path", lambda *args: self.app_path),
+			patch.object(pipeline, "run_step", lambda step, *args: self.calls.append(step.name)),
+			patch.object(pipeline, "log", lambda *args: None),
+		):
+			patcher.start()
+			self.addCleanup(patcher.stop)
+
+	def write(self, file_name, content):
+		with open(os.path.join(self.folder, file_name), "w") as f:
+			f.write(content)
+
+	def run_scaffold(self):
+		report = pipeline.run_steps(["scaffold"], "site1", self.sites_path, app_level=True)
+		return [row["status"] for row in report]
+
+	def test_unchanged_inputs_are_skipped(self):
+		self.assertEqual(self.run_scaffold(), ["ran"])
+		self.assertEqual(self.run_scaffold(), ["skipped"])
+
+		# Bytecode written next to the controllers is not an input.
+		os.makedirs(os.path.join(self.folder, "__pycache__"))
+		with open(os.path.join(self.folder, "__pycache__", "voucher.cpython-311.pyc"), "wb") as f:
+			f.write(b"\0")
+		self.assertEqual(self.run_scaffold(), ["skipped"])
+
+		self.write("voucher.json", '{"name": "Voucher"}')
+		self.assertEqual(self.run_scaffold(), ["ran"])
+		self.assertEqual(self.run_scaffold(), ["skipped"])
+		self.assertEqual(
+			pipeline.run_steps(["scaffold"], "site1", self.sites_path, force=True, app_level=True)[0][
+				"status"
+			],
+			"ran",
+		)
+		self.assertEqual(self.calls, ["scaffold"] * 3)
+
+	def test_upstream_change_invalidates_dependents(self):
+		step = pipeline.STEPS["fix_pascal_case"]
+		before = pipeline.fingerprint(step, self.app_path, {}, {"scaffold": "a"})
+		self.assertEqual(before, pipeline.fingerprint(step, self.app_path, {}, {"scaffold": "a"}))
+		self.assertNotEqual(before, pipeline.fingerprint(step, self.app_path, {}, {"scaffold": "b"}))
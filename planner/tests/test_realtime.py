@@ -0,0 +1,69 @@
+# Copyright (c) 2026, Kebazz Technologies and Contributors
+# See license.txt
+
+from unittest.mock import patch
+
+import frappe
+
+from planner.planner import realtime
+from planner.tests.factories import CustomerFactory, PaymentFactory
+from planner.tests.utils import PlannerTestCase
+
+DAY = "2016-03-01"
+
+
+class TestRealtime(PlannerTestCase):
+	def setUp(self):
+		super().setUp()
+		self.branch = self.fixtures.branches[0]
+		self.customer = CustomerFactory.create(customer_department=self.branch).name
+		# Redis is not rolled back with the test: start from an empty buffer and day.
+		for key in (realtime.BUFFER_KEY, realtime.FLUSH_FLAG_KEY, f"{realtime.TOTALS_KEY}:{DAY}"):
+			frappe.cache.delete(frappe.cache.make_key(key))
+			self.addCleanup(frappe.cache.delete, frappe.cache.make_key(key))
+
+		self.published = []
+		for patcher in (
+			patch("frappe.enqueue"),
+			patch("frappe.publish_realtime", lambda event, message, **kwargs: self.published.append(kwargs)),
+			patch.dict(frappe.local.conf, {"planner_feed_window_ms": 1}),
+		):
+			patcher.start()
+			self.addCleanup(patcher.stop)
+
+	def record_payment(self, **kwargs):
+		payment = PaymentFactory.create(
+			customer=self.customer, customer_department=self.branch, payment_date=DAY, **kwargs
+		)
+		self.run_after_commit()
+		return payment
+
+	def test_payments_add_to_day_totals(self):
+		self.record_payment(amount=1500)
+		payment = self.record_payment(amount=4000, payment_type="Bank")
+
+		totals = realtime.get_day_totals(DAY)
+		self.assertEqual(totals["all"], {"cash": 1500, "bank": 4000, "payments": 2})
+		self.assertEqual(totals[f"department:{self.branch}"], totals["all"])
+		self.assertEqual(totals["collector:Administrator"], totals["all"])
+
+		payment.delete()
+		self.run_after_commit()
+		self.assertEqual(realtime.get_day_totals(DAY)["all"], {"cash": 1500, "bank": 0, "payments": 1})
+
+	def test_stale_buffer_is_flushed(self):
+		self.record_payment()
+		self.assertTrue(frappe.cache.exists(realtime.FLUSH_FLAG_KEY))
+
+		# A flush is still queued: the scheduler leaves the buffer to it.
+		realtime.flush_stale_feed()
+		self.assertEqual(self.published, [])
+
+		# The queued flush died without clearing the buffer.
+		frappe.cache.delete(frappe.cache.make_key(realtime.FLUSH_FLAG_KEY))
+		realtime.flush_stale_feed()
+		self.assertEqual(
+			self.published,
+			[{"user": "Administrator"}, {"doctype": "Customer Department", "docname": self.branch}],
+		)
+		self.assertEqual(frappe.cache.llen(realtime.BUFFER_KEY), 0)
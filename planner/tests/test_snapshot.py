@@ -0,0 +1,86 @@
+# Copyright (c) 2026, Kebazz Technologies and Contributors
+# See license.txt
+
+import json
+import os
+import shutil
+import tempfile
+from concurrent.futures import Future
+from unittest.mock import patch
+
+import frappe
+from frappe.utils import add_to_date, get_datetime, now_datetime
+
+from planner.scripts import snapshot
+from planner.tests.factories import CustomerFactory
+from planner.tests.utils import PlannerTestCase
+
+
+class InlineExecutor:
+	"""Runs the table dumps on the test's connection, which holds its uncommitted rows."""
+
+	def __init__(self, max_workers=None):
+		pass
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, *exc):
+		return False
+
+	def submit(self, fn, *args):
+		future = Future()
+		future.set_result(fn(*args))
+		return future
+
+
+class TestSnapshot(PlannerTestCase):
+	def setUp(self):
+		super().setUp()
+		self.directory = tempfile.mkdtemp()
+		self.addCleanup(shutil.rmtree, self.directory)
+		for patcher in (
+			patch.object(snapshot, "ThreadPoolExecutor", InlineExecutor),
+			patch.object(snapshot, "run_on_site", lambda site, sites_path, fn, *args: fn(*args)),
+			patch.object(snapshot, "log", lambda *args: None),
+		):
+			patcher.start()
+			self.addCleanup(patcher.stop)
+
+	def make_base(self, snapshot_time):
+		base = os.path.join(self.directory, "base")
+		os.makedirs(base)
+		with open(os.path.join(base, "manifest.json"), "w") as f:
+			json.dump({"id": "base", "snapshot_time": str(snapshot_time), "mask_key_id": None}, f)
+		return base
+
+	def read_names(self, directory, doctype):
+		with open(os.path.join(directory, "manifest.json")) as f:
+			table = json.load(f)["tables"][doctype]
+		path = os.path.join(directory, table["file"])
+		index = table["columns"].index("name")
+		return {row[index] for chunk in snapshot.iter_file(path, table["format"], 100) for row in chunk}
+
+	def test_incremental_dump_takes_changes_since_base(self):
+		unchanged = CustomerFactory.create().name
+		frappe.db.set_value("Customer", unchanged, "modified", "2020-01-01 00:00:00", update_modified=False)
+		deleted = CustomerFactory.create().name
+		base = self.make_base(add_to_date(now_datetime(), minutes=-5))
+		changed = CustomerFactory.create().name
+		frappe.delete_doc("Customer", deleted)
+
+		started = now_datetime()
+		directory = snapshot.dump(path=os.path.join(self.directory, "incremental"), base=base)
+
+		with open(os.path.join(directory, "manifest.json")) as f:
+			manifest = json.load(f)
+		self.assertEqual(manifest["base"], "base")
+		names = self.read_names(directory, "Customer")
+		self.assertIn(changed, names)
+		self.assertNotIn(unchanged, names)
+		self.assertIn(deleted, manifest["deleted"]["Customer"])
+		# The next incremental starts early enough for rows still committing or replicating.
+		self.assertLessEqual(
+			get_datetime(manifest["snapshot_time"]),
+			add_to_date(started, seconds=-snapshot.COMMIT_MARGIN),
+		)
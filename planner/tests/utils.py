@@ -0,0 +1,52 @@
+# Copyright (c) 2026, Kebazz Technologies and contributors
+# For license information, please see license.txt
+
+"""
+Base test case for planner tests.
+
+`PlannerTestCase` loads the shared fixtures (planner.tests.factories and
+planner.tests.fixtures) once per class and wraps every test in a savepoint that
+is rolled back afterwards. Tests start from the same committed data, whatever
+earlier tests wrote, without deleting anything or rebuilding fixtures.
+
+Code under test that commits (scheduler jobs, batched updates) would end the
+savepoint, so `frappe.db.commit` does nothing during a test. Callbacks
+registered with `frappe.db.after_commit` are therefore not run; tests that
+need them call `run_after_commit`.
+"""
+
+import frappe
+from frappe.tests import IntegrationTestCase
+
+from planner.planner import master_data
+from planner.tests.fixtures import get_fixtures
+
+SAVEPOINT = "planner_test"
+
+
+class PlannerTestCase(IntegrationTestCase):
+	@classmethod
+	def setUpClass(cls):
+		super().setUpClass()
+		cls.fixtures = get_fixtures()
+
+	def setUp(self):
+		super().setUp()
+		frappe.db.savepoint(SAVEPOINT)
+		self._commit = frappe.db.commit
+		frappe.db.commit = lambda *args, **kwargs: None
+
+	def tearDown(self):
+		frappe.db.commit = self._commit
+		frappe.db.rollback(save_point=SAVEPOINT)
+		frappe.db.after_commit.reset()
+		# Caches that may hold rows from the rolled back test.
+		master_data.clear_cache()
+		frappe.local.planner_allowed_departments = {}
+		super().tearDown()
+
+	def run_after_commit(self):
+		frappe.db.after_commit.run()
+
+	def get_balance(self, customer: str) -> float:
+		return frappe.db.get_value("Customer", customer, "balance_total")